@@ -0,0 +1,311 @@
+# --- PermastoreIt Async Python SDK ---
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+from typing import Dict, List, Optional, Any, AsyncIterator
+
+try:
+    import aiohttp
+except ImportError: # Optional dependency, only needed for the async client
+    aiohttp = None
+
+from permastoreit_sdk import (
+    PermastoreItError,
+    APIError,
+    NetworkError,
+    FileNotFoundErrorOnServer,
+    ZKPDisabledError,
+    IntegrityError,
+    NodeMetrics,
+    _parse_metrics_payload,
+    _raise_for_api_error,
+    _is_sha256_hex,
+)
+
+# --- Async Client Class ---
+
+class AsyncPermastoreItClient:
+    """
+    An asyncio client for the PermaStore 1.2.0 API.
+
+    Mirrors PermastoreItClient method for method and raises the same exceptions,
+    but runs on a single pooled aiohttp session so one process can keep many
+    uploads and downloads in flight against a node.
+
+    Example Usage:
+        async with AsyncPermastoreItClient(base_url="http://127.0.0.1:5000") as client:
+            status = await client.get_status()
+            results = await asyncio.gather(*(client.upload(p) for p in paths))
+    """
+    def __init__(self, base_url: str = "http://localhost:5000", timeout: int = 60,
+                 max_connections: int = 100, max_in_flight: int = 64,
+                 keepalive_timeout: float = 30.0):
+        """
+        Initializes the async client. No connection is opened until the first request.
+
+        Args:
+            base_url: The base URL of the PermastoreIt node API
+                      (e.g., "http://127.0.0.1:5000"). Should not end with '/'.
+            timeout: Default timeout in seconds for API requests.
+            max_connections: Size of the shared keep-alive connection pool.
+            max_in_flight: Maximum number of requests allowed in flight at once.
+                           Further calls wait for a free slot.
+            keepalive_timeout: Seconds an idle pooled connection is kept open.
+        """
+        if aiohttp is None:
+            raise PermastoreItError("AsyncPermastoreItClient requires 'aiohttp'. Install it with: pip install aiohttp")
+        if max_connections < 1 or max_in_flight < 1:
+            raise ValueError("max_connections and max_in_flight must be positive integers.")
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_in_flight = max_in_flight
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncPermastoreItClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the pooled session and all kept-alive connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Creates the shared session lazily, since it must be bound to a running loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._session
+
+    @contextlib.asynccontextmanager
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> AsyncIterator["aiohttp.ClientResponse"]:
+        """
+        Internal helper for making API requests.
+
+        Used as an async context manager so the in-flight slot is held until the
+        caller has finished reading the response body.
+
+        Args:
+            method: HTTP method (e.g., "GET", "POST").
+            endpoint: API endpoint path (e.g., "/status", "/upload").
+            **kwargs: Additional arguments passed to aiohttp's session.request
+                      (e.g., params, data, json, headers, timeout).
+
+        Yields:
+            aiohttp.ClientResponse object on success.
+
+        Raises:
+            NetworkError: For connection, timeout, or other request issues.
+            APIError: For non-2xx HTTP status codes from the server.
+            FileNotFoundErrorOnServer: For 404 errors on specific resource paths.
+            ZKPDisabledError: For 501 errors related to ZKP.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        timeout = kwargs.pop('timeout', self.timeout)
+        kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        session = self._get_session()
+
+        async with self._semaphore:
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status >= 400:
+                        raw_text = await response.text(errors='replace')
+                        try:
+                            detail = json.loads(raw_text).get("detail")
+                        except (ValueError, AttributeError):
+                            detail = raw_text[:200] if raw_text else f"No detail provided (Status: {response.status})"
+                        _raise_for_api_error(endpoint, response.status, detail, raw_text)
+                    yield response
+            except asyncio.TimeoutError as e:
+                raise NetworkError(f"Request timed out connecting to {url}: {e}") from e
+            except aiohttp.ClientConnectionError as e:
+                raise NetworkError(f"Connection error connecting to {url}: {e}") from e
+            except aiohttp.ClientError as e: # Catch other request errors
+                raise NetworkError(f"Network request error for {url}: {e}") from e
+
+    async def _get_json(self, endpoint: str, **kwargs) -> Any:
+        """GETs an endpoint and decodes its JSON body."""
+        async with self._make_request("GET", endpoint, **kwargs) as response:
+            return await response.json(content_type=None)
+
+    # --- Public SDK Methods ---
+
+    async def get_root_message(self) -> Dict[str, str]:
+        """Gets the welcome message from the root endpoint ('/')."""
+        return await self._get_json("/")
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Gets the operational status of the node."""
+        return await self._get_json("/status")
+
+    async def get_health(self) -> Dict[str, Any]:
+        """Gets the health check report of the node."""
+        return await self._get_json("/health")
+
+    async def get_metrics(self) -> NodeMetrics:
+        """Fetches and parses the node's /metrics endpoint (see PermastoreItClient.get_metrics)."""
+        headers = {"Accept": "text/plain;version=0.0.4;q=1.0, application/json;q=0.9"}
+        async with self._make_request("GET", "/metrics", headers=headers) as response:
+            return _parse_metrics_payload(await response.text(), response.headers.get("Content-Type", ""))
+
+    async def upload(self, file_path: str) -> Dict[str, Any]:
+        """
+        Uploads a file from the given local path to the node.
+
+        Args:
+            file_path: The local path to the file to upload.
+
+        Returns:
+            A dictionary containing the upload result (status, hash, size, etc.).
+
+        Raises:
+            FileNotFoundError: If the local file_path does not exist.
+            PermastoreItError: If reading the local file fails.
+            APIError: If the server returns an error (e.g., invalid type, too large).
+            NetworkError: If there's a connection issue.
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"Local file not found or is not a regular file: {file_path}")
+
+        file_name = os.path.basename(file_path)
+        content_type, _ = mimetypes.guess_type(file_path)
+        if content_type is None:
+            content_type = 'application/octet-stream'
+            print(f"Warning: Could not guess MIME type for {file_name}. Sending as {content_type}", file=sys.stderr)
+
+        try:
+            with open(file_path, 'rb') as f:
+                form = aiohttp.FormData()
+                form.add_field('file', f, filename=file_name, content_type=content_type)
+                upload_timeout = max(self.timeout * 2, 120)
+                async with self._make_request("POST", "/upload", data=form, timeout=upload_timeout) as response:
+                    return await response.json(content_type=None)
+        except IOError as e:
+            raise PermastoreItError(f"Failed to read local file {file_path}: {e}") from e
+
+    async def download(self, file_hash: str, save_dir: str, save_filename: Optional[str] = None,
+                       verify: bool = True) -> str:
+        """
+        Downloads a file by its hash and saves it to a specified directory.
+
+        Args:
+            file_hash: The SHA-256 hash of the file to download.
+            save_dir: The directory where the file should be saved.
+                      It will be created if it doesn't exist.
+            save_filename: Optional. The name to save the file as.
+                           If None, uses the file hash as the filename.
+            verify: Optional. Hash chunks as they arrive and check them against
+                    file_hash before renaming the temp file into place (default True).
+
+        Returns:
+            The full path to the successfully downloaded file.
+
+        Raises:
+            FileNotFoundErrorOnServer: If the file hash is not found on the server (404).
+            APIError: For other server errors during download request.
+            NetworkError: If there's a connection issue.
+            IntegrityError: If verify is on and the content doesn't match file_hash.
+            PermastoreItError: If creating the directory or writing the file fails.
+        """
+        if not save_filename:
+            save_filename = file_hash
+
+        try:
+            os.makedirs(save_dir, exist_ok=True)
+        except OSError as e:
+            raise PermastoreItError(f"Failed to create save directory '{save_dir}': {e}") from e
+
+        full_save_path = os.path.join(save_dir, save_filename)
+        tmp_path = f"{full_save_path}.part"
+        expected_hash = file_hash.lower() if verify and _is_sha256_hex(file_hash) else None
+        digest = hashlib.sha256() if expected_hash else None
+
+        try:
+            async with self._make_request("GET", f"/download/{file_hash}") as response:
+                with open(tmp_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(1024 * 1024): # 1MB chunks
+                        if digest is not None:
+                            digest.update(chunk)
+                        f.write(chunk)
+            if digest is not None and digest.hexdigest() != expected_hash:
+                raise IntegrityError(expected_hash, digest.hexdigest(), full_save_path)
+            os.replace(tmp_path, full_save_path)
+            return full_save_path
+        except IOError as e:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            raise PermastoreItError(f"Failed to write downloaded file to '{full_save_path}': {e}") from e
+        except PermastoreItError:
+            # Don't leave an empty, truncated or corrupt file behind
+            try: os.remove(tmp_path)
+            except OSError: pass
+            raise
+
+    async def list_files(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieves metadata for stored files, optionally limited.
+
+        Args:
+            limit: Optional maximum number of recent files to return.
+
+        Returns:
+            A list of file metadata dictionaries.
+
+        Raises:
+            APIError: For server errors during listing.
+            NetworkError: If there's a connection issue.
+        """
+        params = {}
+        if limit is not None:
+            if not isinstance(limit, int) or limit < 1:
+                raise ValueError("Limit must be a positive integer.")
+            params['limit'] = limit
+        return await self._get_json("/files", params=params)
+
+    async def get_file_info(self, file_hash: str) -> Dict[str, Any]:
+        """
+        Gets metadata for a specific file hash from the blockchain record.
+
+        Raises:
+            FileNotFoundErrorOnServer: If the file hash is not found (404).
+            APIError: For other server errors.
+            NetworkError: If there's a connection issue.
+        """
+        return await self._get_json(f"/file-info/{file_hash}")
+
+    async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Searches for files by query (matches filenames and tags).
+
+        Raises:
+            APIError: For server errors during search.
+            NetworkError: If there's a connection issue.
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("Limit must be a positive integer.")
+        return await self._get_json("/search", params={'query': query, 'limit': limit})
+
+    async def get_zk_proof(self, file_hash: str) -> Dict[str, Any]:
+        """
+        Gets the Zero-Knowledge Proof for a file hash.
+
+        Raises:
+            FileNotFoundErrorOnServer: If the file hash is not found (404).
+            ZKPDisabledError: If ZKP is disabled on the server (501).
+            APIError: For other server errors.
+            NetworkError: If there's a connection issue.
+        """
+        return await self._get_json(f"/zk-proof/{file_hash}")
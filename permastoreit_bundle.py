@@ -0,0 +1,301 @@
+# --- PermastoreIt Small-File Bundles ---
+#
+# Packs many small files into one uncompressed tar upload, with an index of
+# each member's data offset, size and SHA-256, so single members can be read
+# back with an HTTP Range request instead of downloading the whole bundle.
+#
+#     index = BundleWriter().add_files(paths).upload(client)
+#     index.save("logs-2024-06.index.json")
+#     data = read_member(client, index, "app/2024-06-01.log")
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+import time
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Sequence, Tuple
+
+from permastoreit_sdk import PermastoreItClient, PermastoreItError, IntegrityError
+
+INDEX_MEMBER = ".permastoreit-bundle-index.json" # Last member of every bundle
+DEFAULT_MAX_BUNDLE_SIZE = 64 * 1024 * 1024
+DEFAULT_MAX_MEMBERS = 10000
+MERGE_GAP = 64 * 1024 # Members closer than this are fetched with one Range request
+SPOOL_SIZE = 16 * 1024 * 1024 # Bundles bigger than this are built in a temp file
+
+# --- Index ---
+
+class BundleMember:
+    """Where one file's bytes live inside a bundle."""
+    __slots__ = ("name", "offset", "size", "sha256", "mtime")
+
+    def __init__(self, name: str, offset: int, size: int, sha256: str, mtime: int = 0):
+        self.name = name
+        self.offset = offset # Of the member's data (not its tar header) from the start of the bundle
+        self.size = size
+        self.sha256 = sha256
+        self.mtime = mtime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "offset": self.offset, "size": self.size, "sha256": self.sha256, "mtime": self.mtime}
+
+class BundleIndex:
+    """
+    The member table of an uploaded bundle.
+
+    Kept by the caller (see save/load) and also stored inside the bundle as
+    its last member, so it can be recovered from the bundle hash alone with
+    fetch_index().
+    """
+    def __init__(self, members: Sequence[BundleMember], bundle_hash: Optional[str] = None,
+                 bundle_size: Optional[int] = None, created_at: Optional[float] = None):
+        self.members: Dict[str, BundleMember] = {member.name: member for member in members}
+        self.bundle_hash = bundle_hash
+        self.bundle_size = bundle_size
+        self.created_at = created_at if created_at is not None else time.time()
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __iter__(self) -> Iterator[BundleMember]:
+        return iter(self.members.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.members
+
+    def __getitem__(self, name: str) -> BundleMember:
+        try:
+            return self.members[name]
+        except KeyError:
+            raise KeyError(f"No member named {name!r} in bundle {self.bundle_hash}") from None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"bundle_hash": self.bundle_hash, "bundle_size": self.bundle_size, "created_at": self.created_at,
+                "members": [member.to_dict() for member in self.members.values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BundleIndex":
+        members = [BundleMember(m["name"], m["offset"], m["size"], m["sha256"], m.get("mtime", 0))
+                   for m in data.get("members", [])]
+        return cls(members, data.get("bundle_hash"), data.get("bundle_size"), data.get("created_at"))
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> "BundleIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+# --- Writing ---
+
+class BundleWriter:
+    """
+    Builds a bundle: a plain tar archive (readable with `tar -xf`) whose last
+    member is a JSON index of the others.
+
+    The archive is spooled in memory and moves to a temp file past 16MB.
+    File contents are read once, hashed and written; nothing is uploaded
+    until upload() is called.
+
+    Example Usage:
+        writer = BundleWriter()
+        for path in small_files:
+            writer.add_file(path, arcname=os.path.relpath(path, root))
+        index = writer.upload(client)
+    """
+    def __init__(self):
+        self._spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self._tar = tarfile.open(fileobj=self._spool, mode="w", format=tarfile.PAX_FORMAT)
+        self._members: List[BundleMember] = []
+        self._names = {INDEX_MEMBER}
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """Bytes written so far (the finished bundle adds the index and tar padding)."""
+        return self._tar.offset
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def add_data(self, name: str, data: bytes, mtime: Optional[float] = None, mode: int = 0o644) -> BundleMember:
+        """Adds an in-memory payload as member `name`."""
+        if self._closed:
+            raise PermastoreItError("Bundle is already finished.")
+        if name in self._names:
+            raise ValueError(f"Duplicate member name: {name!r}")
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(mtime if mtime is not None else time.time()) # A float would force a pax header
+        info.mode = mode
+        self._tar.addfile(info, io.BytesIO(data))
+        # The tar offset now sits past the member's data, padded to a whole block
+        padded = -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        member = BundleMember(name, self._tar.offset - padded, len(data), hashlib.sha256(data).hexdigest(), info.mtime)
+        self._members.append(member)
+        self._names.add(name)
+        return member
+
+    def add_file(self, path: str, arcname: Optional[str] = None) -> BundleMember:
+        """Adds a local file; arcname defaults to its base name."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            st = os.stat(path)
+        except OSError as e:
+            raise PermastoreItError(f"Failed to read '{path}' for bundling: {e}") from e
+        return self.add_data((arcname or os.path.basename(path)).replace(os.sep, "/"), data, st.st_mtime,
+                             st.st_mode & 0o777)
+
+    def add_files(self, paths: Iterable[str], root: Optional[str] = None) -> "BundleWriter":
+        """Adds several files, named relative to root if given."""
+        for path in paths:
+            self.add_file(path, os.path.relpath(path, root) if root else None)
+        return self
+
+    def finish(self) -> Tuple[BundleIndex, "tempfile.SpooledTemporaryFile"]:
+        """Appends the index member and closes the archive; returns (index, archive file at position 0)."""
+        if not self._closed:
+            index = json.dumps(BundleIndex(self._members).to_dict(), separators=(',', ':')).encode("utf-8")
+            self._names.discard(INDEX_MEMBER)
+            self.add_data(INDEX_MEMBER, index)
+            self._members.pop() # The index doesn't list itself
+            self._tar.close()
+            self._closed = True
+        self._spool.seek(0, os.SEEK_END)
+        size = self._spool.tell()
+        self._spool.seek(0)
+        return BundleIndex(self._members, bundle_size=size), self._spool
+
+    def upload(self, client: PermastoreItClient, filename: Optional[str] = None) -> BundleIndex:
+        """
+        Finishes the bundle and uploads it as a single file.
+
+        Returns:
+            The index, with bundle_hash set from the node's response.
+        """
+        index, archive = self.finish()
+        try:
+            # Small bundles go up as bytes: no disk rollover, and the POST becomes safe to retry
+            payload = archive.read() if index.bundle_size <= SPOOL_SIZE else archive
+            result = client.upload_data(payload, filename or f"bundle-{int(index.created_at)}.tar", "application/x-tar")
+        finally:
+            archive.close()
+        index.bundle_hash = result.get("hash")
+        return index
+
+def pack_files(client: PermastoreItClient, paths: Iterable[str], root: Optional[str] = None,
+               max_bundle_size: int = DEFAULT_MAX_BUNDLE_SIZE, max_members: int = DEFAULT_MAX_MEMBERS
+               ) -> Iterator[BundleIndex]:
+    """
+    Uploads files as a sequence of bundles, starting a new one when the current
+    reaches max_bundle_size bytes or max_members files. Yields each index as
+    its bundle is uploaded.
+    """
+    writer = BundleWriter()
+    for path in paths:
+        writer.add_file(path, os.path.relpath(path, root) if root else None)
+        if writer.size >= max_bundle_size or len(writer) >= max_members:
+            yield writer.upload(client)
+            writer = BundleWriter()
+    if len(writer):
+        yield writer.upload(client)
+
+# --- Reading ---
+
+def _verified(member: BundleMember, data: bytes) -> bytes:
+    actual = hashlib.sha256(data).hexdigest()
+    if actual != member.sha256:
+        raise IntegrityError(member.sha256, actual, member.name)
+    return data
+
+def read_member(client: PermastoreItClient, index: BundleIndex, name: str, verify: bool = True) -> bytes:
+    """
+    Reads one member's bytes with a single ranged read of the bundle.
+
+    Raises:
+        KeyError: If the bundle has no such member.
+        IntegrityError: If verify is on and the bytes don't match the indexed SHA-256.
+    """
+    member = index[name]
+    data = client.read_range(index.bundle_hash, member.offset, member.size)
+    return _verified(member, data) if verify else data
+
+def read_members(client: PermastoreItClient, index: BundleIndex, names: Iterable[str],
+                 verify: bool = True, merge_gap: int = MERGE_GAP) -> Dict[str, bytes]:
+    """
+    Reads several members, merging members that sit close together in the
+    bundle into one Range request (at most merge_gap bytes of waste each).
+    """
+    members = sorted((index[name] for name in set(names)), key=lambda m: m.offset)
+    spans: List[List[BundleMember]] = []
+    for member in members:
+        if spans and member.offset - (spans[-1][-1].offset + spans[-1][-1].size) <= merge_gap:
+            spans[-1].append(member)
+        else:
+            spans.append([member])
+    results = {}
+    for span in spans:
+        start = span[0].offset
+        blob = client.read_range(index.bundle_hash, start, span[-1].offset + span[-1].size - start)
+        for member in span:
+            data = blob[member.offset - start:member.offset - start + member.size]
+            results[member.name] = _verified(member, data) if verify else data
+    return results
+
+def extract_member(client: PermastoreItClient, index: BundleIndex, name: str, save_dir: str,
+                   verify: bool = True) -> str:
+    """Reads one member and writes it under save_dir (keeping its relative path); returns the path."""
+    data = read_member(client, index, name, verify)
+    target = os.path.abspath(os.path.join(save_dir, name))
+    if not target.startswith(os.path.abspath(save_dir) + os.sep): # e.g. "../../etc/passwd"
+        raise PermastoreItError(f"Refusing to extract member outside '{save_dir}': {name}")
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(data)
+        member = index[name]
+        if member.mtime:
+            os.utime(target, (member.mtime, member.mtime))
+    except OSError as e:
+        raise PermastoreItError(f"Failed to write '{target}': {e}") from e
+    return target
+
+def fetch_index(client: PermastoreItClient, bundle_hash: str, tail: int = 64 * 1024) -> BundleIndex:
+    """
+    Recovers a bundle's index from the node, reading only the end of the bundle.
+
+    The index is the last tar member, so its header sits in the final blocks;
+    the tail that is read doubles until the header is found.
+    """
+    tail = max(tarfile.BLOCKSIZE, tail - tail % tarfile.BLOCKSIZE) # Keep the window block-aligned
+    size = client.get_file_info(bundle_hash).get("size")
+    if not isinstance(size, int) or size % tarfile.BLOCKSIZE:
+        raise PermastoreItError(f"{bundle_hash} does not look like a bundle (size {size}).")
+    while True:
+        start = max(0, size - tail)
+        window = client.read_range(bundle_hash, start, size - start)
+        # Walk back over the block-aligned headers in the window, newest first
+        for position in range(len(window) - tarfile.BLOCKSIZE, -1, -tarfile.BLOCKSIZE):
+            block = window[position:position + tarfile.BLOCKSIZE]
+            if not block.startswith(INDEX_MEMBER.encode()):
+                continue
+            try:
+                info = tarfile.TarInfo.frombuf(block, tarfile.ENCODING, "surrogateescape")
+            except tarfile.HeaderError:
+                continue
+            data_start = start + position + tarfile.BLOCKSIZE
+            if data_start + info.size <= start + len(window):
+                data = window[position + tarfile.BLOCKSIZE:position + tarfile.BLOCKSIZE + info.size]
+            else:
+                data = client.read_range(bundle_hash, data_start, info.size)
+            index = BundleIndex.from_dict(json.loads(data.decode("utf-8")))
+            index.bundle_hash, index.bundle_size = bundle_hash, size
+            return index
+        if start == 0:
+            raise PermastoreItError(f"No bundle index found in {bundle_hash}.")
+        tail *= 4
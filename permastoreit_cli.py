@@ -1,18 +1,28 @@
 #!/usr/bin/env python
 import click
+import fnmatch
 import os
 import json
+import queue
 import sys
 import time
-import glob # For bulk upload
-from typing import Optional, List, Dict, Any # Added more types
+import random
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import Optional, List, Dict, Any, Iterator, Tuple # Added more types
 
 # --- Import Rich ---
-from rich.console import Console
+from rich import box
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
+from rich.live import Live
 from rich.syntax import Syntax
-from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
+from rich.progress import Progress, BarColumn, DownloadColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 from rich.pretty import pretty_repr # For better dict printing
 
 # --- Import SDK ---
@@ -24,8 +34,20 @@ try:
         APIError,
         NetworkError,
         FileNotFoundErrorOnServer,
-        ZKPDisabledError
+        ZKPDisabledError,
+        IntegrityError,
+        MetadataCache,
+        LatencyHistogram,
+        compute_file_hash,
+        HedgePolicy,
+        Throttle,
+        TransferProgress
     )
+    from permastoreit_cluster import PermastoreItCluster
+    from permastoreit_telemetry import MetricsAggregator, JsonLinesSpanExporter
+    from permastoreit_bundle import (BundleIndex, DEFAULT_MAX_MEMBERS, pack_files, fetch_index, read_members,
+                                     extract_member)
+    from permastoreit_sync import SyncManifest, DirectorySync, DEFAULT_MANIFEST_NAME, SYMLINK_POLICIES, discover_files
 except ImportError:
     # Use print here as Rich console might not be ready
     print("Error: Failed to import PermastoreIt SDK. Make sure permastoreit_sdk.py is accessible.")
@@ -72,6 +94,8 @@ def handle_sdk_error(e, exit_on_error=True):
         message = f"API Error ([bold]{e.status_code}[/]): {e.detail}"
     elif isinstance(e, NetworkError):
         message = f"Network Error: {e}"
+    elif isinstance(e, IntegrityError):
+        message = f"Integrity Error: downloaded content hashed to [bold]{e.actual_hash}[/], expected [bold]{e.expected_hash}[/]. The file was discarded."
     elif isinstance(e, FileNotFoundError): # Local file not found
          message = f"Local File Error: {e}"
     elif isinstance(e, PermastoreItError): # General SDK error
@@ -92,24 +116,129 @@ def common_options(func):
     func = click.option('--output-format', type=click.Choice(['text', 'json'], case_sensitive=False), default='text', help='Output format (text to stderr, json lines to stdout).', show_default=True)(func)
     return func
 
+def _file_bars(transient: bool = True) -> Progress:
+    """Per-file byte progress bars, fed by _FileBar callbacks (rate and ETA come from the SDK)."""
+    return Progress(
+        TextColumn("  {task.description}"),
+        BarColumn(bar_width=24),
+        DownloadColumn(),
+        TextColumn("{task.fields[rate]}"),
+        TextColumn("ETA {task.fields[eta]}"),
+        console=console,
+        transient=transient,
+    )
+
+class _FileBar:
+    """
+    One file's bar in a _file_bars() Progress; pass it as an SDK progress callback.
+
+    The SDK throttles callbacks, so this stays cheap even for many concurrent
+    transfers. The bar is removed when the context exits.
+    """
+    def __init__(self, bars: Progress, description: str, total: Optional[int] = None):
+        self.bars = bars
+        name = description if len(description) <= 32 else description[:29] + "..."
+        self.task = bars.add_task(name, total=total, rate="", eta="-:--:--")
+
+    def __call__(self, progress: TransferProgress) -> None:
+        eta = progress.eta
+        self.bars.update(self.task, completed=progress.transferred, total=progress.total,
+                         rate=f"{progress.rate / 1e6:,.1f} MB/s",
+                         eta="-:--:--" if eta is None else time.strftime("%H:%M:%S", time.gmtime(eta)))
+
+    def __enter__(self) -> "_FileBar":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.bars.remove_task(self.task)
+
+def _timed_upload(client: PermastoreItClient, file_path: str, skip_existing: bool = False,
+                  progress: Optional[_FileBar] = None) -> Dict[str, Any]:
+    """Uploads one file and returns its bulk result record (errors are logged, not raised)."""
+    t_start = time.perf_counter()
+    try:
+        result = client.upload(file_path, skip_existing=skip_existing, progress=progress)
+        duration_ms = (time.perf_counter() - t_start) * 1000
+        result['upload_time_ms'] = duration_ms
+        result['source_file'] = file_path
+        return {"success": True, "result": result}
+    except Exception as e:
+        duration_ms = (time.perf_counter() - t_start) * 1000
+        error_message = handle_sdk_error(e, exit_on_error=False) # Log error but continue bulk op
+        return {"success": False, "source_file": file_path, "error": error_message, "time_ms": duration_ms}
+
+
+def throttle_options(func):
+    """Decorator for client-side rate/concurrency limits on bulk commands."""
+    func = click.option('--max-inflight', type=click.IntRange(min=1), default=None, help="Cap on concurrent requests per endpoint class (upload/download/metadata).")(func)
+    func = click.option('--max-rps', type=click.FloatRange(min=0, min_open=True), default=None, help="Cap on requests per second per endpoint class.")(func)
+    return func
+
+def _apply_throttle(client, max_rps: Optional[float], max_inflight: Optional[int], adaptive: bool = False) -> List[Throttle]:
+    """Installs a Throttle on the client (one per node for a cluster) and returns them."""
+    if max_rps is None and max_inflight is None and not adaptive:
+        return []
+    clients = [node.client for node in client.nodes] if isinstance(client, PermastoreItCluster) else [client]
+    throttles = []
+    for node_client in clients:
+        node_client.throttle = Throttle(max_rps=max_rps, max_inflight=max_inflight, adaptive=adaptive)
+        throttles.append(node_client.throttle)
+    return throttles
+
+
+def _timings_table(rows: List[Dict[str, Any]]) -> Table:
+    """Per-endpoint median phase times: Conn and Xfer are network time, TTFB is server time + 1 RTT."""
+    table = Table(title="Request Timings (ms)", box=box.SIMPLE_HEAD, show_header=True, header_style="bold magenta")
+    table.add_column("Endpoint")
+    for column in ("Reqs", "New", "Conn", "TTFB", "Xfer", "p50", "p99", "Err"):
+        table.add_column(column, justify="right", min_width=len(column))
+
+    def fmt(value):
+        return f"{value:.1f}" if value is not None else "-"
+
+    for row in rows:
+        table.add_row(f"{row['method']} {row['endpoint']}", str(row["requests"]), str(row["new_connections"]),
+                      fmt(row["connect"]["p50_ms"]), fmt(row["ttfb"]["p50_ms"]), fmt(row["transfer"]["p50_ms"]),
+                      fmt(row["total"]["p50_ms"]), fmt(row["total"]["p99_ms"]), str(row["errors"]))
+    return table
+
 # --- CLI Command Group ---
 
 @click.group(context_settings=dict(help_option_names=['-h', '--help']))
-@click.option('--url', default="http://localhost:5000", help="Base URL of the PermastoreIt node API.", envvar='PERMASTOREIT_URL', show_default=True)
+@click.option('--url', 'urls', multiple=True, default=["http://localhost:5000"], help="Base URL of the PermastoreIt node API. Repeat to spread requests across several nodes.", envvar='PERMASTOREIT_URL', show_default=True)
+@click.option('--hedge', is_flag=True, default=False, help="Re-send slow metadata reads after their recent p95 latency (to a second node when several --url are given).")
 @click.option('--timeout', type=int, default=60, help="Default request timeout in seconds.", show_default=True)
+@click.option('--pool-size', type=click.IntRange(min=1), default=32, help="Keep-alive connections kept per node; match it to your --concurrency.", show_default=True)
+@click.option('--timings', is_flag=True, default=False, help="Print a per-endpoint breakdown of request phases (connect/TLS/TTFB/transfer) on exit.")
+@click.option('--trace-file', type=click.Path(dir_okay=False, writable=True), default=None, help="Append one OpenTelemetry-style span per HTTP request to this JSON-lines file.")
+@click.option('--metadata-cache', type=click.Path(dir_okay=False), default=None, envvar='PERMASTOREIT_METADATA_CACHE', help="SQLite file caching file-info/zk-proof responses across runs.")
 @click.version_option(version="0.2.0", prog_name="PermastoreIt CLI") # Add version
 @click.pass_context
-def cli(ctx, url, timeout):
+def cli(ctx, urls, timeout, hedge, pool_size, timings, trace_file, metadata_cache):
     """
     Command Line Interface for interacting with and testing a PermastoreIt node.
 
     Example: python permastoreit_cli.py --url <NODE_URL> upload <FILE>
     """
     ctx.ensure_object(dict)
+    url = ", ".join(urls)
     try:
-        ctx.obj['CLIENT'] = PermastoreItClient(base_url=url, timeout=timeout)
+        cache = MetadataCache(path=metadata_cache) if metadata_cache else None
+        if len(urls) > 1:
+            ctx.obj['CLIENT'] = PermastoreItCluster(urls, hedge=hedge, timeout=timeout, cache=cache, pool_maxsize=pool_size)
+        else:
+            ctx.obj['CLIENT'] = PermastoreItClient(base_url=urls[0], timeout=timeout, cache=cache, pool_maxsize=pool_size,
+                                                   hedge_policy=HedgePolicy() if hedge else None)
         ctx.obj['BASE_URL'] = url
         ctx.obj['OUTPUT_FORMAT'] = 'text' # Default, subcommands can override via param
+        if trace_file:
+            exporter = JsonLinesSpanExporter(trace_file)
+            ctx.obj['CLIENT'].add_hook(exporter)
+            ctx.call_on_close(exporter.close)
+        if timings:
+            aggregator = MetricsAggregator()
+            ctx.obj['CLIENT'].add_hook(aggregator)
+            ctx.call_on_close(lambda: console.print(_timings_table(aggregator.snapshot())))
 
     except Exception as e:
          console.print(Panel(f"Failed to initialize client for URL '{url}': {e}", title="[bold red]Initialization Error[/]", border_style="red"))
@@ -187,13 +316,18 @@ def health(ctx, output_format):
 @click.argument('file_path', type=click.Path(exists=True, dir_okay=False, readable=True))
 @click.option('--repeat', '-r', type=int, default=1, help="Number of times to repeat the upload.", show_default=True)
 @click.option('--delay', '-d', type=float, default=0, help="Delay in seconds between repetitions.", show_default=True)
+@click.option('--skip-existing', is_flag=True, default=False, help="Hash locally and skip the transfer if the node already has the content.")
+@click.option('--resumable', is_flag=True, default=False, help="Use the chunked upload protocol; re-running resumes an interrupted upload.")
+@click.option('--chunk-size-mb', type=click.IntRange(min=1), default=8, help="Chunk size in MB for --resumable.", show_default=True)
+@throttle_options
 @common_options
 @click.pass_context
-def upload(ctx, file_path, repeat, delay, output_format):
+def upload(ctx, file_path, repeat, delay, skip_existing, resumable, chunk_size_mb, max_rps, max_inflight, output_format):
     """Upload a file to the PermastoreIt node, optionally repeating."""
     client: PermastoreItClient = ctx.obj['CLIENT']
     base_url = ctx.obj['BASE_URL']
     ctx.obj['OUTPUT_FORMAT'] = output_format
+    _apply_throttle(client, max_rps, max_inflight)
     console.print(f"Uploading '[cyan]{os.path.basename(file_path)}[/]' to [cyan]{base_url}[/] ({repeat}x, delay {delay}s)...")
 
     results_data = []
@@ -207,8 +341,11 @@ def upload(ctx, file_path, repeat, delay, output_format):
 
         t_start = time.perf_counter()
         try:
-            # TODO: Integrate rich progress bar if SDK supports callbacks or for large files
-            result = client.upload(file_path)
+            with _file_bars() as bars, _FileBar(bars, os.path.basename(file_path), os.path.getsize(file_path)) as bar:
+                if resumable:
+                    result = client.upload_resumable(file_path, chunk_size=chunk_size_mb * 1024 * 1024, progress=bar)
+                else:
+                    result = client.upload(file_path, skip_existing=skip_existing, progress=bar)
             t_end = time.perf_counter()
             duration_ms = (t_end - t_start) * 1000
             result['upload_time_ms'] = duration_ms
@@ -244,75 +381,217 @@ def upload(ctx, file_path, repeat, delay, output_format):
          sys.exit(1) # Exit with error if any repetition failed
 
 
+def _size_option(ctx, param, value):
+    return parse_size(value) if value else None
+
 @cli.command(name="upload-bulk")
 @click.argument('directory_path', type=click.Path(exists=True, file_okay=False, readable=True))
-@click.option('--pattern', '-p', default="*", help="Glob pattern for files (e.g., '*.txt').", show_default=True)
-@click.option('--delay', '-d', type=float, default=0.1, help="Delay seconds between uploads.", show_default=True)
+@click.option('--pattern', '-p', 'patterns', multiple=True, default=["*"], help="Glob for files to include (e.g., '*.txt'; 'sub/*.jpg' matches the relative path). Repeatable.", show_default=True)
+@click.option('--exclude', '-x', 'excludes', multiple=True, help="Glob for files or directories to skip (e.g., '.git', '*.tmp'). Repeatable.")
+@click.option('--recursive/--no-recursive', default=True, help="Descend into subdirectories.", show_default=True)
+@click.option('--min-size', callback=_size_option, default=None, help="Skip files smaller than this (e.g., 1k).")
+@click.option('--max-size', callback=_size_option, default=None, help="Skip files larger than this (e.g., 100m).")
+@click.option('--symlinks', type=click.Choice(SYMLINK_POLICIES), default="skip", help="Ignore symlinks, follow links to files only, or follow all links.", show_default=True)
+@click.option('--delay', '-d', type=float, default=0.1, help="Delay seconds between uploads (sequential mode only).", show_default=True)
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=1, help="Number of parallel upload workers (maximum when --adaptive).", show_default=True)
+@click.option('--adaptive', is_flag=True, default=False, help="Grow/shrink in-flight uploads (AIMD) from 429/503s, error rate and p95 latency.")
+@click.option('--skip-existing', is_flag=True, default=False, help="Hash locally and skip files the node already has.")
+@throttle_options
 @common_options
 @click.pass_context
-def upload_bulk(ctx, directory_path, pattern, delay, output_format):
-    """Upload all files matching a pattern from a directory."""
+def upload_bulk(ctx, directory_path, patterns, excludes, recursive, min_size, max_size, symlinks, delay,
+                concurrency, adaptive, skip_existing, max_rps, max_inflight, output_format):
+    """Upload all files matching a pattern under a directory.
+
+    Files are discovered by a background walker and fed to the upload workers
+    through a bounded queue, so uploads start right away and memory stays flat
+    on huge trees. With --output-format json, one result line is printed per
+    file as it finishes, followed by a summary line.
+    """
     client: PermastoreItClient = ctx.obj['CLIENT']
     base_url = ctx.obj['BASE_URL']
     ctx.obj['OUTPUT_FORMAT'] = output_format
-    console.print(f"Uploading files matching '[cyan]{pattern}[/]' from '[cyan]{directory_path}[/]' to [cyan]{base_url}[/]...")
-
-    try:
-        files_to_upload = [f for f in glob.glob(os.path.join(directory_path, pattern)) if os.path.isfile(f)]
-    except Exception as e:
-        console.print(Panel(f"Error finding files: {e}", title="[bold red]Error[/]", border_style="red"))
-        sys.exit(1)
-
-    if not files_to_upload:
-        console.print("[yellow]No files found matching pattern.[/]")
-        return
-
-    console.print(f"Found {len(files_to_upload)} file(s).")
-    results_data = []
-    success_count = 0
-    fail_count = 0
-
-    # Use Rich Progress bar
-    with Progress(
+    # With --adaptive the SDK limiter holds workers back; it never exceeds --concurrency
+    throttles = _apply_throttle(client, max_rps, min(max_inflight or concurrency, concurrency) if adaptive else max_inflight,
+                                adaptive=adaptive)
+    console.print(f"Uploading files matching '[cyan]{', '.join(patterns)}[/]' from '[cyan]{directory_path}[/]' to [cyan]{base_url}[/]...")
+
+    sequential = concurrency == 1 and not adaptive
+    work: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=concurrency * 4) # Discovery runs at most this far ahead
+    results: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+    discovery = {"found": 0, "done": False, "error": None, "unreadable": 0}
+    stop = threading.Event()
+
+    def discover():
+        def unreadable(directory, error):
+            discovery["unreadable"] += 1
+        try:
+            for path, _ in discover_files(directory_path, include=list(patterns), exclude=list(excludes),
+                                          min_size=min_size, max_size=max_size, symlinks=symlinks,
+                                          recursive=recursive, on_error=unreadable):
+                while not stop.is_set():
+                    try:
+                        work.put(path, timeout=0.2)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+                discovery["found"] += 1
+        except Exception as e:
+            discovery["error"] = e
+        finally:
+            discovery["done"] = True
+            for _ in range(concurrency):
+                work.put(None) # One sentinel per worker
+
+    def upload_worker():
+        while True:
+            file_path = work.get()
+            if file_path is None or stop.is_set():
+                return
+            if sequential and delay > 0:
+                time.sleep(delay)
+            with _FileBar(file_bars, os.path.relpath(file_path, directory_path)) as bar:
+                results.put(_timed_upload(client, file_path, skip_existing, progress=bar))
+
+    success_count = fail_count = 0
+    threads = [threading.Thread(target=discover, name="permastoreit-discover", daemon=True)]
+    threads += [threading.Thread(target=upload_worker, name=f"permastoreit-upload-{i}", daemon=True)
+                for i in range(concurrency)]
+
+    # Overall file count, with a byte bar per in-flight upload underneath
+    progress = Progress(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TextColumn("{task.completed:,.0f}/{task.fields[found]}"),
         TimeRemainingColumn(),
         TimeElapsedColumn(),
         console=console, # Use stderr console for progress
-        transient=False # Keep progress bar after completion for bulk summary
-    ) as progress:
-        task = progress.add_task("[cyan]Uploading...", total=len(files_to_upload))
-
-        for file_path in files_to_upload:
-            if delay > 0: time.sleep(delay)
-            # Update progress description
-            progress.update(task, description=f"[cyan]Uploading {os.path.basename(file_path)}...")
+    )
+    file_bars = _file_bars()
+    with Live(Group(progress, file_bars), console=console, refresh_per_second=10):
+        task = progress.add_task("[cyan]Discovering...", total=None, found="?") # Indeterminate until discovery ends
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads[1:]) or not results.empty():
+                try:
+                    record = results.get(timeout=0.2)
+                except queue.Empty:
+                    record = None
+                if record is not None:
+                    if record["success"]:
+                        success_count += 1
+                    else:
+                        fail_count += 1
+                    if output_format == 'json':
+                        print_output(record, output_format)
+                if discovery["done"] and progress.tasks[0].total is None:
+                    progress.update(task, total=discovery["found"])
+                found = f"{discovery['found']:,}" + ("" if discovery["done"] else "+")
+                limits = [t.stats()["upload"] for t in throttles if "upload" in t.stats()]
+                if limits:
+                    in_flight = sum(l["in_flight"] for l in limits)
+                    limit = sum(l["limit"] for l in limits)
+                    description = f"[cyan]Uploading ({in_flight}/{limit} in flight)"
+                elif sequential:
+                    description = "[cyan]Uploading"
+                else:
+                    description = f"[cyan]Uploading ({concurrency} workers)"
+                progress.update(task, completed=success_count + fail_count, description=description + "...", found=found)
+        except KeyboardInterrupt:
+            stop.set()
+            console.print("[yellow]Interrupted; waiting for in-flight uploads to finish...[/]")
+            for thread in threads[1:]:
+                thread.join()
+
+    if discovery["error"] is not None:
+        console.print(Panel(f"Error finding files: {discovery['error']}", title="[bold red]Error[/]", border_style="red"))
+    if discovery["unreadable"]:
+        console.print(f"[yellow]Skipped {discovery['unreadable']} unreadable director{'y' if discovery['unreadable'] == 1 else 'ies'}.[/]")
+    if not discovery["found"] and discovery["error"] is None:
+        console.print("[yellow]No files found matching pattern.[/]")
+        return
 
-            t_start = time.perf_counter()
-            try:
-                result = client.upload(file_path)
-                t_end = time.perf_counter()
-                duration_ms = (t_end - t_start) * 1000
-                result['upload_time_ms'] = duration_ms
-                result['source_file'] = file_path
-                results_data.append({"success": True, "result": result})
-                success_count += 1
-            except Exception as e:
-                t_end = time.perf_counter()
-                duration_ms = (t_end - t_start) * 1000
-                error_message = handle_sdk_error(e, exit_on_error=False) # Log error but continue bulk op
-                results_data.append({"success": False, "source_file": file_path, "error": error_message, "time_ms": duration_ms})
-                fail_count += 1
-            progress.update(task, advance=1)
-
-    console.print(f"\nBulk upload complete. Success: [green]{success_count}[/], Failed: [red]{fail_count}[/]")
+    console.print(f"\nBulk upload complete. Found: {discovery['found']}, Success: [green]{success_count}[/], Failed: [red]{fail_count}[/]")
     if output_format == 'json':
-        # Print summary and then individual results
-        summary = {"total_files": len(files_to_upload), "success": success_count, "failed": fail_count}
+        summary = {"total_files": discovery["found"], "success": success_count, "failed": fail_count}
         print_output({"summary": summary}, output_format)
-        for res in results_data:
-            print_output(res, output_format)
+    if discovery["error"] is not None:
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('directory_path', type=click.Path(exists=True, file_okay=False, readable=True))
+@click.option('--manifest', '-m', 'manifest_path', type=click.Path(dir_okay=False), default=None,
+              help=f"SQLite manifest of synced files [default: <DIRECTORY>/{DEFAULT_MANIFEST_NAME}].")
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=4, help="Files hashed and uploaded in parallel.", show_default=True)
+@click.option('--scan-workers', type=click.IntRange(min=1), default=8, help="Directories listed in parallel.", show_default=True)
+@click.option('--dry-run', is_flag=True, default=False, help="Show what would be uploaded without uploading.")
+@throttle_options
+@common_options
+@click.pass_context
+def sync(ctx, directory_path, manifest_path, concurrency, scan_workers, dry_run, max_rps, max_inflight, output_format):
+    """Upload new and changed files under a directory (recursively).
+
+    A local manifest remembers each file's size, mtime, inode and hash, so
+    unchanged files are skipped without being read.
+    """
+    client: PermastoreItClient = ctx.obj['CLIENT']
+    base_url = ctx.obj['BASE_URL']
+    ctx.obj['OUTPUT_FORMAT'] = output_format
+    _apply_throttle(client, max_rps, max_inflight)
+    manifest_path = manifest_path or os.path.join(directory_path, DEFAULT_MANIFEST_NAME)
+    console.print(f"{'Checking' if dry_run else 'Syncing'} '[cyan]{directory_path}[/]' to [cyan]{base_url}[/] "
+                  f"(manifest: {manifest_path})...")
+
+    try:
+        with SyncManifest(manifest_path) as manifest, Progress(
+                TextColumn("[progress.description]{task.description}"), TimeElapsedColumn(),
+                console=console, transient=True) as progress:
+            task = progress.add_task("[cyan]Scanning...")
+
+            def on_progress(report):
+                done = report["uploaded"] + report["deduplicated"] + report["failed"]
+                progress.update(task, description=(
+                    f"[cyan]{report['scanned']:,} scanned, {report['unchanged']:,} unchanged, "
+                    f"{done:,}/{report['new'] + report['changed']:,} uploaded"))
+
+            syncer = DirectorySync(client, directory_path, manifest, upload_workers=concurrency,
+                                   scan_workers=scan_workers, target=base_url)
+            report = syncer.run(dry_run=dry_run, on_progress=on_progress)
+            report["manifest"] = manifest.stats()
+    except KeyboardInterrupt:
+        console.print("[yellow]Interrupted; uploads finished so far are recorded in the manifest.[/]")
+        sys.exit(130)
+    except Exception as e:
+        handle_sdk_error(e)
+
+    if output_format == 'json':
+        print_output(report, output_format)
+    else:
+        table = Table(title="Sync Summary" + (" (dry run)" if dry_run else ""), box=box.ROUNDED, show_header=False)
+        table.add_column("Metric", style="dim cyan")
+        table.add_column("Value", justify="right")
+        for label, value in (("Files scanned", f"{report['scanned']:,}"),
+                             ("Directories", f"{report['directories']:,}"),
+                             ("Unchanged", f"{report['unchanged']:,}"),
+                             ("New", f"{report['new']:,}"),
+                             ("Changed", f"{report['changed']:,}"),
+                             ("Uploaded", f"[green]{report['uploaded']:,}[/] ({report['bytes_uploaded'] / 1e6:,.1f} MB)"),
+                             ("Already on node", f"{report['deduplicated']:,}"),
+                             ("Failed", f"[red]{report['failed']:,}[/]" if report['failed'] else "0"),
+                             ("Removed locally", f"{report['removed']:,}"),
+                             ("Elapsed", f"{report['elapsed_s']:.2f} s")):
+            table.add_row(label, value)
+        console.print(table)
+        for failure in report["failures"][:20]:
+            console.print(f"  [red]FAILED[/] {failure['path']}: {failure['error']}")
+        if len(report["failures"]) > 20:
+            console.print(f"  ... and {len(report['failures']) - 20} more (use --output-format json for all)")
+    if report["failed"] or report["scan_errors"]:
+        sys.exit(1)
 
 
 @cli.command()
@@ -321,13 +600,18 @@ def upload_bulk(ctx, directory_path, pattern, delay, output_format):
 @click.option('--name', '-n', default=None, help="Filename to save as (defaults to hash).", type=click.STRING)
 @click.option('--repeat', '-r', type=int, default=1, help="Number of download repetitions.", show_default=True)
 @click.option('--delay', '-d', type=float, default=0, help="Delay seconds between repetitions.", show_default=True)
+@click.option('--connections', '-c', type=click.IntRange(min=1), default=1, help="Parallel Range-request connections (resumable when > 1).", show_default=True)
+@click.option('--segment-size-mb', type=click.IntRange(min=1), default=16, help="Segment size in MB for parallel downloads.", show_default=True)
+@click.option('--no-verify', is_flag=True, default=False, help="Skip the inline SHA-256 check of downloaded content.")
+@throttle_options
 @common_options
 @click.pass_context
-def download(ctx, file_hash, out_dir, name, repeat, delay, output_format):
+def download(ctx, file_hash, out_dir, name, repeat, delay, connections, segment_size_mb, no_verify, max_rps, max_inflight, output_format):
     """Download a file by its hash, optionally repeating."""
     client: PermastoreItClient = ctx.obj['CLIENT']
     base_url = ctx.obj['BASE_URL']
     ctx.obj['OUTPUT_FORMAT'] = output_format
+    _apply_throttle(client, max_rps, max_inflight)
     save_filename_base = name if name else file_hash
     console.print(f"Downloading hash '[cyan]{file_hash}[/]' from [cyan]{base_url}[/] to '[cyan]{out_dir}[/]' ({repeat}x, delay {delay}s)...")
 
@@ -343,9 +627,11 @@ def download(ctx, file_hash, out_dir, name, repeat, delay, output_format):
 
         t_start = time.perf_counter()
         try:
-            # TODO: Add rich progress bar if SDK provides download progress or file size known
             os.makedirs(out_dir, exist_ok=True)
-            downloaded_path = client.download(file_hash, save_dir=out_dir, save_filename=save_filename)
+            with _file_bars() as bars, _FileBar(bars, save_filename) as bar:
+                downloaded_path = client.download(file_hash, save_dir=out_dir, save_filename=save_filename,
+                                                  connections=connections, segment_size=segment_size_mb * 1024 * 1024,
+                                                  verify=not no_verify, progress=bar)
             t_end = time.perf_counter()
             duration_ms = (t_end - t_start) * 1000
             result_data = {"downloaded_path": downloaded_path, "download_time_ms": duration_ms}
@@ -375,63 +661,328 @@ def download(ctx, file_hash, out_dir, name, repeat, delay, output_format):
          sys.exit(1)
 
 
+DOWNLOAD_JOURNAL = ".permastoreit-downloads.jsonl"
+
+def _read_download_list(lines) -> List[Tuple[str, Optional[str]]]:
+    """Parses hash lists: bare hashes, or JSON lines from `list`/`search --output-format json`."""
+    items = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('{'):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            record = record.get("result", record) if isinstance(record, dict) else {}
+            if isinstance(record, dict) and record.get("hash"):
+                items.append((record["hash"], record.get("filename")))
+        else:
+            items.append((line.split()[0], None))
+    return items
+
+def _download_targets(items: List[Tuple[str, Optional[str]]], name_by: str) -> List[Tuple[str, str]]:
+    """Unique (hash, filename) pairs; duplicate filenames get a short hash suffix."""
+    targets, seen_hashes, used_names = [], set(), set()
+    for file_hash, filename in items:
+        if file_hash in seen_hashes:
+            continue
+        seen_hashes.add(file_hash)
+        name = file_hash
+        if name_by == "filename" and filename:
+            name = os.path.basename(filename.replace("\\", "/")) or file_hash
+            if name in used_names or name in (".", ".."):
+                stem, ext = os.path.splitext(name)
+                name = f"{stem}.{file_hash[:12]}{ext}"
+        used_names.add(name)
+        targets.append((file_hash, name))
+    return targets
+
+@cli.command(name="download-bulk")
+@click.option('--from-file', '-f', 'hashes_file', type=click.File('r'), default=None, help="Hashes (one per line) or JSON lines from list/search; '-' for stdin.")
+@click.option('--all', 'all_files', is_flag=True, default=False, help="Download every file the node lists.")
+@click.option('--search', 'query', default=None, help="Download the results of a search query.")
+@click.option('--limit', '-l', type=click.IntRange(min=1), default=None, help="Maximum files to take from --all/--search (search default: 100).")
+@click.option('--out-dir', '-o', default=".", help="Directory to save files into.", type=click.Path(file_okay=False, writable=True), show_default=True)
+@click.option('--name-by', type=click.Choice(["hash", "filename"]), default="hash", help="Save files under their hash or their original filename.", show_default=True)
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=4, help="Files downloaded in parallel.", show_default=True)
+@click.option('--no-verify', is_flag=True, default=False, help="Skip SHA-256 checks of downloaded and existing files.")
+@click.option('--force', is_flag=True, default=False, help="Download even if a verified copy already exists.")
+@throttle_options
+@common_options
+@click.pass_context
+def download_bulk(ctx, hashes_file, all_files, query, limit, out_dir, name_by, concurrency, no_verify, force,
+                  max_rps, max_inflight, output_format):
+    """Download many files by hash, concurrently, skipping ones already present.
+
+    Completed downloads are journaled in the output directory, and every file
+    is written through a temp file that is only renamed into place once
+    verified, so re-running after a crash picks up where it stopped.
+    """
+    client: PermastoreItClient = ctx.obj['CLIENT']
+    base_url = ctx.obj['BASE_URL']
+    ctx.obj['OUTPUT_FORMAT'] = output_format
+    if sum(bool(x) for x in (hashes_file, all_files, query)) != 1:
+        raise click.UsageError("Pass exactly one of --from-file, --all or --search.")
+    _apply_throttle(client, max_rps, max_inflight)
+
+    try:
+        if hashes_file is not None:
+            items = _read_download_list(hashes_file)
+            if limit:
+                items = items[:limit]
+        elif all_files:
+            items = [(record["hash"], record.get("filename")) for record in client.iter_files(limit=limit) if record.get("hash")]
+        else:
+            items = [(record["hash"], record.get("filename")) for record in client.search(query, limit=limit or 100) if record.get("hash")]
+        os.makedirs(out_dir, exist_ok=True)
+    except Exception as e:
+        handle_sdk_error(e)
+    targets = _download_targets(items, name_by)
+    if not targets:
+        console.print("[yellow]Nothing to download.[/]")
+        return
+
+    # Journal of finished downloads: lets a re-run skip files without re-hashing them
+    journal_path = os.path.join(out_dir, DOWNLOAD_JOURNAL)
+    journal: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(journal_path):
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for record in _read_json_lines(f):
+                journal[record.get("path", "")] = record
+    journal_file = open(journal_path, "a", encoding="utf-8")
+    journal_lock = threading.Lock()
+
+    def remember(file_hash: str, path: str) -> None:
+        st = os.stat(path)
+        line = json.dumps({"hash": file_hash, "path": os.path.basename(path), "size": st.st_size,
+                           "mtime_ns": st.st_mtime_ns}, separators=(',', ':'))
+        with journal_lock:
+            journal_file.write(line + "\n")
+            journal_file.flush()
+
+    def fetch(file_hash: str, name: str) -> Dict[str, Any]:
+        path = os.path.join(out_dir, name)
+        t_start = time.perf_counter()
+        try:
+            if not force and os.path.exists(path):
+                entry = journal.get(name)
+                st = os.stat(path)
+                if entry and entry.get("hash") == file_hash and entry.get("size") == st.st_size \
+                        and entry.get("mtime_ns") == st.st_mtime_ns:
+                    return {"success": True, "hash": file_hash, "path": path, "status": "skipped", "bytes": 0}
+                if no_verify or compute_file_hash(path) == file_hash.lower():
+                    remember(file_hash, path)
+                    return {"success": True, "hash": file_hash, "path": path, "status": "skipped", "bytes": 0}
+            with _FileBar(file_bars, name) as bar:
+                client.download(file_hash, save_dir=out_dir, save_filename=name, verify=not no_verify, progress=bar)
+            remember(file_hash, path)
+            return {"success": True, "hash": file_hash, "path": path, "status": "downloaded",
+                    "bytes": os.path.getsize(path), "time_ms": (time.perf_counter() - t_start) * 1000}
+        except Exception as e:
+            return {"success": False, "hash": file_hash, "path": path, "error": str(e),
+                    "time_ms": (time.perf_counter() - t_start) * 1000}
+
+    console.print(f"Downloading {len(targets)} file(s) from [cyan]{base_url}[/] to '[cyan]{out_dir}[/]' ({concurrency} workers)...")
+    counts = {"downloaded": 0, "skipped": 0, "failed": 0}
+    total_bytes = 0
+    failures = []
+    t_start = time.perf_counter()
+    progress = Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed:,.0f}/{task.total:,.0f}"),
+        TimeRemainingColumn(),
+        TimeElapsedColumn(),
+        console=console,
+    )
+    file_bars = _file_bars() # One byte bar per in-flight download
+    with Live(Group(progress, file_bars), console=console, refresh_per_second=10):
+        task = progress.add_task("[cyan]Downloading...", total=len(targets))
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                pending = set()
+                for file_hash, name in targets: # Bounded submission keeps memory flat on long lists
+                    pending.add(executor.submit(fetch, file_hash, name))
+                    if len(pending) < concurrency * 2:
+                        continue
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        total_bytes = _record_download(future.result(), counts, failures, total_bytes, output_format)
+                    _update_download_progress(progress, task, counts, total_bytes, t_start)
+                for future in as_completed(pending):
+                    total_bytes = _record_download(future.result(), counts, failures, total_bytes, output_format)
+                    _update_download_progress(progress, task, counts, total_bytes, t_start)
+        except KeyboardInterrupt:
+            console.print("[yellow]Interrupted; re-run the same command to resume.[/]")
+            journal_file.close()
+            sys.exit(130)
+    journal_file.close()
+
+    elapsed = time.perf_counter() - t_start
+    summary = dict(counts, total=len(targets), bytes=total_bytes, elapsed_s=elapsed,
+                   throughput_mb_s=total_bytes / elapsed / 1e6 if elapsed > 0 else 0.0)
+    if output_format == 'json':
+        print_output({"summary": summary}, output_format)
+    else:
+        console.print(f"\nBulk download complete. Downloaded: [green]{counts['downloaded']}[/], "
+                      f"Skipped (already present): {counts['skipped']}, Failed: [red]{counts['failed']}[/] "
+                      f"- {total_bytes / 1e6:,.1f} MB in {elapsed:.1f}s ({summary['throughput_mb_s']:.1f} MB/s)")
+        for failure in failures[:20]:
+            console.print(f"  [red]FAILED[/] {failure['hash']}: {failure['error']}")
+    if counts["failed"]:
+        sys.exit(1)
+
+def _read_json_lines(lines) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue # Torn last line after a crash
+        if isinstance(record, dict):
+            yield record
+
+def _record_download(record: Dict[str, Any], counts: Dict[str, int], failures: List[Dict[str, Any]],
+                     total_bytes: int, output_format: str) -> int:
+    if record["success"]:
+        counts[record["status"]] += 1
+    else:
+        counts["failed"] += 1
+        failures.append(record)
+    if output_format == 'json':
+        print_output(record, output_format)
+    return total_bytes + record.get("bytes", 0)
+
+def _update_download_progress(progress: Progress, task, counts: Dict[str, int], total_bytes: int, t_start: float) -> None:
+    elapsed = time.perf_counter() - t_start
+    rate = total_bytes / elapsed / 1e6 if elapsed > 0 else 0.0
+    progress.update(task, completed=sum(counts.values()),
+                    description=f"[cyan]Downloading ({total_bytes / 1e6:,.1f} MB, {rate:.1f} MB/s, "
+                                f"{counts['skipped']} skipped, {counts['failed']} failed)...")
+
+def _file_table(title: Optional[str], show_header: bool = True) -> Table:
+    """Builds the table layout used for file listings."""
+    table = Table(title=title, box=box.ROUNDED, show_header=show_header, header_style="bold magenta")
+    table.add_column("Hash", style="dim cyan", width=18, overflow='fold')
+    table.add_column("Timestamp", style="white", width=20)
+    table.add_column("Size (Bytes)", style="white", justify="right", width=12)
+    table.add_column("Content Type", style="yellow", overflow='fold')
+    table.add_column("Filename", style="green", overflow='fold')
+    return table
+
 @cli.command(name="list")
 @click.option('--limit', '-l', type=click.INT, default=None, help="Limit number of results.")
+@click.option('--page-size', type=click.IntRange(min=1), default=500, help="Records fetched per page while streaming.", show_default=True)
 @common_options
 @click.pass_context
-def list_files(ctx, limit, output_format):
-    """List metadata of stored files (most recent first)."""
+def list_files(ctx, limit, page_size, output_format):
+    """List metadata of stored files (most recent first), streamed page by page."""
     client: PermastoreItClient = ctx.obj['CLIENT']
     base_url = ctx.obj['BASE_URL']
     ctx.obj['OUTPUT_FORMAT'] = output_format
     console.print(f"Listing files from [cyan]{base_url}[/] (limit: {limit or 'All'})...")
+    count = 0
     try:
         t_start = time.perf_counter()
-        results = client.list_files(limit=limit)
-        t_end = time.perf_counter()
-        duration_ms = (t_end - t_start) * 1000
+        rows = []
+        first_table = True
+
+        def flush_rows():
+            # Render each page as its own table chunk so nothing accumulates
+            nonlocal rows, first_table
+            if not rows:
+                return
+            table = _file_table(f"Stored Files (Limit: {limit or 'All'})" if first_table else None, show_header=first_table)
+            for row in rows:
+                table.add_row(*row)
+            console.print(table)
+            rows = []
+            first_table = False
+
+        for item in client.iter_files(page_size=page_size, limit=limit):
+            count += 1
+            if output_format == 'json':
+                print_output(item, output_format) # One JSON line per file
+                continue
+            ts_raw = item.get('timestamp', 0)
+            try: ts = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts_raw)) if ts_raw else 'N/A'
+            except ValueError: ts = 'Invalid Timestamp'
+            rows.append((
+                item.get('hash', 'N/A')[:18], # Truncate hash
+                ts,
+                str(item.get('size', 0)),
+                item.get('content_type', '?'),
+                item.get('filename', 'N/A')
+            ))
+            if len(rows) >= page_size:
+                flush_rows()
+        flush_rows()
+        duration_ms = (time.perf_counter() - t_start) * 1000
 
         if output_format == 'json':
-             output_data = {"files": results, "query_time_ms": duration_ms}
-             print_output(output_data, output_format) # Single JSON line for list
+            print_output({"summary": {"count": count, "query_time_ms": duration_ms}}, output_format)
         else:
-            console.print(f"Query Time: {duration_ms:.2f} ms")
-            if not results:
+            if count == 0:
                 console.print("[yellow]No files found.[/]")
-                return
-
-            table = Table(title=f"Stored Files (Limit: {limit or 'All'})", box='ROUNDED', show_header=True, header_style="bold magenta")
-            table.add_column("Hash", style="dim cyan", width=18, overflow='fold')
-            table.add_column("Timestamp", style="white", width=20)
-            table.add_column("Size (Bytes)", style="white", justify="right", width=12)
-            table.add_column("Content Type", style="yellow", overflow='fold')
-            table.add_column("Filename", style="green", overflow='fold')
-
-            for item in results:
-                 ts_raw = item.get('timestamp', 0)
-                 try: ts = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts_raw)) if ts_raw else 'N/A'
-                 except ValueError: ts = 'Invalid Timestamp'
-                 table.add_row(
-                     item.get('hash', 'N/A')[:18], # Truncate hash
-                     ts,
-                     str(item.get('size', 0)),
-                     item.get('content_type', '?'),
-                     item.get('filename', 'N/A')
-                 )
-            console.print(table)
+            console.print(f"Listed {count} file(s). Query Time: {duration_ms:.2f} ms")
 
     except Exception as e:
         handle_sdk_error(e)
 
 @cli.command()
-@click.argument('file_hash', type=click.STRING)
+@click.argument('file_hash', type=click.STRING, required=False)
+@click.option('--from-file', '-f', 'hashes_file', type=click.File('r'), default=None, help="Read hashes (one per line) from a file, or '-' for stdin.")
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=8, help="Parallel lookups with --from-file when the node has no batch endpoint.", show_default=True)
+@throttle_options
 @common_options
 @click.pass_context
-def info(ctx, file_hash, output_format):
-    """Get metadata information for a specific file hash."""
+def info(ctx, file_hash, hashes_file, concurrency, max_rps, max_inflight, output_format):
+    """Get metadata information for a file hash (or many, with --from-file)."""
     client: PermastoreItClient = ctx.obj['CLIENT']
     base_url = ctx.obj['BASE_URL']
     ctx.obj['OUTPUT_FORMAT'] = output_format
+    _apply_throttle(client, max_rps, max_inflight)
+
+    if hashes_file is not None:
+        if file_hash:
+            raise click.UsageError("Pass either FILE_HASH or --from-file, not both.")
+        hashes = [line.strip() for line in hashes_file if line.strip() and not line.startswith('#')]
+        console.print(f"Getting info for {len(hashes)} hash(es) from [cyan]{base_url}[/]...")
+        try:
+            t_start = time.perf_counter()
+            outcomes = client.get_file_info_many(hashes, max_workers=concurrency)
+            duration_ms = (time.perf_counter() - t_start) * 1000
+        except Exception as e:
+            handle_sdk_error(e)
+
+        found = sum(1 for o in outcomes if o["success"])
+        if output_format == 'json':
+            for outcome in outcomes: # One JSON line per input hash, in input order
+                if outcome["success"]:
+                    print_output({"hash": outcome["hash"], "success": True, "result": outcome["result"]}, output_format)
+                else:
+                    print_output({"hash": outcome["hash"], "success": False, "error": str(outcome["error"])}, output_format)
+        else:
+            table = Table(title=f"File Info ({found}/{len(outcomes)} found)", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+            table.add_column("Hash", style="dim cyan", width=18, overflow='fold')
+            table.add_column("Size (Bytes)", style="white", justify="right", width=12)
+            table.add_column("Content Type", style="yellow", overflow='fold')
+            table.add_column("Filename / Error", style="green", overflow='fold')
+            for outcome in outcomes:
+                if outcome["success"]:
+                    item = outcome["result"]
+                    table.add_row(outcome["hash"][:18], str(item.get('size', 0)), item.get('content_type', '?'), item.get('filename', 'N/A'))
+                else:
+                    table.add_row(outcome["hash"][:18], "-", "-", f"[red]{outcome['error']}[/]")
+            console.print(table)
+            console.print(f"Query Time: {duration_ms:.2f} ms")
+        if found < len(outcomes):
+            sys.exit(1)
+        return
+
+    if not file_hash:
+        raise click.UsageError("Missing FILE_HASH (or use --from-file).")
     console.print(f"Getting info for hash '[cyan]{file_hash}[/]' from [cyan]{base_url}[/]...")
     try:
         t_start = time.perf_counter()
@@ -471,7 +1022,7 @@ def search(ctx, query, limit, output_format):
                 console.print("[yellow]No results found.[/]")
                 return
 
-            table = Table(title=f"Search Results for '{query}' (Limit: {limit})", box='ROUNDED', show_header=True, header_style="bold magenta")
+            table = Table(title=f"Search Results for '{query}' (Limit: {limit})", box=box.ROUNDED, show_header=True, header_style="bold magenta")
             table.add_column("Hash", style="dim cyan", width=18, overflow='fold')
             table.add_column("Relevance", style="white", justify="right", width=10)
             table.add_column("Size (Bytes)", style="white", justify="right", width=12)
@@ -513,38 +1064,705 @@ def zkp(ctx, file_hash, output_format):
     except Exception as e:
         handle_sdk_error(e)
 
-# --- New Command for Metrics ---
-@cli.command(name="get-metrics")
+# --- Small-File Bundles ---
+
+def _load_bundle_index(client, bundle: str) -> BundleIndex:
+    """An index file path, or a bundle hash whose embedded index is read from the node."""
+    if os.path.isfile(bundle):
+        return BundleIndex.load(bundle)
+    return fetch_index(client, bundle)
+
+@cli.group()
+def bundle():
+    """Pack many small files into single uploads and read members back by range."""
+    pass
+
+@bundle.command(name="create")
+@click.argument('directory_path', type=click.Path(exists=True, file_okay=False, readable=True))
+@click.option('--pattern', '-p', 'patterns', multiple=True, default=["*"], help="Glob for files to include. Repeatable.", show_default=True)
+@click.option('--exclude', '-x', 'excludes', multiple=True, help="Glob for files or directories to skip. Repeatable.")
+@click.option('--max-file-size', callback=_size_option, default="64k", help="Only bundle files up to this size.", show_default=True)
+@click.option('--max-bundle-size', callback=_size_option, default="64m", help="Start a new bundle past this size.", show_default=True)
+@click.option('--max-members', type=click.IntRange(min=1), default=DEFAULT_MAX_MEMBERS, help="Start a new bundle past this many files.", show_default=True)
+@click.option('--index-dir', type=click.Path(file_okay=False), default=".", help="Where to save each bundle's index (<hash>.index.json).", show_default=True)
 @common_options
 @click.pass_context
-def get_metrics(ctx, output_format):
-    """Fetch detailed performance metrics from the node (REQUIRES backend /metrics endpoint)."""
+def bundle_create(ctx, directory_path, patterns, excludes, max_file_size, max_bundle_size, max_members, index_dir, output_format):
+    """Upload the small files under a directory as tar bundles with member indexes."""
     client: PermastoreItClient = ctx.obj['CLIENT']
-    base_url = ctx.obj['BASE_URL']
     ctx.obj['OUTPUT_FORMAT'] = output_format
-    console.print(f"Fetching metrics from [cyan]{base_url}[/]...")
+    os.makedirs(index_dir, exist_ok=True)
+    paths = (path for path, _ in discover_files(directory_path, include=list(patterns), exclude=list(excludes),
+                                                max_size=max_file_size))
+    table = Table(title="Bundles", box=box.SIMPLE_HEAD, show_header=True, header_style="bold magenta")
+    for column in ("Bundle Hash", "Members", "Size", "Index"):
+        table.add_column(column, justify="right" if column in ("Members", "Size") else "left")
+    total_members = 0
     try:
-        # Assumes a get_metrics() method exists in the SDK, calling a '/metrics' endpoint
-        if not hasattr(client, 'get_metrics'):
-             console.print(Panel(
-                "SDK method 'get_metrics()' not found.\n"
-                "This command requires a '/metrics' endpoint on the backend node and corresponding SDK support.",
-                title="[bold yellow]Not Implemented[/]", border_style="yellow", expand=False
-             ))
-             sys.exit(1)
+        with console.status("[cyan]Bundling...") as status:
+            for index in pack_files(client, paths, root=directory_path, max_bundle_size=max_bundle_size,
+                                    max_members=max_members):
+                index_path = os.path.join(index_dir, f"{index.bundle_hash}.index.json")
+                index.save(index_path)
+                total_members += len(index)
+                status.update(f"[cyan]Bundling... {total_members:,} files uploaded")
+                if output_format == 'json':
+                    print_output({"bundle_hash": index.bundle_hash, "members": len(index),
+                                  "bundle_size": index.bundle_size, "index_path": index_path}, output_format)
+                table.add_row(index.bundle_hash, f"{len(index):,}", f"{index.bundle_size / 1024:,.1f} KB", index_path)
+    except Exception as e:
+        handle_sdk_error(e)
+    if output_format != 'json':
+        console.print(table if total_members else "[yellow]No files found matching pattern.[/]")
 
+@bundle.command(name="ls")
+@click.argument('bundle_ref', metavar='BUNDLE')
+@common_options
+@click.pass_context
+def bundle_ls(ctx, bundle_ref, output_format):
+    """List the members of a bundle (BUNDLE is a hash or an index file)."""
+    client: PermastoreItClient = ctx.obj['CLIENT']
+    try:
+        index = _load_bundle_index(client, bundle_ref)
+    except Exception as e:
+        handle_sdk_error(e)
+    if output_format == 'json':
+        print_output(index.to_dict(), output_format)
+        return
+    table = Table(title=f"Bundle {index.bundle_hash} ({len(index):,} members)", box=box.SIMPLE_HEAD,
+                  show_header=True, header_style="bold magenta")
+    for column in ("Name", "Size", "Offset", "SHA-256"):
+        table.add_column(column, justify="right" if column in ("Size", "Offset") else "left")
+    for member in index:
+        table.add_row(member.name, f"{member.size:,}", f"{member.offset:,}", member.sha256[:16] + "...")
+    console.print(table)
+
+@bundle.command(name="extract")
+@click.argument('bundle_ref', metavar='BUNDLE')
+@click.argument('members', nargs=-1)
+@click.option('--out-dir', '-o', default=".", type=click.Path(file_okay=False, writable=True), help="Directory to extract into.", show_default=True)
+@common_options
+@click.pass_context
+def bundle_extract(ctx, bundle_ref, members, out_dir, output_format):
+    """Extract members (default: all) of a bundle with ranged reads, verifying each SHA-256."""
+    client: PermastoreItClient = ctx.obj['CLIENT']
+    try:
+        index = _load_bundle_index(client, bundle_ref)
+        names = list(members) or [member.name for member in index]
         t_start = time.perf_counter()
-        # result = client.get_metrics() # Replace with actual call when implemented
-        # Placeholder: Simulate fetching data until backend is ready
-        result = {"placeholder": "Backend /metrics endpoint not implemented", "status": "not_implemented"}
-        t_end = time.perf_counter()
-        duration_ms = (t_end - t_start) * 1000
-        result['query_time_ms'] = duration_ms
+        if len(names) == 1:
+            paths = [extract_member(client, index, names[0], out_dir)]
+        else:
+            # Neighbouring members are fetched together; then written out locally
+            data = read_members(client, index, names)
+            paths = []
+            for name in names:
+                path = os.path.abspath(os.path.join(out_dir, name))
+                if not path.startswith(os.path.abspath(out_dir) + os.sep):
+                    raise PermastoreItError(f"Refusing to extract member outside '{out_dir}': {name}")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data[name])
+                paths.append(path)
+        duration_ms = (time.perf_counter() - t_start) * 1000
+    except KeyError as e:
+        handle_sdk_error(PermastoreItError(e.args[0]))
+    except Exception as e:
+        handle_sdk_error(e)
+    if output_format == 'json':
+        print_output({"bundle_hash": index.bundle_hash, "extracted": paths, "time_ms": duration_ms}, output_format)
+    else:
+        console.print(f"[green]Extracted {len(paths)} member(s)[/] to '[cyan]{out_dir}[/]' in {duration_ms:.1f} ms.")
+
+# --- Benchmark Commands ---
+
+BENCH_OPERATIONS = ("upload", "download", "info", "search")
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2, "g": 1024 ** 3, "gb": 1024 ** 3}
+
+def parse_size(text: str) -> int:
+    """Parses a size like '512', '64k' or '1.5mb' into bytes."""
+    value = text.strip().lower()
+    number = value.rstrip("kmgb")
+    unit = value[len(number):]
+    if unit not in _SIZE_UNITS or not number:
+        raise click.BadParameter(f"Invalid size '{text}' (use e.g. 512, 64k, 1m).")
+    return int(float(number) * _SIZE_UNITS[unit])
+
+def parse_weights(spec: str, parse_key=str) -> List[Tuple[Any, float]]:
+    """Parses 'a=3,b=1' into [(a, 3.0), (b, 1.0)]; a bare key gets weight 1."""
+    weights = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        key, _, weight = item.partition("=")
+        try:
+            weights.append((parse_key(key.strip()), float(weight) if weight else 1.0))
+        except ValueError:
+            raise click.BadParameter(f"Invalid weight in '{item}'.")
+    if not weights or any(w < 0 for _, w in weights) or sum(w for _, w in weights) <= 0:
+        raise click.BadParameter(f"'{spec}' needs at least one positive weight.")
+    return weights
+
+class BenchStats:
+    """Per-operation latency histograms, error and byte counters for a bench run."""
+    def __init__(self):
+        self.histograms = {op: LatencyHistogram() for op in BENCH_OPERATIONS}
+        self.errors = {op: 0 for op in BENCH_OPERATIONS}
+        self.bytes = {op: 0 for op in BENCH_OPERATIONS}
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def record(self, op: str, latency_ms: float, success: bool, nbytes: int):
+        self.histograms[op].record(latency_ms)
+        with self._lock:
+            if not success:
+                self.errors[op] += 1
+            self.bytes[op] += nbytes
+
+    def report(self, elapsed_s: float) -> Dict[str, Any]:
+        operations = {}
+        total = LatencyHistogram()
+        for op, histogram in self.histograms.items():
+            if not histogram.count:
+                continue
+            total.merge(histogram)
+            operations[op] = dict(histogram.to_dict(), errors=self.errors[op],
+                                  throughput_ops_s=histogram.count / elapsed_s,
+                                  throughput_mb_s=self.bytes[op] / elapsed_s / 1024 ** 2)
+        overall = dict(total.summary(), errors=sum(self.errors.values()), dropped=self.dropped,
+                       throughput_ops_s=total.count / elapsed_s if elapsed_s else 0.0,
+                       throughput_mb_s=sum(self.bytes.values()) / elapsed_s / 1024 ** 2 if elapsed_s else 0.0)
+        return {"elapsed_s": elapsed_s, "total": overall, "operations": operations}
+
+class BenchWorkload:
+    """Runs single benchmark operations against a client, sharing a pool of known hashes."""
+    def __init__(self, client: PermastoreItClient, sizes: List[Tuple[int, float]], query: str, scratch_dir: str):
+        self.client = client
+        self.sizes = sizes
+        self.query = query
+        self.scratch_dir = scratch_dir
+        self.known_hashes: List[str] = []
+        self._lock = threading.Lock()
+        # One random block per size; each upload prefixes a unique id so the node never dedupes
+        self._blocks = {size: os.urandom(size) for size, _ in sizes}
+
+    def run(self, op: str, rng: random.Random) -> int:
+        """Performs one operation and returns the payload bytes moved."""
+        if op == "upload":
+            size = rng.choices([s for s, _ in self.sizes], weights=[w for _, w in self.sizes])[0]
+            payload = uuid.uuid4().bytes + self._blocks[size][16:] if size >= 16 else uuid.uuid4().bytes[:size]
+            result = self.client.upload_data(payload, f"bench-{uuid.uuid4().hex}.bin", "application/octet-stream")
+            if result.get("hash"):
+                with self._lock:
+                    self.known_hashes.append(result["hash"])
+            return len(payload)
+        if op == "search":
+            self.client.search(self.query, limit=10)
+            return 0
+        with self._lock:
+            if not self.known_hashes:
+                raise PermastoreItError("No uploaded files to read yet.")
+            file_hash = rng.choice(self.known_hashes)
+        if op == "info":
+            self.client.get_file_info(file_hash)
+            return 0
+        path = self.client.download(file_hash, save_dir=self.scratch_dir, save_filename=uuid.uuid4().hex)
+        try:
+            return os.path.getsize(path)
+        finally:
+            os.remove(path)
+
+@cli.group()
+def bench():
+    """Load generation and latency benchmarking against a node."""
+    pass
+
+@bench.command(name="run")
+@click.option('--duration', type=click.FloatRange(min=0.1), default=30, help="Measured run time in seconds.", show_default=True)
+@click.option('--warmup', type=click.FloatRange(min=0), default=5, help="Unmeasured warmup time in seconds.", show_default=True)
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=8, help="Worker threads (closed loop), or max in flight with --rate.", show_default=True)
+@click.option('--rate', type=click.FloatRange(min=0.01), default=None, help="Target operations/second (open loop). Latency counts from the scheduled start.")
+@click.option('--mix', default="upload=1,download=3,info=4,search=2", help="Operation ratios (upload/download/info/search).", show_default=True)
+@click.option('--sizes', default="1k=0.5,64k=0.3,1m=0.2", help="Upload payload size distribution.", show_default=True)
+@click.option('--query', default="bench", help="Search query used by search operations.", show_default=True)
+@click.option('--seed', type=int, default=None, help="Random seed for operation/size selection.")
+@click.option('--output', '-o', 'output_path', type=click.Path(dir_okay=False, writable=True), default=None, help="Write the full results (with histograms) as JSON.")
+@common_options
+@click.pass_context
+def bench_run(ctx, duration, warmup, concurrency, rate, mix, sizes, query, seed, output_path, output_format):
+    """Drive a mixed workload and report p50/p95/p99/p999 latency and throughput."""
+    client: PermastoreItClient = ctx.obj['CLIENT']
+    base_url = ctx.obj['BASE_URL']
+    ctx.obj['OUTPUT_FORMAT'] = output_format
 
-        print_output(result, output_format) # Use helper
+    mix_weights = parse_weights(mix)
+    unknown = [op for op, _ in mix_weights if op not in BENCH_OPERATIONS]
+    if unknown:
+        raise click.BadParameter(f"Unknown operation(s) {unknown}; choose from {', '.join(BENCH_OPERATIONS)}.", param_hint="--mix")
+    size_weights = parse_weights(sizes, parse_size)
+    ops, op_weights = [op for op, _ in mix_weights], [w for _, w in mix_weights]
+
+    mode = f"rate {rate}/s" if rate else f"{concurrency} workers"
+    console.print(f"Benchmarking [cyan]{base_url}[/] ({mode}, warmup {warmup}s, duration {duration}s, mix {mix})...")
+
+    scratch_dir = tempfile.mkdtemp(prefix="permastoreit-bench-")
+    workload = BenchWorkload(client, size_weights, query, scratch_dir)
+    stats = BenchStats()
+    master_rng = random.Random(seed)
+
+    try:
+        if any(op in ("download", "info") for op in ops):
+            # Reads need something to read; seed a few files outside the measured window
+            for _ in range(max(8, concurrency)):
+                try:
+                    workload.run("upload", master_rng)
+                except Exception as e:
+                    handle_sdk_error(e, exit_on_error=False)
+            if not workload.known_hashes:
+                console.print("[bold red]Could not seed any files for read operations; aborting.[/]")
+                sys.exit(1)
+
+        t_begin = time.perf_counter()
+        measure_from = t_begin + warmup
+        t_end = measure_from + duration
+
+        dispatch_counts = {"submitted": 0, "started": 0}
+        counts_lock = threading.Lock()
+
+        def execute(op: str, rng: random.Random, scheduled: float):
+            with counts_lock:
+                dispatch_counts["started"] += 1
+            nbytes, success = 0, True
+            try:
+                nbytes = workload.run(op, rng)
+            except Exception:
+                success = False
+            finished = time.perf_counter()
+            if scheduled >= measure_from:
+                stats.record(op, (finished - scheduled) * 1000, success, nbytes)
+
+        def closed_loop_worker(worker_seed: int):
+            rng = random.Random(worker_seed)
+            while True:
+                started = time.perf_counter()
+                if started >= t_end:
+                    return
+                execute(rng.choices(ops, weights=op_weights)[0], rng, started)
+
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TimeRemainingColumn(),
+            TimeElapsedColumn(),
+            console=console,
+            transient=True
+        ) as progress:
+            task = progress.add_task("[cyan]Warming up...", total=warmup + duration)
+            executor = ThreadPoolExecutor(max_workers=concurrency)
+            if rate:
+                def dispatcher():
+                    # Open loop: issue on a fixed schedule regardless of how fast the node answers
+                    rng = random.Random(master_rng.random())
+                    interval = 1.0 / rate
+                    n = 0
+                    while True:
+                        scheduled = t_begin + n * interval
+                        if scheduled >= t_end:
+                            return
+                        delay = scheduled - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                        op_rng = random.Random(rng.random())
+                        with counts_lock:
+                            dispatch_counts["submitted"] += 1
+                        executor.submit(execute, rng.choices(ops, weights=op_weights)[0], op_rng, scheduled)
+                        n += 1
+                driver = threading.Thread(target=dispatcher, daemon=True)
+                driver.start()
+            else:
+                for _ in range(concurrency):
+                    executor.submit(closed_loop_worker, master_rng.randrange(2 ** 32))
+
+            while time.perf_counter() < t_end:
+                now = time.perf_counter()
+                progress.update(task, completed=min(now - t_begin, warmup + duration),
+                                description="[cyan]Warming up..." if now < measure_from else "[cyan]Measuring...")
+                time.sleep(0.25)
+            if rate:
+                driver.join()
+                # Requests still queued at the deadline never reached the node; count them as dropped
+                executor.shutdown(wait=True, cancel_futures=True)
+                stats.dropped = dispatch_counts["submitted"] - dispatch_counts["started"]
+            else:
+                executor.shutdown(wait=True)
+        elapsed = max(time.perf_counter() - measure_from, 1e-9) if rate is None else duration
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    results = stats.report(elapsed)
+    results["config"] = {"url": base_url, "duration_s": duration, "warmup_s": warmup, "concurrency": concurrency,
+                         "rate": rate, "mix": dict(mix_weights), "sizes": {str(k): v for k, v in size_weights},
+                         "query": query, "seed": seed, "started_at": time.time() - warmup - elapsed}
+
+    if output_path:
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=2)
+        console.print(f"Results written to [cyan]{output_path}[/]")
+
+    if output_format == 'json':
+        summary = {"config": results["config"], "total": results["total"],
+                   "operations": {op: {k: v for k, v in data.items() if k != "buckets"} for op, data in results["operations"].items()}}
+        print_output(summary, output_format)
+    else:
+        console.print(_bench_table(results))
+
+def _fmt_ms(value: Optional[float]) -> str:
+    return f"{value:.2f}" if value is not None else "-"
+
+def _bench_table(results: Dict[str, Any]) -> Table:
+    """Renders a bench result as a latency/throughput table."""
+    table = Table(title=f"Benchmark Results ({results['elapsed_s']:.1f}s measured)", box=box.ROUNDED,
+                  show_header=True, header_style="bold magenta")
+    table.add_column("Operation", style="cyan", no_wrap=True)
+    for column in ("Ops", "Errors", "Ops/s", "MB/s", "p50 ms", "p95 ms", "p99 ms", "p999 ms", "Max ms"):
+        table.add_column(column, justify="right")
+    rows = list(results["operations"].items()) + [("TOTAL", results["total"])]
+    for name, data in rows:
+        table.add_row(name, str(data["count"]), str(data["errors"]), f"{data['throughput_ops_s']:.1f}",
+                      f"{data['throughput_mb_s']:.2f}", _fmt_ms(data["p50_ms"]), _fmt_ms(data["p95_ms"]),
+                      _fmt_ms(data["p99_ms"]), _fmt_ms(data["p999_ms"]), _fmt_ms(data["max_ms"]),
+                      style="bold" if name == "TOTAL" else None)
+    return table
+
+@bench.command(name="compare")
+@click.argument('baseline', type=click.File('r'))
+@click.argument('current', type=click.File('r'))
+@click.option('--threshold', type=click.FloatRange(min=0), default=10.0, help="Percent change counted as a regression.", show_default=True)
+@common_options
+def bench_compare(baseline, current, threshold, output_format):
+    """Compare two 'bench run --output' files and flag regressions."""
+    base, cur = json.load(baseline), json.load(current)
+    rows = []
+    regressed = False
+    for op in sorted(set(base["operations"]) & set(cur["operations"])) + ["total"]:
+        b = base["total"] if op == "total" else base["operations"][op]
+        c = cur["total"] if op == "total" else cur["operations"][op]
+        for metric, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("p99_ms", True),
+                                        ("p999_ms", True), ("throughput_ops_s", False)):
+            if not b.get(metric) or c.get(metric) is None:
+                continue
+            change = (c[metric] - b[metric]) / b[metric] * 100
+            is_regression = change > threshold if higher_is_worse else change < -threshold
+            regressed = regressed or is_regression
+            rows.append({"operation": op, "metric": metric, "baseline": b[metric], "current": c[metric],
+                         "change_pct": change, "regression": is_regression})
+
+    if output_format == 'json':
+        for row in rows:
+            print_output(row, output_format)
+    else:
+        table = Table(title=f"Benchmark Comparison (threshold {threshold:.1f}%)", box=box.ROUNDED,
+                      show_header=True, header_style="bold magenta")
+        for column in ("Operation", "Metric", "Baseline", "Current", "Change"):
+            table.add_column(column, justify="left" if column in ("Operation", "Metric") else "right")
+        for row in rows:
+            color = "red" if row["regression"] else "green" if abs(row["change_pct"]) > threshold else "white"
+            table.add_row(row["operation"], row["metric"], f"{row['baseline']:.2f}", f"{row['current']:.2f}",
+                          f"[{color}]{row['change_pct']:+.1f}%[/]")
+        console.print(table)
+    if regressed:
+        sys.exit(1)
 
+# --- Node Metrics ---
+
+def _metric_matches(name: str, pattern: Optional[str]) -> bool:
+    """Glob match if the pattern has wildcards, substring match otherwise."""
+    if not pattern:
+        return True
+    if any(ch in pattern for ch in "*?["):
+        return fnmatch.fnmatchcase(name, pattern)
+    return pattern in name
+
+def _format_metric_value(value: Optional[float], signed: bool = False) -> str:
+    if value is None:
+        return "-"
+    if value != value or value in (float("inf"), float("-inf")): # NaN / Inf
+        return str(value)
+    sign = "+" if signed else ""
+    if float(value).is_integer():
+        return f"{value:{sign},.0f}"
+    return f"{value:{sign}.4g}"
+
+def _metrics_table(rows: List[Dict[str, Any]], title: str, watching: bool) -> Table:
+    table = Table(title=title, box=box.SIMPLE_HEAD, show_header=True, header_style="bold magenta")
+    table.add_column("Metric", style="cyan", overflow="fold")
+    table.add_column("Labels", overflow="fold")
+    table.add_column("Value", justify="right")
+    if watching:
+        table.add_column("Δ", justify="right")
+        table.add_column("Rate/s", justify="right")
+    for row in rows:
+        labels = ",".join(f"{k}={v}" for k, v in sorted(row["labels"].items()))
+        cells = [row["name"], labels, _format_metric_value(row["value"])]
+        if watching:
+            cells += [_format_metric_value(row["delta"], signed=True) if row["delta"] else "",
+                      _format_metric_value(row["rate"]) if row["rate"] else ""]
+        table.add_row(*cells)
+    return table
+
+@cli.command(name="get-metrics")
+@click.option('--watch', '-w', 'interval', type=click.FloatRange(min=0.1), default=None,
+              help='Re-scrape every N seconds, showing deltas and per-second rates.')
+@click.option('--count', '-n', type=click.IntRange(min=1), default=None, help='Stop after N scrapes (with --watch).')
+@click.option('--filter', 'name_filter', default=None,
+              help='Only show metrics whose name matches this glob (e.g. "*_total") or substring.')
+@click.option('--buckets/--no-buckets', default=False, help='Include histogram _bucket series in tables.', show_default=True)
+@click.option('--export', 'export_path', type=click.Path(dir_okay=False), default=None,
+              help='Append every scrape to this file as a JSON line.')
+@common_options
+@click.pass_context
+def get_metrics(ctx, interval, count, name_filter, buckets, export_path, output_format):
+    """Fetch and display the node's /metrics (Prometheus text or JSON).
+
+    With --watch, the node is polled repeatedly and counters are shown with
+    their change and rate since the previous scrape.
+    """
+    client: PermastoreItClient = ctx.obj['CLIENT']
+    base_url = ctx.obj['BASE_URL']
+    ctx.obj['OUTPUT_FORMAT'] = output_format
+    watching = interval is not None
+    if not watching:
+        count = 1
+
+    def scrape(previous):
+        t_start = time.perf_counter()
+        metrics = client.get_metrics()
+        query_time_ms = (time.perf_counter() - t_start) * 1000
+        rows = [row for row in metrics.delta(previous) if _metric_matches(row["name"], name_filter)]
+        record = {"url": base_url, "fetched_at": metrics.fetched_at, "format": metrics.source_format,
+                  "query_time_ms": query_time_ms, "samples": rows}
+        if export_path:
+            with open(export_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, separators=(',', ':')) + "\n")
+        return metrics, record
+
+    def render(record):
+        rows = record["samples"] if buckets else [r for r in record["samples"] if not r["name"].endswith("_bucket")]
+        scraped = time.strftime("%H:%M:%S", time.localtime(record["fetched_at"]))
+        title = (f"Node Metrics - {base_url} ({record['format']}, {scraped}, "
+                 f"{record['query_time_ms']:.1f} ms, {len(rows)} series)")
+        return _metrics_table(rows, title, watching)
+
+    if not watching and output_format != 'json':
+        console.print(f"Fetching metrics from [cyan]{base_url}[/]...")
+    previous, scrapes = None, 0
+    live = Live(console=console, auto_refresh=False) if watching and output_format != 'json' else None
+    try:
+        if live is not None:
+            live.start()
+        while True:
+            previous, record = scrape(previous)
+            scrapes += 1
+            if output_format == 'json':
+                print_output(record, output_format)
+            elif live is not None:
+                live.update(render(record), refresh=True)
+            else:
+                console.print(render(record))
+            if count is not None and scrapes >= count:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
+        if live is not None:
+            live.stop()
+            live = None
         handle_sdk_error(e)
+    finally:
+        if live is not None:
+            live.stop()
+
+
+# --- Live Dashboard ---
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+def _sparkline(values, width: int = 8) -> str:
+    """Renders the last `width` values as a unicode sparkline, scaled to their own range."""
+    values = [v for v in values if v is not None][-width:]
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    top = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round((v - low) / (high - low) * top) if high > low else 0] for v in values)
+
+def _metrics_rates(current, previous) -> Tuple[Optional[float], Optional[float]]:
+    """Total request rate (req/s) and mean request latency (ms) between two /metrics scrapes."""
+    if previous is None:
+        return None, None
+    request_rate, found = 0.0, False
+    duration_sum, duration_count = 0.0, 0.0
+    for row in current.delta(previous):
+        if row["delta"] is None:
+            continue
+        if row["type"] == "counter" and row["name"].endswith("requests_total") and row["rate"] is not None:
+            request_rate += row["rate"]
+            found = True
+        elif row["type"] in ("histogram", "summary") and "duration" in row["family"]:
+            scale = 1000.0 if row["family"].endswith("_seconds") else 1.0
+            if row["name"] == row["family"] + "_sum":
+                duration_sum += row["delta"] * scale
+            elif row["name"] == row["family"] + "_count":
+                duration_count += row["delta"]
+    return (request_rate if found else None), (duration_sum / duration_count if duration_count else None)
+
+class _NodePoller:
+    """Polls one node's /status, /health and /metrics on a background thread and keeps a short history."""
+
+    def __init__(self, url: str, client: PermastoreItClient, interval: float, history: int):
+        self.url = url
+        self.client = client
+        self.interval = interval
+        self.status: Dict[str, Any] = {}
+        self.health: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.updated: Optional[float] = None # time.monotonic() of the last successful poll
+        self.metrics_supported = True
+        self.request_rate = deque(maxlen=history)
+        self.latency_ms = deque(maxlen=history)
+        self.chain = deque(maxlen=history) # (monotonic time, blockchain_length)
+        self._previous_metrics = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"permastoreit-top-{url}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self._poll()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _poll(self) -> None:
+        try:
+            t_start = time.perf_counter()
+            status = self.client.get_status()
+            poll_ms = (time.perf_counter() - t_start) * 1000
+        except Exception as e:
+            with self._lock:
+                self.error = f"HTTP {e.status_code}" if isinstance(e, APIError) else \
+                    "timeout" if "timed out" in str(e).lower() else \
+                    "down" if isinstance(e, NetworkError) else type(e).__name__
+            return
+        try:
+            health = self.client.get_health()
+        except APIError as e: # Nodes answer /health with 503 while degraded
+            health = {"status": f"error {e.status_code}"}
+        except Exception as e:
+            health = {"status": f"error ({type(e).__name__})"}
+
+        request_rate = latency = None
+        if self.metrics_supported:
+            try:
+                metrics = self.client.get_metrics()
+                request_rate, latency = _metrics_rates(metrics, self._previous_metrics)
+                self._previous_metrics = metrics
+            except APIError as e:
+                if e.status_code in (404, 501):
+                    self.metrics_supported = False # Older node without /metrics; stop asking
+            except Exception:
+                pass # Keep the status view alive; rates resume on the next scrape
+        now = time.monotonic()
+        with self._lock:
+            self.status, self.health, self.error, self.updated = status, health, None, now
+            self.request_rate.append(request_rate)
+            self.latency_ms.append(latency if latency is not None else (None if self.metrics_supported else poll_ms))
+            if isinstance(status.get("blockchain_length"), (int, float)):
+                self.chain.append((now, status["blockchain_length"]))
+
+    def row(self) -> List[str]:
+        """One dashboard row; safe to call from the render thread while a poll is running."""
+        with self._lock:
+            status, health, error, updated = dict(self.status), dict(self.health), self.error, self.updated
+            request_rate = list(self.request_rate)
+            latency_ms, chain = list(self.latency_ms), list(self.chain)
+
+        state = health.get("status") or status.get("status") or "-"
+        color = "green" if state in ("healthy", "online") else "yellow"
+        if error:
+            state, color = error, "red"
+        if updated is not None and time.monotonic() - updated > 2 * self.interval + 1:
+            state = f"{state}, stale {time.monotonic() - updated:.0f}s" # Last good data is getting old
+        chain_text = "-"
+        if chain:
+            chain_text = f"{chain[-1][1]:,}"
+            elapsed = chain[-1][0] - chain[0][0]
+            if elapsed > 0:
+                chain_text += f" [dim]+{(chain[-1][1] - chain[0][1]) / elapsed * 60:.0f}/m[/]"
+        rate, latency = request_rate[-1] if request_rate else None, latency_ms[-1] if latency_ms else None
+        return [
+            self.url.split("://", 1)[-1],
+            f"[{color}]{state}[/]",
+            str(status.get("peers_connected", "-")),
+            f"{status['files_stored']:,}" if isinstance(status.get("files_stored"), int) else "-",
+            chain_text,
+            f"{rate:.1f} [cyan]{_sparkline(request_rate)}[/]" if rate is not None else "-",
+            f"{latency:.1f} [cyan]{_sparkline(latency_ms)}[/]" if latency is not None else "-",
+        ]
+
+def _dashboard(pollers: List[_NodePoller], interval: float) -> Table:
+    table = Table(title=f"PermastoreIt Nodes (every {interval:g}s, Ctrl+C to quit)", box=box.SIMPLE_HEAD,
+                  show_header=True, header_style="bold magenta", pad_edge=False)
+    table.add_column("Node", style="cyan", no_wrap=True)
+    table.add_column("Health", no_wrap=True)
+    table.add_column("Peers", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("Chain", justify="right")
+    table.add_column("Req/s", no_wrap=True)
+    table.add_column("Latency ms", no_wrap=True)
+    for poller in pollers:
+        table.add_row(*poller.row())
+    if pollers and not any(p.metrics_supported for p in pollers):
+        table.caption = "No /metrics on these nodes: latency is the /status round trip."
+    return table
+
+@cli.command()
+@click.option('--interval', '-i', type=click.FloatRange(min=0.2), default=2.0, help="Seconds between polls of each node.", show_default=True)
+@click.option('--history', type=click.IntRange(min=2), default=30, help="Polls kept for sparklines and chain growth.", show_default=True)
+@click.option('--iterations', '-n', type=click.IntRange(min=1), default=None, help="Exit after N refreshes (default: run until Ctrl+C).")
+@click.pass_context
+def top(ctx, interval, history, iterations):
+    """Live dashboard of node health, request rates and latency.
+
+    Every node given with --url is polled concurrently in the background
+    (/status, /health and /metrics when available); the screen redraws
+    independently, so a slow or dead node shows up as stale instead of
+    freezing the view.
+    """
+    client = ctx.obj['CLIENT']
+    nodes = [(node.url, node.client) for node in client.nodes] if isinstance(client, PermastoreItCluster) \
+        else [(client.base_url, client)]
+    pollers = [_NodePoller(url, node_client, interval, history) for url, node_client in nodes]
+    for poller in pollers:
+        poller.start()
+    refreshes = 0
+    try:
+        with Live(_dashboard(pollers, interval), console=console, refresh_per_second=4) as live:
+            while iterations is None or refreshes < iterations:
+                time.sleep(interval)
+                live.update(_dashboard(pollers, interval))
+                refreshes += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for poller in pollers:
+            poller.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,297 @@
+# --- PermastoreIt Multi-Node Client ---
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Any, Callable, Sequence
+
+from permastoreit_sdk import (
+    PermastoreItClient,
+    PermastoreItError,
+    APIError,
+    NetworkError,
+    FileNotFoundErrorOnServer,
+    IntegrityError,
+    RequestEvent,
+    RetryPolicy,
+    _RollingLatency,
+)
+
+# --- Node State ---
+
+class NodeState:
+    """Routing state for one node: EWMA latency and failure-based health."""
+
+    EWMA_ALPHA = 0.3 # Weight of the newest sample
+    BASE_COOLDOWN = 1.0 # Seconds a node sits out after failing, doubled per consecutive failure
+    MAX_COOLDOWN = 60.0
+
+    def __init__(self, url: str, client: PermastoreItClient):
+        self.url = url
+        self.client = client
+        self.ewma_ms: Optional[float] = None
+        self.latency = _RollingLatency()
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def record_success(self, latency_ms: Optional[float] = None) -> None:
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.down_until = 0.0
+            if latency_ms is not None:
+                self.ewma_ms = latency_ms if self.ewma_ms is None else (
+                    self.EWMA_ALPHA * latency_ms + (1 - self.EWMA_ALPHA) * self.ewma_ms)
+        if latency_ms is not None:
+            self.latency.record(latency_ms)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            cooldown = min(self.MAX_COOLDOWN, self.BASE_COOLDOWN * 2 ** (self.consecutive_failures - 1))
+            self.down_until = time.monotonic() + cooldown
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "ewma_ms": self.ewma_ms,
+            "p95_ms": self.latency.percentile(95, min_samples=1),
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+# --- Cluster Client ---
+
+def _is_node_fault(error: Exception) -> bool:
+    """Errors that say something about the node rather than the request."""
+    if isinstance(error, APIError):
+        return error.status_code >= 500 or error.status_code == 429
+    return isinstance(error, (NetworkError, IntegrityError))
+
+class PermastoreItCluster:
+    """
+    A client for several PermastoreIt nodes that routes around slow or dead ones.
+
+    Each node keeps an EWMA of its response latency and a health state: a node
+    that fails (network error, 5xx or 429) sits out for a cooldown that doubles
+    with every consecutive failure. Reads go to the fastest healthy node and
+    fail over to the next one; downloads also fail over when a node doesn't
+    have the content (404) or serves a corrupt copy. Metadata reads can be
+    hedged: if the first node hasn't answered within its p95 latency, the same
+    request is sent to the next-best node and the first answer wins.
+
+    Methods that aren't routed (e.g. upload_resumable, iter_files) run on the
+    currently preferred node.
+
+    Example Usage:
+        cluster = PermastoreItCluster(["http://node-a:5000", "http://node-b:5000"], hedge=True)
+        info = cluster.get_file_info(file_hash)
+        cluster.download(file_hash, save_dir="downloaded_files")
+    """
+    def __init__(self, urls: Sequence[str], hedge: bool = False, hedge_delay_ms: Optional[float] = None,
+                 hedge_min_delay_ms: float = 5.0, **client_kwargs):
+        """
+        Args:
+            urls: Base URLs of the nodes.
+            hedge: Hedge metadata reads (file info, search, list, zk-proof, status).
+            hedge_delay_ms: Fixed hedge delay. If None, each node's recent p95
+                            latency is used once enough samples exist.
+            hedge_min_delay_ms: Lower bound on the hedge delay.
+            **client_kwargs: Passed to each node's PermastoreItClient. Unless a
+                             retry_policy is given, nodes don't retry on their
+                             own; failing over to another node is the retry.
+        """
+        urls = [url.rstrip('/') for url in urls]
+        if not urls:
+            raise ValueError("At least one node URL is required.")
+        if len(urls) > 1:
+            client_kwargs.setdefault("retry_policy", RetryPolicy.disabled())
+        self.nodes = [NodeState(url, PermastoreItClient(base_url=url, **client_kwargs)) for url in urls]
+        self.hedge = hedge
+        self.hedge_delay_ms = hedge_delay_ms
+        self.hedge_min_delay_ms = hedge_min_delay_ms
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return self.ranked_nodes()[0].url
+
+    def ranked_nodes(self) -> List[NodeState]:
+        """Healthy nodes fastest first (unmeasured nodes first, to measure them), then sidelined ones."""
+        healthy = [n for n in self.nodes if n.healthy]
+        down = sorted((n for n in self.nodes if not n.healthy), key=lambda n: n.down_until)
+        healthy.sort(key=lambda n: n.ewma_ms if n.ewma_ms is not None else -1.0)
+        return healthy + down
+
+    def node_stats(self) -> List[Dict[str, Any]]:
+        """Routing state of every node, in current preference order."""
+        return [node.stats() for node in self.ranked_nodes()]
+
+    def add_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        """Registers a request hook on every node's client (see PermastoreItClient.add_hook)."""
+        for node in self.nodes:
+            node.client.add_hook(hook)
+
+    def remove_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        for node in self.nodes:
+            node.client.remove_hook(hook)
+
+    def close(self) -> None:
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+        for node in self.nodes:
+            node.client.close()
+
+    def __enter__(self) -> "PermastoreItCluster":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not defined here: delegate to the preferred node
+        if name.startswith("_") or name == "nodes":
+            raise AttributeError(name)
+        return getattr(self.ranked_nodes()[0].client, name)
+
+    # --- Routing ---
+
+    def _attempt(self, node: NodeState, operation: Callable[[PermastoreItClient], Any],
+                 timed: bool) -> Any:
+        """Runs operation on one node and updates its state."""
+        t_start = time.perf_counter()
+        try:
+            result = operation(node.client)
+        except PermastoreItError as e:
+            if _is_node_fault(e):
+                node.record_failure()
+            else:
+                node.record_success() # The node answered; the request was the problem
+            raise
+        node.record_success((time.perf_counter() - t_start) * 1000 if timed else None)
+        return result
+
+    def _route(self, operation: Callable[[PermastoreItClient], Any], fail_over: Callable[[Exception], bool],
+               timed: bool = True) -> Any:
+        """Tries nodes in preference order until one succeeds or an error isn't worth failing over."""
+        last_error: Optional[Exception] = None
+        for node in self.ranked_nodes():
+            try:
+                return self._attempt(node, operation, timed)
+            except PermastoreItError as e:
+                if not fail_over(e):
+                    raise
+                last_error = e
+        raise last_error
+
+    def _hedge_delay(self, node: NodeState) -> Optional[float]:
+        delay_ms = self.hedge_delay_ms
+        if delay_ms is None:
+            delay_ms = node.latency.percentile(95)
+        if delay_ms is None:
+            return None # Not enough samples yet; don't hedge blind
+        return max(delay_ms, self.hedge_min_delay_ms) / 1000.0
+
+    def _get_hedge_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=max(4, 2 * len(self.nodes)),
+                                                      thread_name_prefix="permastoreit-hedge")
+            return self._hedge_pool
+
+    def _read(self, operation: Callable[[PermastoreItClient], Any], not_found_fails_over: bool = True) -> Any:
+        """Routes a metadata read, hedging it if enabled."""
+        def fail_over(error: Exception) -> bool:
+            return _is_node_fault(error) or (not_found_fails_over and isinstance(error, FileNotFoundErrorOnServer))
+
+        nodes = self.ranked_nodes()
+        if not self.hedge or len(nodes) < 2 or not nodes[1].healthy:
+            return self._route(operation, fail_over)
+
+        pool = self._get_hedge_pool()
+        primary, backup = nodes[0], nodes[1]
+        pending = {pool.submit(self._attempt, primary, operation, True)}
+        attempted = [primary]
+        done, _ = wait(pending, timeout=self._hedge_delay(primary))
+        if not done:
+            # Primary is slower than its p95: race a second copy on the next-best node
+            pending.add(pool.submit(self._attempt, backup, operation, True))
+            attempted.append(backup)
+        last_error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    return future.result() # The loser finishes in the background and only updates stats
+                if not fail_over(error):
+                    raise error
+                last_error = error
+        # Every attempt so far failed; fall back to the remaining nodes one by one
+        for node in nodes:
+            if node in attempted:
+                continue
+            try:
+                return self._attempt(node, operation, True)
+            except PermastoreItError as e:
+                if not fail_over(e):
+                    raise
+                last_error = e
+        raise last_error
+
+    # --- Public SDK Methods ---
+
+    def get_status(self) -> Dict[str, Any]:
+        """Gets the operational status of the preferred node."""
+        return self._read(lambda c: c.get_status())
+
+    def get_health(self) -> Dict[str, Any]:
+        """Gets the health check report of the preferred node."""
+        return self._read(lambda c: c.get_health())
+
+    def get_file_info(self, file_hash: str) -> Dict[str, Any]:
+        """Gets metadata for a file hash from the first node that has it."""
+        return self._read(lambda c: c.get_file_info(file_hash))
+
+    def get_file_info_many(self, hashes: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """Batched file info from the preferred node (see PermastoreItClient.get_file_info_many)."""
+        return self._read(lambda c: c.get_file_info_many(hashes, **kwargs))
+
+    def get_zk_proof(self, file_hash: str) -> Dict[str, Any]:
+        """Gets the ZK proof for a file hash from the first node that can produce it."""
+        return self._read(lambda c: c.get_zk_proof(file_hash))
+
+    def list_files(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._read(lambda c: c.list_files(limit), not_found_fails_over=False)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return self._read(lambda c: c.search(query, limit), not_found_fails_over=False)
+
+    def upload(self, file_path: str, skip_existing: bool = False, **kwargs) -> Dict[str, Any]:
+        """Uploads to the preferred node, failing over only on node faults. See PermastoreItClient.upload."""
+        return self._route(lambda c: c.upload(file_path, skip_existing=skip_existing, **kwargs), _is_node_fault, timed=False)
+
+    def download(self, file_hash: str, save_dir: str, save_filename: Optional[str] = None, **kwargs) -> str:
+        """
+        Downloads a file from the fastest node that has it.
+
+        Falls over to the next node on timeouts and other node faults, when a
+        node doesn't have the content (404), and when verification fails.
+        Keyword arguments are passed to PermastoreItClient.download.
+        """
+        def fail_over(error: Exception) -> bool:
+            return _is_node_fault(error) or isinstance(error, (FileNotFoundErrorOnServer, IntegrityError))
+
+        return self._route(lambda c: c.download(file_hash, save_dir, save_filename, **kwargs), fail_over, timed=False)
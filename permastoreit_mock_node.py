@@ -0,0 +1,597 @@
+# --- PermastoreIt Mock Node ---
+#
+# A local, dependency-free stand-in for a PermastoreIt node API, used to exercise
+# the SDK and CLI offline. Content is stored in memory, addressed by SHA-256.
+# Latency, bandwidth caps and error rates can be injected for reproducible
+# performance testing:
+#
+#     python permastoreit_mock_node.py --port 5000 --latency-ms 20 --jitter-ms 5 \
+#         --bandwidth 10m --error-rate 0.01
+
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP as HTTP_POLICY
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+# --- Storage ---
+
+class MockStore:
+    """Thread-safe, in-memory content-addressed store plus chunked upload sessions."""
+
+    def __init__(self):
+        self.blobs: Dict[str, bytes] = {}
+        self.metadata: Dict[str, Dict[str, Any]] = {}
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def put(self, data: bytes, filename: str, content_type: str,
+            zkp_available: bool = False) -> Tuple[int, Dict[str, Any]]:
+        """Stores a blob and returns (status_code, upload response) like the real /upload."""
+        file_hash = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            if file_hash in self.blobs:
+                return 200, dict(self.metadata[file_hash], status="deduplicated",
+                                 message="File already exists (exact duplicate).")
+            self.blobs[file_hash] = data
+            self.metadata[file_hash] = {
+                "hash": file_hash,
+                "filename": filename,
+                "content_type": content_type,
+                "size": len(data),
+                "timestamp": time.time(),
+                "zkp_available": zkp_available,
+            }
+            return 201, dict(self.metadata[file_hash], status="success", message="File uploaded successfully.")
+
+# --- Metrics ---
+
+class MockMetrics:
+    """Per-route request counters and latency histograms, served at /metrics."""
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0) # Seconds
+
+    def __init__(self):
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = {} # (method, route, status) -> count
+        self.durations: Dict[str, List[float]] = {} # route -> bucket counts + [sum, count]
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.in_flight = 0
+
+    def record(self, method: str, route: str, status: int, seconds: float, bytes_in: int, bytes_out: int):
+        with self.lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            series = self.durations.setdefault(route, [0] * len(self.BUCKETS) + [0.0, 0])
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    series[i] += 1
+            series[-2] += seconds
+            series[-1] += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def snapshot(self, store: MockStore) -> Dict[str, Any]:
+        with store.lock:
+            files, stored_bytes, sessions = len(store.blobs), sum(map(len, store.blobs.values())), len(store.sessions)
+        with self.lock:
+            return {
+                "requests": {f"{m} {r} {s}": n for (m, r, s), n in sorted(self.requests.items())},
+                "durations": {route: list(series) for route, series in self.durations.items()},
+                "request_bytes": self.bytes_in, "response_bytes": self.bytes_out, "in_flight": self.in_flight,
+                "files_stored": files, "stored_bytes": stored_bytes, "upload_sessions": sessions,
+                "uptime_seconds": time.time() - self.started,
+            }
+
+    def render_prometheus(self, store: MockStore) -> str:
+        snap = self.snapshot(store)
+        lines = ["# HELP permastore_http_requests_total HTTP requests handled.",
+                 "# TYPE permastore_http_requests_total counter"]
+        for key, count in snap["requests"].items():
+            method, route, status = key.split(" ")
+            lines.append(f'permastore_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+        lines += ["# HELP permastore_http_request_duration_seconds Time spent handling requests.",
+                  "# TYPE permastore_http_request_duration_seconds histogram"]
+        for route, series in sorted(snap["durations"].items()):
+            for bound, count in zip(self.BUCKETS, series):
+                lines.append(f'permastore_http_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {count}')
+            lines.append(f'permastore_http_request_duration_seconds_bucket{{route="{route}",le="+Inf"}} {series[-1]}')
+            lines.append(f'permastore_http_request_duration_seconds_sum{{route="{route}"}} {series[-2]:.6f}')
+            lines.append(f'permastore_http_request_duration_seconds_count{{route="{route}"}} {series[-1]}')
+        for name, kind, help_text, value in (
+                ("permastore_http_request_bytes_total", "counter", "Request body bytes received.", snap["request_bytes"]),
+                ("permastore_http_response_bytes_total", "counter", "Response body bytes sent.", snap["response_bytes"]),
+                ("permastore_http_requests_in_flight", "gauge", "Requests being handled.", snap["in_flight"]),
+                ("permastore_files_stored", "gauge", "Files in the store.", snap["files_stored"]),
+                ("permastore_stored_bytes", "gauge", "Bytes of content in the store.", snap["stored_bytes"]),
+                ("permastore_upload_sessions_active", "gauge", "Open chunked upload sessions.", snap["upload_sessions"]),
+                ("permastore_uptime_seconds", "gauge", "Seconds since the node started.", round(snap["uptime_seconds"], 3))):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+# --- Fault Injection ---
+
+class MockNodeConfig:
+    """Injected latency, bandwidth and failure settings shared by all request handlers."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, bandwidth_bps: Optional[float] = None,
+                 error_rate: float = 0.0, error_status: int = 503, zkp_enabled: bool = True,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            latency_ms: Fixed delay added before every routed request is handled.
+            jitter_ms: Extra uniformly random delay in [0, jitter_ms].
+            bandwidth_bps: Per-connection cap in bytes/second for request and
+                           response bodies (None = unlimited).
+            error_rate: Probability (0-1) that a request fails with error_status.
+            error_status: HTTP status for injected failures (429/503 add Retry-After).
+            zkp_enabled: If False, /zk-proof answers 501 like a node without ZKP.
+            seed: Seed for the injection RNG, for reproducible runs.
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1.")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth_bps = bandwidth_bps
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.zkp_enabled = zkp_enabled
+        self.random = random.Random(seed)
+        self._lock = threading.Lock() # Keeps the seeded sequence reproducible across threads
+
+    def sample_delay(self) -> float:
+        """Seconds to stall the current request."""
+        with self._lock:
+            jitter = self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000.0
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self.random.random() < self.error_rate
+
+# Optional API features this mock implements, advertised in /status
+CAPABILITIES = ("chunked-upload", "range-download", "file-info-batch")
+
+# --- Request Handler ---
+
+class MockNodeHandler(BaseHTTPRequestHandler):
+    """Routes requests onto the MockStore attached to the server."""
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real node
+    server_version = "PermastoreItMock/0.1"
+
+    ROUTES = [
+        ("GET", re.compile(r"^/$"), "root"),
+        ("GET", re.compile(r"^/status$"), "status"),
+        ("GET", re.compile(r"^/health$"), "health"),
+        ("POST", re.compile(r"^/upload$"), "upload"),
+        ("GET", re.compile(r"^/files$"), "files"),
+        ("GET", re.compile(r"^/download/(?P<file_hash>[^/]+)$"), "download"),
+        ("GET", re.compile(r"^/file-info/(?P<file_hash>[^/]+)$"), "file_info"),
+        ("POST", re.compile(r"^/file-info/batch$"), "file_info_batch"),
+        ("GET", re.compile(r"^/search$"), "search"),
+        ("GET", re.compile(r"^/zk-proof/(?P<file_hash>[^/]+)$"), "zk_proof"),
+        ("GET", re.compile(r"^/metrics$"), "metrics"),
+        ("POST", re.compile(r"^/uploads/init$"), "chunked_init"),
+        ("GET", re.compile(r"^/uploads/(?P<upload_id>[^/]+)$"), "chunked_status"),
+        ("PUT", re.compile(r"^/uploads/(?P<upload_id>[^/]+)/chunks/(?P<index>\d+)$"), "chunked_put"),
+        ("POST", re.compile(r"^/uploads/(?P<upload_id>[^/]+)/commit$"), "chunked_commit"),
+    ]
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without NODELAY, Nagle plus
+        # delayed ACKs add ~40ms to every keep-alive response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass # Keep test and benchmark output quiet
+
+    @property
+    def store(self) -> MockStore:
+        return self.server.store
+
+    @property
+    def config(self) -> MockNodeConfig:
+        return self.server.config
+
+    @property
+    def metrics(self) -> MockMetrics:
+        return self.server.metrics
+
+    # --- Plumbing ---
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def _dispatch(self, method: str):
+        self._status, self._bytes_in, self._bytes_out = 0, 0, 0
+        route = "unmatched"
+        started = time.perf_counter()
+        with self.metrics.lock:
+            self.metrics.in_flight += 1
+        try:
+            route = self._route(method)
+        finally:
+            with self.metrics.lock:
+                self.metrics.in_flight -= 1
+            self.metrics.record(method, route, self._status, time.perf_counter() - started,
+                                self._bytes_in, self._bytes_out)
+
+    def _route(self, method: str) -> str:
+        """Runs the matching handler (with injected faults) and returns the route name."""
+        parts = urlsplit(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.match(parts.path)
+            if match and route_method == method:
+                delay = self.config.sample_delay()
+                if delay:
+                    time.sleep(delay)
+                if self.config.should_fail():
+                    self.read_body()
+                    status = self.config.error_status
+                    headers = {"Retry-After": "1"} if status in (429, 503) else None
+                    self.send_json(status, {"detail": "Injected failure (mock node)."}, headers)
+                    return name
+                try:
+                    getattr(self, f"handle_{name}")(**match.groupdict())
+                except Exception as e: # Surface handler bugs as 500s rather than dropped connections
+                    self.send_json(500, {"detail": f"Mock node error: {e}"})
+                return name
+        self.read_body() # Drain so the connection can be reused
+        self.send_json(404, {"detail": "Not Found"})
+        return "unmatched"
+
+    def do_GET(self): self._dispatch("GET")
+    def do_POST(self): self._dispatch("POST")
+    def do_PUT(self): self._dispatch("PUT")
+
+    def _throttle(self, started: float, transferred: int):
+        """Sleeps until `transferred` bytes fit under the configured bandwidth cap."""
+        ahead = started + transferred / self.config.bandwidth_bps - time.perf_counter()
+        if ahead > 0:
+            time.sleep(ahead)
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return b""
+        self._bytes_in += length
+        if not self.config.bandwidth_bps:
+            return self.rfile.read(length)
+        step = max(1, int(self.config.bandwidth_bps / 50)) # ~20ms slices
+        parts, received, started = [], 0, time.perf_counter()
+        while received < length:
+            part = self.rfile.read(min(step, length - received))
+            if not part:
+                break
+            parts.append(part)
+            received += len(part)
+            self._throttle(started, received)
+        return b"".join(parts)
+
+    def write_body(self, data: bytes):
+        self._bytes_out += len(data)
+        if not self.config.bandwidth_bps:
+            self.wfile.write(data)
+            return
+        step = max(1, int(self.config.bandwidth_bps / 50))
+        started = time.perf_counter()
+        for offset in range(0, len(data), step):
+            self.wfile.write(data[offset:offset + step])
+            self._throttle(started, min(offset + step, len(data)))
+
+    def send_json(self, status: int, payload: Any, extra_headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.write_body(body)
+
+    def send_bytes(self, status: int, data: bytes, content_type: str = "application/octet-stream",
+                   extra_headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.write_body(data)
+
+    # --- Core Endpoints ---
+
+    def handle_root(self):
+        self.send_json(200, {"message": "Welcome to the PermastoreIt mock node"})
+
+    def handle_status(self):
+        with self.store.lock:
+            files_stored = len(self.store.blobs)
+        self.send_json(200, {"status": "online", "node_id": "mock-node", "files_stored": files_stored,
+                             "blockchain_length": files_stored + 1, "peers_connected": 0,
+                             "capabilities": list(CAPABILITIES)})
+
+    def handle_health(self):
+        with self.store.lock:
+            files_stored = len(self.store.blobs)
+        self.send_json(200, {"status": "healthy", "node_id": "mock-node",
+                             "components": {"storage": True, "blockchain": True, "dht": True},
+                             "files_stored": files_stored, "blockchain_length": files_stored + 1,
+                             "peers_connected": 0})
+
+    def handle_upload(self):
+        body = self.read_body()
+        content_type = self.headers.get("Content-Type", "")
+        message = BytesParser(policy=HTTP_POLICY).parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+        if not message.is_multipart():
+            return self.send_json(400, {"detail": "Expected multipart/form-data upload."})
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "file":
+                data = part.get_payload(decode=True) or b""
+                status, result = self.store.put(data, part.get_filename() or "upload",
+                                                part.get_content_type(), self.config.zkp_enabled)
+                return self.send_json(status, result)
+        self.send_json(400, {"detail": "Missing 'file' form field."})
+
+    def handle_files(self):
+        try:
+            limit = int(self.query["limit"]) if "limit" in self.query else None
+            offset = int(self.query.get("offset", 0))
+        except ValueError:
+            return self.send_json(422, {"detail": "'limit' and 'offset' must be integers."})
+        with self.store.lock:
+            records = sorted(self.store.metadata.values(), key=lambda m: m["timestamp"], reverse=True)
+        records = records[offset:offset + limit] if limit is not None else records[offset:]
+        self.send_json(200, records)
+
+    def handle_download(self, file_hash: str):
+        with self.store.lock:
+            data = self.store.blobs.get(file_hash)
+            meta = self.store.metadata.get(file_hash)
+        if data is None:
+            return self.send_json(404, {"detail": "File not found"})
+        headers = {"Accept-Ranges": "bytes"}
+        range_header = self.headers.get("Range")
+        if range_header:
+            match = re.match(r"^bytes=(\d*)-(\d*)$", range_header.strip())
+            if not match or not (match.group(1) or match.group(2)):
+                return self.send_json(416, {"detail": f"Unsupported Range header: {range_header}"})
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), len(data) - 1) if match.group(2) else len(data) - 1
+            else: # Suffix range: last N bytes
+                start, end = max(0, len(data) - int(match.group(2))), len(data) - 1
+            if start >= len(data) or start > end:
+                headers["Content-Range"] = f"bytes */{len(data)}"
+                return self.send_bytes(416, b"", extra_headers=headers)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            return self.send_bytes(206, data[start:end + 1], meta["content_type"], headers)
+        self.send_bytes(200, data, meta["content_type"], headers)
+
+    def handle_file_info(self, file_hash: str):
+        with self.store.lock:
+            meta = self.store.metadata.get(file_hash)
+        if meta is None:
+            return self.send_json(404, {"detail": "File not found"})
+        self.send_json(200, meta)
+
+    def handle_file_info_batch(self):
+        try:
+            hashes = json.loads(self.read_body() or b"{}")["hashes"]
+        except (ValueError, KeyError, TypeError):
+            return self.send_json(422, {"detail": "batch requires JSON with a 'hashes' list."})
+        with self.store.lock:
+            results = {h: self.store.metadata.get(h) for h in hashes}
+        self.send_json(200, {"results": results})
+
+    def handle_search(self):
+        query = self.query.get("query", "").strip().lower()
+        try:
+            limit = int(self.query.get("limit", 10))
+        except ValueError:
+            return self.send_json(422, {"detail": "'limit' must be an integer."})
+        terms = query.split()
+        with self.store.lock:
+            records = list(self.store.metadata.values())
+        results = []
+        for meta in records:
+            name = meta["filename"].lower()
+            # Whole-query substring match scores 1.0; otherwise the fraction of terms found
+            score = 1.0 if query and query in name else (sum(t in name for t in terms) / len(terms) if terms else 0.0)
+            if score > 0:
+                results.append(dict(meta, similarity=round(score, 4)))
+        results.sort(key=lambda r: (-r["similarity"], -r["timestamp"]))
+        self.send_json(200, results[:limit])
+
+    def handle_metrics(self):
+        if self.query.get("format") == "json":
+            return self.send_json(200, self.metrics.snapshot(self.store))
+        self.send_bytes(200, self.metrics.render_prometheus(self.store).encode(),
+                        "text/plain; version=0.0.4; charset=utf-8")
+
+    def handle_zk_proof(self, file_hash: str):
+        if not self.config.zkp_enabled:
+            return self.send_json(501, {"detail": "ZKP is not enabled on this node."})
+        with self.store.lock:
+            data = self.store.blobs.get(file_hash)
+        if data is None:
+            return self.send_json(404, {"detail": "File not found"})
+        challenge = uuid.uuid4().hex
+        proof = hashlib.sha256(challenge.encode() + data).hexdigest()
+        self.send_json(200, {"hash": file_hash, "proof": proof, "challenge": challenge,
+                             "algorithm": "mock-sha256-commitment"})
+
+    # --- Chunked Upload Protocol ---
+
+    def _get_session(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        with self.store.lock:
+            session = self.store.sessions.get(upload_id)
+        if session is None:
+            self.send_json(404, {"detail": f"Upload session '{upload_id}' not found or expired."})
+        return session
+
+    def handle_chunked_init(self):
+        try:
+            request = json.loads(self.read_body() or b"{}")
+            size = int(request["size"])
+            chunk_size = int(request["chunk_size"])
+        except (ValueError, KeyError, TypeError):
+            return self.send_json(422, {"detail": "init requires JSON with 'size' and 'chunk_size'."})
+        if chunk_size < 1 or size < 0:
+            return self.send_json(422, {"detail": "'size' and 'chunk_size' must be non-negative."})
+        upload_id = uuid.uuid4().hex
+        session = {
+            "upload_id": upload_id,
+            "filename": request.get("filename") or "upload",
+            "content_type": request.get("content_type") or "application/octet-stream",
+            "sha256": request.get("sha256"),
+            "size": size,
+            "chunk_size": chunk_size,
+            "total_chunks": max(1, -(-size // chunk_size)),
+            "chunks": {},
+        }
+        with self.store.lock:
+            self.store.sessions[upload_id] = session
+        self.send_json(201, self._session_view(session))
+
+    def _session_view(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: session[key] for key in ("upload_id", "size", "chunk_size", "total_chunks")} | {
+            "received_chunks": sorted(session["chunks"])}
+
+    def handle_chunked_status(self, upload_id: str):
+        session = self._get_session(upload_id)
+        if session is not None:
+            with self.store.lock:
+                view = self._session_view(session)
+            self.send_json(200, view)
+
+    def handle_chunked_put(self, upload_id: str, index: str):
+        data = self.read_body()
+        session = self._get_session(upload_id)
+        if session is None:
+            return
+        index = int(index)
+        if index >= session["total_chunks"]:
+            return self.send_json(422, {"detail": f"Chunk index {index} out of range."})
+        expected_digest = self.headers.get("X-Chunk-SHA256")
+        if expected_digest and hashlib.sha256(data).hexdigest() != expected_digest:
+            return self.send_json(422, {"detail": f"Chunk {index} failed checksum verification."})
+        with self.store.lock:
+            session["chunks"][index] = data
+        self.send_json(200, {"upload_id": upload_id, "index": index, "size": len(data)})
+
+    def handle_chunked_commit(self, upload_id: str):
+        self.read_body()
+        session = self._get_session(upload_id)
+        if session is None:
+            return
+        missing = [i for i in range(session["total_chunks"]) if i not in session["chunks"]]
+        if missing:
+            return self.send_json(409, {"detail": f"Missing chunks: {missing[:20]}", "missing_chunks": missing})
+        data = b"".join(session["chunks"][i] for i in range(session["total_chunks"]))
+        if len(data) != session["size"] or (session["sha256"] and hashlib.sha256(data).hexdigest() != session["sha256"]):
+            return self.send_json(422, {"detail": "Assembled upload does not match declared size/hash."})
+        with self.store.lock:
+            self.store.sessions.pop(upload_id, None)
+        status, result = self.store.put(data, session["filename"], session["content_type"], self.config.zkp_enabled)
+        self.send_json(status, result)
+
+# --- Server ---
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024 # Default of 5 drops connections under benchmark load
+
+class MockNode:
+    """
+    Runs a mock node on a background thread.
+
+    Example Usage:
+        with MockNode() as node:
+            client = PermastoreItClient(base_url=node.url)
+            client.upload_resumable("big.iso")
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[MockNodeConfig] = None):
+        """
+        Args:
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free port (see `url`).
+            config: Optional latency/bandwidth/error injection settings.
+        """
+        self.store = MockStore()
+        self.config = config or MockNodeConfig()
+        self.httpd = _MockHTTPServer((host, port), MockNodeHandler)
+        self.httpd.store = self.store
+        self.httpd.config = self.config
+        self.metrics = MockMetrics()
+        self.httpd.metrics = self.metrics
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockNode":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="permastoreit-mock-node", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockNode":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def _parse_rate(text: str) -> float:
+    """Parses a bytes/second value like '500k' or '10m'."""
+    units = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+    text = text.strip().lower().rstrip("b")
+    return float(text[:-1]) * units[text[-1]] if text and text[-1] in units else float(text)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Run a local PermastoreIt mock node.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay added to every request.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random delay in [0, jitter].")
+    parser.add_argument("--bandwidth", type=_parse_rate, default=None, help="Per-connection cap, e.g. 500k or 10m bytes/s.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail (0-1).")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status for injected failures.")
+    parser.add_argument("--no-zkp", action="store_true", help="Answer /zk-proof with 501.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible injection.")
+    args = parser.parse_args()
+    node_config = MockNodeConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, bandwidth_bps=args.bandwidth,
+                                 error_rate=args.error_rate, error_status=args.error_status,
+                                 zkp_enabled=not args.no_zkp, seed=args.seed)
+    node = MockNode(args.host, args.port, node_config)
+    print(f"PermastoreIt mock node listening on {node.url} (Ctrl+C to stop)")
+    try:
+        node.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.httpd.server_close()
@@ -1,8 +1,28 @@
 # --- PermastoreIt Python SDK ---
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+import codecs
+import hashlib
+import json
+import math
+import mmap
 import os
-from typing import Dict, List, Optional, Any
+import re
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, as_completed, wait
+from typing import Dict, List, Optional, Any, Callable, Iterator, Union, BinaryIO, Tuple
 import mimetypes
 
 # --- Custom Exceptions ---
@@ -35,19 +55,1464 @@ class ZKPDisabledError(APIError):
     def __init__(self):
         super().__init__(501, "ZKP is not enabled on the target node.")
 
+class IntegrityError(PermastoreItError):
+    """Raised when downloaded content does not hash to the requested SHA-256."""
+    def __init__(self, expected_hash: str, actual_hash: str, path: Optional[str] = None):
+        self.expected_hash = expected_hash
+        self.actual_hash = actual_hash
+        self.path = path
+        super().__init__(f"Integrity check failed: expected SHA-256 {expected_hash}, got {actual_hash}.")
+
+# --- Shared Helpers ---
+
+def _raise_for_api_error(endpoint: str, status_code: int, detail: Optional[str], raw_text: str) -> None:
+    """
+    Maps a non-2xx response onto the SDK exception hierarchy.
+
+    Shared by the sync and async clients so both raise identical errors.
+
+    Raises:
+        FileNotFoundErrorOnServer: For 404 errors on specific resource paths.
+        ZKPDisabledError: For 501 errors related to ZKP.
+        APIError: For any other non-2xx status code.
+    """
+    # Raise specific errors based on status code and context
+    if status_code == 404:
+        path_parts = endpoint.lstrip('/').split('/')
+        if len(path_parts) == 2 and path_parts[0] in ["download", "file-info", "zk-proof"]:
+            resource_id = path_parts[1]
+            raise FileNotFoundErrorOnServer(resource_id)
+        else:
+            raise APIError(status_code, detail or "Resource not found", raw_text)
+    elif status_code == 501 and ("zkp" in endpoint.lower() or "zk-proof" in endpoint.lower()):
+        raise ZKPDisabledError()
+    else:
+        # General API error for other 4xx/5xx codes
+        raise APIError(status_code, detail, raw_text)
+
+def compute_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 hex digest of a local file.
+
+    Reads in fixed-size chunks into a single reused buffer, so hashing a
+    multi-GB file allocates no per-chunk bytes objects.
+
+    Args:
+        file_path: The local path to the file to hash.
+        chunk_size: Size of the read buffer in bytes (default 1MB).
+
+    Returns:
+        The lowercase hex SHA-256 digest, matching the node's content hash.
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, 'rb', buffering=0) as f: # Unbuffered: readinto fills our buffer directly
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+def _load_state(state_path: str) -> Optional[Dict[str, Any]]:
+    """Reads a JSON checkpoint file, returning None if it is missing or unreadable."""
+    try:
+        with open(state_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_state(state_path: str, state: Dict[str, Any]) -> None:
+    """Atomically writes a JSON checkpoint file (temp file + rename)."""
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+def _is_sha256_hex(value: str) -> bool:
+    """True if value looks like a hex SHA-256 digest (and so can be verified)."""
+    return len(value) == 64 and all(c in "0123456789abcdefABCDEF" for c in value)
+
+def _iter_json_array(response: requests.Response, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Incrementally parses a streamed JSON response, yielding array items as they arrive.
+
+    Only one item (plus one network chunk) is held in memory at a time. If the
+    body is a JSON object rather than an array, it is parsed whole and yielded
+    as a single value so the caller can unwrap an envelope.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = response.iter_content(chunk_size=chunk_size)
+    buf, pos, eof = "", 0, False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        try:
+            chunk = next(chunks)
+            buf = buf[pos:] + text_decoder.decode(chunk)
+        except StopIteration:
+            buf, eof = buf[pos:] + text_decoder.decode(b"", final=True), True
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n" + ("," if started else ""):
+            pos += 1
+        if pos >= len(buf):
+            if not fill():
+                raise PermastoreItError("Truncated JSON response from node.")
+            continue
+        if not started:
+            if buf[pos] != "[": # Not an array: parse the whole (bounded) body at once
+                while fill():
+                    pass
+                yield json.loads(buf[pos:])
+                return
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            item, end = None, None
+        # A value ending exactly at the buffer edge may be cut short (e.g. a number)
+        if end is None or (end >= len(buf) and not eof):
+            if not fill():
+                raise PermastoreItError("Malformed JSON array in response from node.")
+            continue
+        pos = end
+        yield item
+
+_pwrite_lock = threading.Lock()
+
+def _pwrite(fd: int, data: bytes, offset: int) -> None:
+    """Positional write that is safe to call from several threads on one fd."""
+    if hasattr(os, "pwrite"):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+    else: # Windows has no pwrite; serialize seek+write instead
+        with _pwrite_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            os.write(fd, data)
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserves `size` bytes for fd, falling back to a sparse truncate where unsupported."""
+    if hasattr(os, "posix_fallocate") and size > 0:
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass # e.g. filesystems without fallocate support
+    os.ftruncate(fd, size)
+
+# --- Transfer Progress ---
+
+class TransferProgress:
+    """
+    Byte progress of one upload or download, reported to a callback.
+
+    The transfer loop calls update() per chunk; the callback runs at most once
+    every `interval` seconds (plus once when the transfer finishes), so a
+    slow callback such as a UI redraw doesn't throttle the transfer. The
+    callback receives this object and may read:
+
+        transferred, total (None if unknown), fraction, rate (recent bytes/s),
+        average_rate (bytes/s since start), eta (seconds, or None), elapsed, done
+
+    Callbacks for segmented downloads can run on worker threads.
+
+    Example Usage:
+        def show(p):
+            print(f"{p.transferred}/{p.total} bytes, {p.rate / 1e6:.1f} MB/s, ETA {p.eta}")
+        client.download(file_hash, "out", progress=show)
+    """
+    RATE_ALPHA = 0.3 # EWMA weight of the newest rate sample
+
+    def __init__(self, callback: Callable[["TransferProgress"], None], total: Optional[int] = None,
+                 interval: float = 0.1, description: str = ""):
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self.description = description
+        self.transferred = 0
+        self.rate = 0.0
+        self.done = False
+        self.started = time.monotonic()
+        self._sample_time = self.started
+        self._sample_bytes = 0
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def average_rate(self) -> float:
+        elapsed = self.elapsed
+        return self.transferred / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> Optional[float]:
+        return min(1.0, self.transferred / self.total) if self.total else None
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds left at the recent rate (None if the total or rate is unknown)."""
+        if self.done:
+            return 0.0
+        rate = self.rate or self.average_rate
+        if not self.total or rate <= 0:
+            return None
+        return max(0.0, self.total - self.transferred) / rate
+
+    def _sample(self, now: float) -> None:
+        # Called under the lock
+        span = now - self._sample_time
+        if span > 0:
+            recent = (self.transferred - self._sample_bytes) / span
+            self.rate = recent if not self._sample_bytes and not self.rate else (
+                self.RATE_ALPHA * recent + (1 - self.RATE_ALPHA) * self.rate)
+            self._sample_time, self._sample_bytes = now, self.transferred
+        self._last_emit = now
+
+    def update(self, nbytes: int) -> None:
+        """Adds transferred bytes; cheap unless the callback is due."""
+        now = time.monotonic()
+        with self._lock:
+            self.transferred += nbytes
+            if now - self._last_emit < self.interval and self.transferred != self.total:
+                return # Last byte always reported, even while waiting on the response
+            self._sample(now)
+        self.callback(self)
+
+    def reset(self, transferred: int = 0) -> None:
+        """Restarts the count, e.g. when a retried request resends the body."""
+        with self._lock:
+            self.transferred = self._sample_bytes = transferred
+            self._sample_time = time.monotonic()
+
+    def finish(self) -> None:
+        """Marks the transfer complete and reports it."""
+        with self._lock:
+            self.done = True
+            self._sample(time.monotonic())
+        self.callback(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"description": self.description, "transferred": self.transferred, "total": self.total,
+                "rate": self.rate, "average_rate": self.average_rate, "eta": self.eta,
+                "elapsed": self.elapsed, "done": self.done}
+
+def _tracker(progress: Optional[Callable[[TransferProgress], None]], total: Optional[int],
+             description: str) -> Optional[TransferProgress]:
+    return TransferProgress(progress, total, description=description) if progress is not None else None
+
+UPLOAD_STREAM_CHUNK_SIZE = 4 * 1024 * 1024 # Slice size handed to the socket per send
+PROGRESS_STREAM_CHUNK_SIZE = 256 * 1024 # Smaller slices when progress is reported, for smooth updates
+
+class _MultipartBody:
+    """
+    A streaming multipart/form-data body for a single file field.
+
+    requests sends any iterable with a __len__ using a fixed Content-Length (no
+    chunked framing), writing each yielded piece straight to the socket. Files
+    with a real descriptor are mmap'ed and yielded as memoryview slices, and
+    in-memory bytes/memoryview payloads are sliced the same way, so the payload
+    is never copied into Python-level buffers. Other file-likes are read through
+    one reused buffer. The body can be iterated more than once (e.g. on retry).
+    """
+    def __init__(self, field_name: str, filename: str, content_type: str,
+                 payload: Union[bytes, bytearray, memoryview, BinaryIO],
+                 progress: Optional[TransferProgress] = None):
+        self.boundary = uuid.uuid4().hex
+        self.payload = payload
+        self.progress = progress
+        self.slice_size = PROGRESS_STREAM_CHUNK_SIZE if progress is not None else UPLOAD_STREAM_CHUNK_SIZE
+        # HTML5-style escaping of the quoted filename, as urllib3 does
+        safe_name = filename.replace('\\', '\\\\').replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+        self.preamble = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{safe_name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode('utf-8')
+        self.epilogue = f"\r\n--{self.boundary}--\r\n".encode('ascii')
+
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            self.payload_size = memoryview(payload).nbytes
+            self._start = 0
+        else:
+            self._start = payload.tell()
+            payload.seek(0, os.SEEK_END)
+            self.payload_size = payload.tell() - self._start
+            payload.seek(self._start)
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self.preamble) + self.payload_size + len(self.epilogue)
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        yield self.preamble
+        if self.progress is None:
+            yield from self._iter_payload()
+        else:
+            self.progress.reset() # A retry resends the payload from the start
+            for piece in self._iter_payload():
+                yield piece
+                self.progress.update(len(piece)) # Resumed once the socket has taken the piece
+        yield self.epilogue
+
+    def _iter_payload(self) -> Iterator[Union[bytes, memoryview]]:
+        if isinstance(self.payload, (bytes, bytearray, memoryview)):
+            view = memoryview(self.payload).cast('B')
+            for offset in range(0, self.payload_size, self.slice_size):
+                yield view[offset:offset + self.slice_size]
+            return
+        if self.payload_size == 0:
+            return
+
+        fileno = None
+        try:
+            fileno = self.payload.fileno()
+        except (AttributeError, OSError, ValueError): # e.g. io.BytesIO has no descriptor
+            pass
+        if fileno is not None:
+            try:
+                mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError): # Pipes and special files can't be mapped
+                mapped = None
+            if mapped is not None:
+                view = memoryview(mapped)
+                try:
+                    end = self._start + self.payload_size
+                    for offset in range(self._start, end, self.slice_size):
+                        yield view[offset:min(offset + self.slice_size, end)]
+                finally:
+                    view.release()
+                    try:
+                        mapped.close()
+                    except BufferError:
+                        pass # Sender still holds the last slice; unmapped once it's dropped
+                return
+
+        buffer = bytearray(self.slice_size)
+        self.payload.seek(self._start)
+        remaining = self.payload_size
+        while remaining > 0:
+            n = self.payload.readinto(buffer) if hasattr(self.payload, 'readinto') else None
+            if n is None: # No readinto(); fall back to read()
+                chunk = self.payload.read(min(remaining, self.slice_size))
+                n = len(chunk)
+                buffer[:n] = chunk
+            if not n:
+                raise IOError(f"File shrank while uploading ({remaining} bytes short).")
+            n = min(n, remaining)
+            remaining -= n
+            yield bytes(buffer[:n]) # Sent synchronously; the buffer is reused next iteration
+
+# --- Latency Histogram ---
+
+class LatencyHistogram:
+    """
+    A thread-safe, HDR-style latency histogram.
+
+    Values (in milliseconds) are counted in logarithmic buckets whose width is
+    a fixed fraction of their value, so any recorded latency from microseconds
+    to hours is reported within `precision` relative error using a few hundred
+    buckets, no matter how many samples are recorded.
+    """
+    def __init__(self, precision: float = 0.01):
+        """
+        Args:
+            precision: Maximum relative error of reported values (default 1%).
+        """
+        if not 0 < precision < 1:
+            raise ValueError("precision must be between 0 and 1.")
+        self.precision = precision
+        self._log_base = math.log1p(2 * precision)
+        self._buckets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    _MIN_VALUE_MS = 0.001 # Values below 1 microsecond share the lowest bucket
+
+    def _index(self, value: float) -> int:
+        return int(math.floor(math.log(max(value, self._MIN_VALUE_MS) / self._MIN_VALUE_MS) / self._log_base))
+
+    def _bucket_value(self, index: int) -> float:
+        # Midpoint of the bucket, within `precision` of every value it holds
+        low = self._MIN_VALUE_MS * math.exp(index * self._log_base)
+        return low * (1 + self.precision)
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        """Records a latency sample (in milliseconds)."""
+        index = self._index(value_ms)
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + count
+            self.count += count
+            self.total += value_ms * count
+            self.min = value_ms if self.min is None else min(self.min, value_ms)
+            self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Adds all samples from another histogram with the same precision."""
+        if other.precision != self.precision:
+            raise ValueError("Can only merge histograms with the same precision.")
+        with other._lock:
+            buckets = dict(other._buckets)
+            count, total, low, high = other.count, other.total, other.min, other.max
+        with self._lock:
+            for index, n in buckets.items():
+                self._buckets[index] = self._buckets.get(index, 0) + n
+            self.count += count
+            self.total += total
+            if low is not None:
+                self.min = low if self.min is None else min(self.min, low)
+                self.max = high if self.max is None else max(self.max, high)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Returns the latency at percentile p (0-100), or None if empty."""
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, math.ceil(self.count * p / 100.0))
+            seen = 0
+            for index in sorted(self._buckets):
+                seen += self._buckets[index]
+                if seen >= target:
+                    # Never report outside the observed range
+                    return min(max(self._bucket_value(index), self.min), self.max)
+            return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def reset(self) -> None:
+        """Discards all recorded samples."""
+        with self._lock:
+            self._buckets.clear()
+            self.count = 0
+            self.total = 0.0
+            self.min = self.max = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns count, min/mean/max and p50/p95/p99/p999 latencies in ms."""
+        return {
+            "count": self.count,
+            "min_ms": self.min,
+            "mean_ms": self.mean,
+            "max_ms": self.max,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "p999_ms": self.percentile(99.9),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (summary plus raw buckets) for exporting and re-loading."""
+        with self._lock:
+            buckets = {str(index): n for index, n in sorted(self._buckets.items())}
+        return dict(self.summary(), precision=self.precision, buckets=buckets)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuilds a histogram exported with to_dict()."""
+        histogram = cls(precision=data.get("precision", 0.01))
+        histogram._buckets = {int(index): n for index, n in data.get("buckets", {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.min, histogram.max = data.get("min_ms"), data.get("max_ms")
+        histogram.total = (data.get("mean_ms") or 0.0) * histogram.count
+        return histogram
+
+# --- Metadata Cache ---
+
+class MetadataCache:
+    """
+    A two-tier cache for file-info and ZK-proof responses, keyed by content hash.
+
+    Tier one is an in-memory LRU bounded by `max_entries`; tier two is an
+    optional SQLite file shared safely between processes (WAL mode, busy
+    timeout). Entries expire after a per-kind TTL, since records such as
+    file-info carry mutable fields (e.g. "zkp_available"); a TTL of None
+    caches a kind forever. Missing files (404s) are never cached.
+
+    Example Usage:
+        cache = MetadataCache(path="~/.permastoreit/metadata.sqlite3")
+        client = PermastoreItClient(base_url=NODE_URL, cache=cache)
+        client.get_file_info(file_hash) # Fetched from the node
+        client.get_file_info(file_hash) # Served from memory
+        print(cache.stats())
+    """
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None,
+                 ttl: Optional[float] = 300.0, zk_proof_ttl: Optional[float] = 60.0):
+        """
+        Args:
+            max_entries: Maximum entries held in the in-memory LRU tier.
+            path: Optional SQLite file for the persistent tier. None keeps the
+                  cache in memory only.
+            ttl: Seconds a file-info entry stays fresh (None = never expires).
+            zk_proof_ttl: Seconds a ZK-proof entry stays fresh (None = never expires).
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer.")
+        self.max_entries = max_entries
+        self.path = os.path.expanduser(path) if path else None
+        self.ttls: Dict[str, Optional[float]] = {"file-info": ttl, "zk-proof": zk_proof_ttl}
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local() # sqlite3 connections can't be shared across threads
+        self._counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0,
+                          "expired": 0, "evictions": 0}
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db().execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, stored_at REAL NOT NULL,"
+                " PRIMARY KEY (kind, key))")
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None) # Autocommit
+            conn.execute("PRAGMA journal_mode=WAL") # Readers don't block the writer across processes
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _is_fresh(self, kind: str, stored_at: float) -> bool:
+        ttl = self.ttls.get(kind)
+        return ttl is None or (time.time() - stored_at) <= ttl
+
+    def _count(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._counters[name] += 1
+
+    def _remember(self, cache_key: Tuple[str, str], stored_at: float, value: Any) -> None:
+        with self._lock:
+            self._memory[cache_key] = (stored_at, value)
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """Returns a fresh cached value for (kind, key), or None on a miss."""
+        cache_key = (kind, key)
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                if self._is_fresh(kind, entry[0]):
+                    self._memory.move_to_end(cache_key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return entry[1]
+                del self._memory[cache_key]
+                self._counters["expired"] += 1
+
+        if self.path:
+            row = self._db().execute("SELECT value, stored_at FROM entries WHERE kind = ? AND key = ?",
+                                     cache_key).fetchone()
+            if row is not None:
+                value, stored_at = json.loads(row[0]), row[1]
+                if self._is_fresh(kind, stored_at):
+                    self._remember(cache_key, stored_at, value)
+                    self._count("hits", "disk_hits")
+                    return value
+                self._count("expired")
+
+        self._count("misses")
+        return None
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        """Stores a value in both tiers."""
+        stored_at = time.time()
+        self._remember((kind, key), stored_at, value)
+        if self.path:
+            self._db().execute("INSERT OR REPLACE INTO entries (kind, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                               (kind, key, json.dumps(value), stored_at))
+
+    def invalidate(self, kind: str, key: str) -> None:
+        """Drops one entry from both tiers."""
+        with self._lock:
+            self._memory.pop((kind, key), None)
+        if self.path:
+            self._db().execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+
+    def purge_expired(self) -> int:
+        """Deletes expired rows from the persistent tier; returns how many were removed."""
+        if not self.path:
+            return 0
+        removed = 0
+        for kind, ttl in self.ttls.items():
+            if ttl is not None:
+                cursor = self._db().execute("DELETE FROM entries WHERE kind = ? AND stored_at < ?",
+                                            (kind, time.time() - ttl))
+                removed += cursor.rowcount
+        return removed
+
+    def clear(self) -> None:
+        """Empties both tiers (counters are kept)."""
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            self._db().execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters for this process plus the current memory size."""
+        with self._lock:
+            stats = dict(self._counters, memory_entries=len(self._memory))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Closes this thread's SQLite connection, if any."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+class _RollingLatency:
+    """Latency percentiles over roughly the last one to two `window` seconds."""
+
+    def __init__(self, window: float = 60.0):
+        self.window = window
+        self._current = LatencyHistogram()
+        self._previous = LatencyHistogram()
+        self._rotated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _maybe_rotate(self) -> None:
+        now = time.monotonic()
+        if now - self._rotated >= self.window:
+            with self._lock:
+                if now - self._rotated >= self.window:
+                    self._previous, self._current = self._current, LatencyHistogram()
+                    self._rotated = now
+
+    def record(self, value_ms: float) -> None:
+        self._maybe_rotate()
+        self._current.record(value_ms)
+
+    def percentile(self, p: float, min_samples: int = 20) -> Optional[float]:
+        """The p-th percentile, or None until min_samples have been seen."""
+        self._maybe_rotate()
+        combined = LatencyHistogram()
+        combined.merge(self._previous)
+        combined.merge(self._current)
+        return combined.percentile(p) if combined.count >= min_samples else None
+
+# --- Retry Policy ---
+
+class RetryBudget:
+    """
+    A token bucket that caps retries as a fraction of overall traffic.
+
+    Every request deposits `ratio` tokens and every retry spends one, plus a
+    small time-based refill so a quiet client can still retry. When a node is
+    overloaded and most requests fail, the bucket drains and the client stops
+    retrying instead of multiplying the load (a retry storm).
+    """
+    def __init__(self, ratio: float = 0.2, min_retries_per_second: float = 2.0, max_tokens: float = 20.0):
+        """
+        Args:
+            ratio: Tokens earned per request (0.2 allows ~20% extra traffic from retries).
+            min_retries_per_second: Refill rate independent of traffic.
+            max_tokens: Bucket capacity, i.e. the largest burst of retries allowed.
+        """
+        if ratio < 0 or min_retries_per_second < 0 or max_tokens < 1:
+            raise ValueError("ratio and min_retries_per_second must be >= 0 and max_tokens >= 1.")
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount: float = 0.0) -> None:
+        now = time.monotonic()
+        earned = (now - self._updated) * self.min_retries_per_second + amount
+        self._tokens = min(self.max_tokens, self._tokens + earned)
+        self._updated = now
+
+    def deposit(self) -> None:
+        """Credits one original (non-retry) request."""
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Spends a token for one retry; False means the budget is exhausted."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried and how long to wait between tries.
+
+    A request is retried on a timeout, a connection error or a retryable status
+    code, only if its method is idempotent (or the caller marks it idempotent,
+    e.g. an upload whose content hash is known), and only while the retry
+    budget allows it. Waits use exponential backoff with full jitter, and a
+    server's Retry-After is honoured when it asks for longer.
+
+    Example Usage:
+        client = PermastoreItClient(retry_policy=RetryPolicy(max_attempts=6))
+        client = PermastoreItClient(retry_policy=RetryPolicy.disabled())
+    """
+    DEFAULT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    DEFAULT_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+    def __init__(self, max_attempts: int = 4, backoff_base: float = 0.1, backoff_max: float = 10.0,
+                 retry_methods: Optional[frozenset] = None, retry_statuses: Optional[frozenset] = None,
+                 respect_retry_after: bool = True, max_retry_after: float = 60.0,
+                 budget: Optional[RetryBudget] = None):
+        """
+        Args:
+            max_attempts: Total tries per request, including the first (1 disables retries).
+            backoff_base: Backoff ceiling in seconds for the first retry; doubles per retry.
+            backoff_max: Upper bound on the backoff ceiling.
+            retry_methods: HTTP methods considered idempotent.
+            retry_statuses: Response codes worth retrying.
+            respect_retry_after: Wait at least as long as a Retry-After header asks.
+            max_retry_after: Longest Retry-After wait honoured; longer values
+                             fail the request instead of stalling the caller.
+            budget: Shared RetryBudget (default: a new one per policy).
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_methods = frozenset(m.upper() for m in (retry_methods or self.DEFAULT_METHODS))
+        self.retry_statuses = frozenset(retry_statuses or self.DEFAULT_STATUSES)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.budget = budget or RetryBudget()
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """A policy that never retries."""
+        return cls(max_attempts=1)
+
+    def is_idempotent(self, method: str, idempotent: Optional[bool] = None) -> bool:
+        return idempotent if idempotent is not None else method.upper() in self.retry_methods
+
+    def backoff(self, retry_number: int) -> float:
+        """Full-jitter delay in seconds before retry number `retry_number` (0-based)."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** retry_number))
+        return random.uniform(0, ceiling)
+
+    def retry_after(self, response: requests.Response) -> Optional[float]:
+        """Seconds requested by the response's Retry-After header, if any."""
+        value = response.headers.get("Retry-After")
+        if not value or not self.respect_retry_after:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+# --- Hedging ---
+
+class HedgePolicy:
+    """
+    Settings for hedged reads on a single node.
+
+    If a hedgeable read (file info, search) hasn't answered within the
+    `percentile` of that endpoint's recent latencies, a duplicate is sent on
+    another pooled connection and the first response wins. Hedges draw on a
+    RetryBudget so they stay below `max_hedge_fraction` of read traffic.
+
+    Example Usage:
+        client = PermastoreItClient(hedge_policy=HedgePolicy(percentile=95))
+    """
+    def __init__(self, percentile: float = 95.0, min_delay_ms: float = 5.0, max_hedge_fraction: float = 0.05,
+                 min_samples: int = 20, window: float = 60.0):
+        """
+        Args:
+            percentile: Recent-latency percentile after which a read is hedged.
+            min_delay_ms: Never hedge sooner than this.
+            max_hedge_fraction: Upper bound on hedges as a fraction of hedgeable reads.
+            min_samples: Reads observed per endpoint before hedging starts.
+            window: Seconds of latency history the percentile is computed over.
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100.")
+        if not 0 <= max_hedge_fraction <= 1:
+            raise ValueError("max_hedge_fraction must be between 0 and 1.")
+        self.percentile = percentile
+        self.min_delay_ms = min_delay_ms
+        self.max_hedge_fraction = max_hedge_fraction
+        self.min_samples = min_samples
+        self.window = window
+        self.budget = RetryBudget(ratio=max_hedge_fraction, min_retries_per_second=0.0, max_tokens=10.0)
+
+    def delay(self, latency: _RollingLatency) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there's too little history."""
+        delay_ms = latency.percentile(self.percentile, self.min_samples)
+        return None if delay_ms is None else max(delay_ms, self.min_delay_ms) / 1000.0
+
+def _close_then(close, callback):
+    """Wraps a response's close() so callback runs once the body is released."""
+    def wrapped():
+        try:
+            close()
+        finally:
+            callback()
+    return wrapped
+
+def _discard_response(future: Future) -> None:
+    """Done-callback for a losing hedge: drop its connection without reading the body."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+# --- Rate & Concurrency Limiting ---
+
+ENDPOINT_CLASSES = ("upload", "download", "metadata")
+
+def _endpoint_class(endpoint: str) -> str:
+    """Buckets an API path into the classes throttles are configured by."""
+    path = endpoint.lstrip('/')
+    if path.startswith("upload"): # /upload and the /uploads/... chunked protocol
+        return "upload"
+    if path.startswith("download/"):
+        return "download"
+    return "metadata"
+
+class TokenBucket:
+    """A thread-safe token bucket: `rate` tokens per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Blocks until `tokens` are available and takes them. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                shortfall = (tokens - self._tokens) / self.rate
+            time.sleep(shortfall)
+            waited += shortfall
+
+class AIMDLimiter:
+    """
+    Thread-safe concurrency limit that adapts to observed latency and errors.
+
+    Callers acquire() before a request and release() with its outcome. Every
+    `window` completions the limit is halved if the error rate exceeds
+    `max_error_rate` or the window's p95 latency exceeds `latency_tolerance`
+    times the best p95 seen so far; otherwise it grows by one (AIMD). An
+    explicit overload signal (429/503) halves the limit straight away, at most
+    once per `window` completions so one burst of rejections counts once.
+    """
+    def __init__(self, initial: int, maximum: int, minimum: int = 1, window: int = 20,
+                 max_error_rate: float = 0.05, latency_tolerance: float = 1.5):
+        if minimum < 1 or maximum < minimum:
+            raise ValueError("Need 1 <= minimum <= maximum.")
+        self.limit = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.baseline_p95_ms: Optional[float] = None
+        self._samples: List[float] = []
+        self._errors = 0
+        self._since_decrease = window
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency_ms: Optional[float], success: bool, overloaded: bool = False) -> None:
+        """Frees a slot. latency_ms may be None for outcomes without a timing (e.g. connect errors)."""
+        with self._cond:
+            self.in_flight -= 1
+            self._since_decrease += 1
+            if overloaded:
+                if self._since_decrease >= self.window:
+                    self._decrease()
+            else:
+                if latency_ms is not None:
+                    self._samples.append(latency_ms)
+                if not success:
+                    self._errors += 1
+                if len(self._samples) + self._errors >= self.window:
+                    self._adjust()
+            self._cond.notify_all()
+
+    def _decrease(self) -> None:
+        self.limit = max(self.minimum, self.limit // 2)
+        self._since_decrease = 0
+        self._samples = []
+        self._errors = 0
+
+    def _adjust(self) -> None:
+        error_rate = self._errors / (len(self._samples) + self._errors)
+        p95 = None
+        if self._samples:
+            samples = sorted(self._samples)
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            if self.baseline_p95_ms is None or p95 < self.baseline_p95_ms:
+                self.baseline_p95_ms = p95
+        if error_rate > self.max_error_rate or (p95 is not None and p95 > self.baseline_p95_ms * self.latency_tolerance):
+            self._decrease()
+        else:
+            self.limit = min(self.maximum, self.limit + 1)
+            self._samples = []
+            self._errors = 0
+
+class _ThrottleSlot:
+    """One admitted request: records its time to response and frees its slot exactly once."""
+
+    def __init__(self, limiter: Optional[AIMDLimiter]):
+        self._limiter = limiter
+        self._started = time.perf_counter()
+        self._latency_ms: Optional[float] = None
+        self._success = False
+        self._overloaded = False
+        self._released = False
+
+    def responded(self, status_code: int) -> None:
+        """Notes the response status; latency is measured to headers, not body end."""
+        self._latency_ms = (time.perf_counter() - self._started) * 1000
+        self._success = status_code < 500 and status_code != 429
+        self._overloaded = status_code in Throttle.OVERLOAD_STATUSES
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if self._limiter is not None:
+            self._limiter.release(self._latency_ms, self._success, self._overloaded)
+
+class Throttle:
+    """
+    Client-side rate and concurrency limits per endpoint class.
+
+    Endpoint classes are "upload" (/upload, /uploads/...), "download" and
+    "metadata" (everything else). Each class can have a token-bucket request
+    rate and an in-flight cap. With adaptive=True the cap is an AIMD limit
+    that starts low, grows while the node keeps up, and halves on 429/503
+    responses, error bursts or rising latency. Retries pass through the
+    throttle too, so they can't exceed the configured rate.
+
+    Example Usage:
+        throttle = Throttle(max_rps={"upload": 20, "metadata": 200}, max_inflight=16, adaptive=True)
+        client = PermastoreItClient(throttle=throttle)
+    """
+    OVERLOAD_STATUSES = frozenset({429, 503})
+
+    def __init__(self, max_rps: Union[None, float, Dict[str, float]] = None,
+                 max_inflight: Union[None, int, Dict[str, int]] = None, adaptive: bool = False):
+        """
+        Args:
+            max_rps: Requests per second, for all classes or per class name.
+            max_inflight: Concurrent requests, for all classes or per class name.
+                          With adaptive=True this is the ceiling (default 64).
+            adaptive: Adjust the in-flight cap with AIMD instead of keeping it fixed.
+        """
+        def per_class(value):
+            if isinstance(value, dict):
+                unknown = set(value) - set(ENDPOINT_CLASSES)
+                if unknown:
+                    raise ValueError(f"Unknown endpoint class(es): {sorted(unknown)}. Use {ENDPOINT_CLASSES}.")
+                return {cls: value.get(cls) for cls in ENDPOINT_CLASSES}
+            return {cls: value for cls in ENDPOINT_CLASSES}
+
+        rates = per_class(max_rps)
+        caps = per_class(max_inflight)
+        self.adaptive = adaptive
+        self.buckets = {cls: TokenBucket(rate) for cls, rate in rates.items() if rate}
+        self.limiters: Dict[str, AIMDLimiter] = {}
+        for cls, cap in caps.items():
+            if adaptive:
+                ceiling = cap or 64
+                self.limiters[cls] = AIMDLimiter(initial=max(1, ceiling // 4), maximum=ceiling)
+            elif cap:
+                # A fixed cap is an AIMD limiter that never adjusts
+                self.limiters[cls] = AIMDLimiter(initial=cap, maximum=cap, minimum=cap, window=sys.maxsize)
+
+    def admit(self, endpoint: str) -> _ThrottleSlot:
+        """Blocks until a request to endpoint may start; release the returned slot when done."""
+        cls = _endpoint_class(endpoint)
+        bucket = self.buckets.get(cls)
+        if bucket is not None:
+            bucket.acquire()
+        limiter = self.limiters.get(cls)
+        if limiter is not None:
+            limiter.acquire()
+        return _ThrottleSlot(limiter)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Current in-flight count and limit per limited class."""
+        return {cls: {"in_flight": limiter.in_flight, "limit": limiter.limit}
+                for cls, limiter in self.limiters.items()}
+
+# --- Instrumentation ---
+
+class RequestEvent:
+    """
+    Timing and size breakdown of one HTTP attempt, passed to client hooks.
+
+    Phases (milliseconds, None when they didn't happen):
+        dns_ms, connect_ms, tls_ms: Only on a new connection (reused=False).
+        send_ms: Writing the request line, headers and body.
+        ttfb_ms: From the end of sending to the response headers (server time + one RTT).
+        transfer_ms: Reading the response body (for streams: until it was closed).
+    total_ms covers the whole attempt including any wait for a pooled connection.
+    """
+    __slots__ = ("method", "endpoint", "url", "attempt", "status_code", "error", "start_time",
+                 "dns_ms", "connect_ms", "tls_ms", "send_ms", "ttfb_ms", "transfer_ms", "total_ms",
+                 "bytes_sent", "bytes_received", "reused", "_t_start", "_t_sent", "_t_headers")
+
+    def __init__(self, method: str, endpoint: str, url: str, attempt: int):
+        self.method = method
+        self.endpoint = endpoint # Templated path, e.g. "/file-info/{id}"
+        self.url = url
+        self.attempt = attempt # 0 for the first try; retries count up
+        self.status_code: Optional[int] = None
+        self.error: Optional[str] = None
+        self.start_time = time.time()
+        self.dns_ms = self.connect_ms = self.tls_ms = None
+        self.send_ms = self.ttfb_ms = self.transfer_ms = self.total_ms = None
+        self.bytes_sent: Optional[int] = None
+        self.bytes_received: Optional[int] = None
+        self.reused = True
+        self._t_start = time.perf_counter()
+        self._t_sent: Optional[float] = None
+        self._t_headers: Optional[float] = None
+
+    def headers_received(self, response: requests.Response) -> None:
+        self._t_headers = time.perf_counter()
+        self.status_code = response.status_code
+        if self._t_sent is not None:
+            self.ttfb_ms = (self._t_headers - self._t_sent) * 1000
+        length = response.request.headers.get("Content-Length") if response.request is not None else None
+        self.bytes_sent = int(length) if length and length.isdigit() else self.bytes_sent
+
+    def finish(self, response: Optional[requests.Response] = None, error: Optional[BaseException] = None) -> "RequestEvent":
+        now = time.perf_counter()
+        self.total_ms = (now - self._t_start) * 1000
+        if self._t_headers is not None:
+            self.transfer_ms = (now - self._t_headers) * 1000
+        if response is not None:
+            raw = getattr(response, "raw", None)
+            self.bytes_received = raw.tell() if hasattr(raw, "tell") else len(response.content or b"")
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        return self
+
+    @property
+    def retries(self) -> int:
+        return self.attempt
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+
+_timing_context = threading.local() # The RequestEvent being timed on this thread, if any
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{16,}|[0-9a-fA-F-]{32,36}|\d+)$")
+
+def _endpoint_label(endpoint: str) -> str:
+    """Replaces hashes, ids and indexes in a path so events group per route."""
+    path = "/" + endpoint.lstrip('/').split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+class _TimedConnectionMixin:
+    """Times DNS, TCP connect, TLS and request sending into the thread's current RequestEvent."""
+
+    pool: Optional[HTTPConnectionPool] = None # Set by the owning pool, for connect accounting
+
+    def _new_conn(self):
+        if self.pool is not None:
+            self.pool.num_sockets += 1
+        event = getattr(_timing_context, "event", None)
+        if event is None:
+            return super()._new_conn()
+        host = self._dns_host
+        t_start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            return super()._new_conn() # Let urllib3 raise its usual resolution error
+        t_resolved = time.perf_counter()
+        event.dns_ms = (t_resolved - t_start) * 1000
+        error = None
+        # Connect to the resolved addresses in order, so DNS isn't repeated inside urllib3
+        for *_, sockaddr in addresses:
+            self._dns_host = sockaddr[0]
+            try:
+                sock = super()._new_conn()
+                break
+            except NewConnectionError as e:
+                error = e
+            finally:
+                self._dns_host = host
+        else:
+            raise error
+        event.connect_ms = (time.perf_counter() - t_resolved) * 1000
+        event.reused = False
+        return sock
+
+    def connect(self):
+        t_start = time.perf_counter()
+        super().connect()
+        event = getattr(_timing_context, "event", None)
+        if event is not None and isinstance(self, HTTPSConnection):
+            elapsed = (time.perf_counter() - t_start) * 1000
+            event.tls_ms = max(0.0, elapsed - (event.dns_ms or 0) - (event.connect_ms or 0))
+
+    def request(self, *args, **kwargs):
+        event = getattr(_timing_context, "event", None)
+        t_start = time.perf_counter()
+        super().request(*args, **kwargs)
+        if event is not None:
+            event._t_sent = time.perf_counter()
+            event.send_ms = (event._t_sent - t_start) * 1000
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class _TimedPoolMixin:
+    """Counts sockets actually opened. urllib3's num_connections misses reconnects of pooled connection objects."""
+    num_sockets = 0
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.pool = self
+        return conn
+
+class _TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+# --- Connection Pooling ---
+
+def _build_socket_options(tcp_nodelay: bool, send_buffer_size: Optional[int],
+                          recv_buffer_size: Optional[int], keepalive_idle: Optional[int]) -> List[Tuple[int, int, int]]:
+    """Translates the client's socket settings into urllib3 socket_options tuples."""
+    options = []
+    if tcp_nodelay:
+        options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+    if send_buffer_size:
+        options.append((socket.SOL_SOCKET, socket.SO_SNDBUF, send_buffer_size))
+    if recv_buffer_size:
+        options.append((socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer_size))
+    if keepalive_idle:
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if hasattr(socket, "TCP_KEEPIDLE"): # Linux
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, keepalive_idle))
+        elif hasattr(socket, "TCP_KEEPALIVE"): # macOS
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, keepalive_idle))
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, keepalive_idle // 3)))
+    return options
+
+class _PooledAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter with custom socket options and connection reuse accounting.
+
+    urllib3 counts requests on each host pool and our pool classes count the
+    sockets opened (including reconnects of idle pooled connections). Pools evicted from the pool manager (more hosts than pool_connections) are
+    folded into running totals before they close, so stats stay cumulative.
+    """
+    def __init__(self, socket_options: List[Tuple[int, int, int]], **kwargs):
+        self.socket_options = socket_options
+        self._retired = {"requests": 0, "connections_opened": 0}
+        self._stats_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pools.dispose_func = self._retire_pool
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs.setdefault("socket_options", self.socket_options)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def _retire_pool(self, pool) -> None:
+        with self._stats_lock:
+            self._retired["requests"] += getattr(pool, "num_requests", 0)
+            self._retired["connections_opened"] += getattr(pool, "num_sockets", 0)
+        pool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            totals = dict(self._retired)
+        pools = self.poolmanager.pools
+        live = [pools[key] for key in list(pools.keys()) if key in pools]
+        for pool in live:
+            totals["requests"] += getattr(pool, "num_requests", 0)
+            totals["connections_opened"] += getattr(pool, "num_sockets", 0)
+        totals["connections_reused"] = max(0, totals["requests"] - totals["connections_opened"])
+        totals["reuse_ratio"] = totals["connections_reused"] / totals["requests"] if totals["requests"] else 0.0
+        totals["idle_connections"] = sum(pool.pool.qsize() - pool.pool.queue.count(None)
+                                         for pool in live if getattr(pool, "pool", None) is not None)
+        totals["host_pools"] = len(live)
+        return totals
+
+# --- Node Metrics ---
+
+class MetricSample:
+    """One time series value, e.g. http_requests_total{route="upload"} 42."""
+    __slots__ = ("name", "labels", "value", "timestamp_ms")
+
+    def __init__(self, name: str, labels: Dict[str, str], value: float, timestamp_ms: Optional[int] = None):
+        self.name = name
+        self.labels = labels
+        self.value = value
+        self.timestamp_ms = timestamp_ms
+
+    @property
+    def key(self) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        """Identity of the series, for matching samples across scrapes."""
+        return self.name, tuple(sorted(self.labels.items()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "labels": self.labels, "value": self.value, "timestamp_ms": self.timestamp_ms}
+
+class MetricFamily:
+    """A metric and its samples: type is counter, gauge, summary, histogram or untyped."""
+
+    def __init__(self, name: str, type: str = "untyped", help: str = ""):
+        self.name = name
+        self.type = type
+        self.help = help
+        self.samples: List[MetricSample] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "type": self.type, "help": self.help,
+                "samples": [sample.to_dict() for sample in self.samples]}
+
+class NodeMetrics:
+    """
+    A parsed /metrics scrape.
+
+    Example Usage:
+        metrics = client.get_metrics()
+        uploads = metrics.value("permastore_http_requests_total", route="upload", status="201")
+        for row in metrics.delta(previous): print(row["name"], row["rate"])
+    """
+    def __init__(self, families: Dict[str, MetricFamily], fetched_at: float, source_format: str):
+        self.families = families
+        self.fetched_at = fetched_at # Unix time of the scrape
+        self.source_format = source_format # "prometheus" or "json"
+
+    def samples(self) -> Iterator[Tuple[MetricFamily, MetricSample]]:
+        for family in self.families.values():
+            for sample in family.samples:
+                yield family, sample
+
+    def value(self, name: str, default: Optional[float] = None, **labels) -> Optional[float]:
+        """Sum of the samples named `name` whose labels include all of `labels`."""
+        found = [sample.value for _, sample in self.samples()
+                 if sample.name == name and all(sample.labels.get(k) == str(v) for k, v in labels.items())]
+        return sum(found) if found else default
+
+    def delta(self, previous: Optional["NodeMetrics"]) -> List[Dict[str, Any]]:
+        """
+        Every sample with its change since `previous` (None on the first scrape).
+
+        Counters (and summary/histogram _count/_sum/_bucket series) get a
+        per-second `rate`; a counter that went down is treated as a reset.
+        """
+        elapsed = self.fetched_at - previous.fetched_at if previous is not None else 0.0
+        before = {sample.key: sample.value for _, sample in previous.samples()} if previous is not None else {}
+        rows = []
+        for family, sample in self.samples():
+            row = dict(sample.to_dict(), family=family.name, type=family.type, delta=None, rate=None)
+            if sample.key in before:
+                monotonic = family.type == "counter" or (family.type in ("summary", "histogram")
+                                                         and sample.name != family.name)
+                change = sample.value - before[sample.key]
+                if monotonic and change < 0:
+                    change = sample.value # Counter reset (node restart)
+                row["delta"] = change
+                if monotonic and elapsed > 0:
+                    row["rate"] = change / elapsed
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"fetched_at": self.fetched_at, "format": self.source_format,
+                "families": [family.to_dict() for family in self.families.values()]}
+
+_PROM_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)(?:\s+(-?\d+))?\s*$')
+_PROM_LABEL = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+_PROM_SUFFIXES = ("_bucket", "_count", "_sum", "_total", "_created")
+
+def _prom_unescape(value: str) -> str:
+    return value.replace('\\n', '\n').replace('\\"', '"').replace('\\\\', '\\')
+
+def parse_prometheus_text(text: str) -> Dict[str, MetricFamily]:
+    """
+    Parses the Prometheus text exposition format into metric families.
+
+    Samples such as x_sum/x_count/x_bucket are grouped under family x when a
+    '# TYPE x ...' line declares it. Malformed lines are skipped.
+    """
+    families: Dict[str, MetricFamily] = {}
+
+    def family_for(sample_name: str) -> MetricFamily:
+        if sample_name in families:
+            return families[sample_name]
+        for suffix in _PROM_SUFFIXES:
+            base = sample_name[:-len(suffix)]
+            if sample_name.endswith(suffix) and base in families:
+                return families[base]
+        return families.setdefault(sample_name, MetricFamily(sample_name))
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            parts = line.split(None, 3)
+            if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                family = families.setdefault(parts[2], MetricFamily(parts[2]))
+                rest = parts[3] if len(parts) > 3 else ""
+                if parts[1] == "HELP":
+                    family.help = _prom_unescape(rest)
+                else:
+                    family.type = rest.strip() or "untyped"
+            continue
+        match = _PROM_SAMPLE.match(line)
+        if not match:
+            continue
+        name, label_text, value_text, timestamp = match.groups()
+        try:
+            value = float(value_text) # Accepts NaN, +Inf, -Inf
+        except ValueError:
+            continue
+        labels = {key: _prom_unescape(val) for key, val in _PROM_LABEL.findall(label_text or "")}
+        family_for(name).samples.append(MetricSample(name, labels, value, int(timestamp) if timestamp else None))
+    return families
+
+def parse_json_metrics(data: Any) -> Dict[str, MetricFamily]:
+    """
+    Flattens a JSON metrics document into untyped families.
+
+    Nested objects join keys with '_' ({"requests": {"upload": 3}} becomes
+    requests_upload 3); booleans count as 0/1 and non-numeric leaves are
+    dropped. A list of {"name", "value", "labels"?, "type"?} objects is also
+    accepted.
+    """
+    families: Dict[str, MetricFamily] = {}
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict) and "name" in item and isinstance(item.get("value"), (int, float)):
+                family = families.setdefault(item["name"], MetricFamily(item["name"], item.get("type", "untyped"),
+                                                                         item.get("help", "")))
+                family.samples.append(MetricSample(item["name"], {k: str(v) for k, v in (item.get("labels") or {}).items()},
+                                                   float(item["value"])))
+        return families
+
+    def walk(prefix: str, value: Any) -> None:
+        if isinstance(value, dict):
+            for key, child in value.items():
+                walk(f"{prefix}_{key}" if prefix else str(key), child)
+        elif isinstance(value, (int, float)): # bool is an int
+            name = re.sub(r"[^a-zA-Z0-9_:]", "_", prefix)
+            families.setdefault(name, MetricFamily(name)).samples.append(MetricSample(name, {}, float(value)))
+
+    walk("", data)
+    return families
+
+def _parse_metrics_payload(text: str, content_type: str) -> NodeMetrics:
+    """Parses a /metrics body as JSON or Prometheus text, based on its content type."""
+    if "json" in content_type.lower() or text.lstrip()[:1] in ("{", "["):
+        try:
+            return NodeMetrics(parse_json_metrics(json.loads(text)), time.time(), "json")
+        except ValueError as e:
+            raise PermastoreItError(f"Node returned invalid JSON metrics: {e}") from e
+    return NodeMetrics(parse_prometheus_text(text), time.time(), "prometheus")
+
 # --- Client Class ---
 
+DEFAULT_POOL_MAXSIZE = 32 # Connections kept per host; requests' default of 10 churns under threaded use
+DEFAULT_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024 # 8MB per chunk for resumable uploads
+DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024 # 16MB per Range segment for parallel downloads
+DEFAULT_STATE_DIR = os.path.join(os.path.expanduser("~"), ".permastoreit", "uploads")
+
 class PermastoreItClient:
     """
     A client library for interacting with the PermaStore 1.2.0 API.
 
+    Thread safety: one client may be shared by any number of threads. Each
+    thread gets its own requests.Session (sessions are not thread-safe), and all
+    of them share a single adapter whose urllib3 connection pools are, so
+    keep-alive connections are reused across threads. Set per-client headers
+    through `headers` rather than on `session`, which is per-thread.
+
     Example Usage:
         client = PermastoreItClient(base_url="http://127.0.0.1:5000")
         status = client.get_status()
         upload_result = client.upload("my_local_file.txt")
         client.download(upload_result['hash'], save_dir="downloaded_files")
     """
-    def __init__(self, base_url: str = "http://localhost:5000", timeout: int = 60):
+    def __init__(self, base_url: str = "http://localhost:5000", timeout: int = 60,
+                 cache: Optional[MetadataCache] = None, pool_connections: int = 10,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, pool_block: bool = False,
+                 tcp_nodelay: bool = True, send_buffer_size: Optional[int] = None,
+                 recv_buffer_size: Optional[int] = None, keepalive_idle: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None, hedge_policy: Optional[HedgePolicy] = None,
+                 throttle: Optional[Throttle] = None):
         """
         Initializes the client to connect to a PermastoreIt node.
 
@@ -55,23 +1520,105 @@ class PermastoreItClient:
             base_url: The base URL of the PermastoreIt node API
                       (e.g., "http://127.0.0.1:5000"). Should not end with '/'.
             timeout: Default timeout in seconds for API requests.
+            cache: Optional MetadataCache consulted by get_file_info,
+                   get_file_info_many and get_zk_proof before hitting the node.
+            pool_connections: Number of per-host connection pools to keep.
+            pool_maxsize: Keep-alive connections retained per host. Size it to
+                          the number of threads sharing the client.
+            pool_block: If True, pool_maxsize is a hard per-host limit and extra
+                        requests wait for a free connection instead of opening
+                        throwaway ones.
+            tcp_nodelay: Disable Nagle's algorithm on new connections.
+            send_buffer_size: Optional SO_SNDBUF in bytes (None = OS default).
+            recv_buffer_size: Optional SO_RCVBUF in bytes (None = OS default).
+            keepalive_idle: Optional seconds of idle time before TCP keep-alive
+                            probes start, so dead pooled connections are detected.
+            retry_policy: How failed requests are retried (default RetryPolicy();
+                          use RetryPolicy.disabled() to turn retries off).
+            hedge_policy: Optional HedgePolicy. If set, slow file-info and
+                          search reads are duplicated to cut tail latency.
+            throttle: Optional Throttle limiting request rate and concurrency
+                      per endpoint class.
         """
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError("pool_connections and pool_maxsize must be positive integers.")
         self.base_url = base_url.rstrip('/') # Remove trailing slash if present
         self.timeout = timeout
-        self.session = requests.Session() # Use a session for connection reuse & header persistence
+        self.cache = cache
+        self.headers: Dict[str, str] = {} # Sent with every request, from every thread
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.hedge_policy = hedge_policy
+        self.throttle = throttle
+        self._hooks: Tuple[Callable[[RequestEvent], None], ...] = () # Replaced, never mutated, so threads can iterate it
+        self._latencies: Dict[str, _RollingLatency] = {} # Per hedgeable endpoint, fed by _make_request
+        self._hedge_counters = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+        self._hedge_lock = threading.Lock()
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._capabilities: Optional[List[str]] = None # Lazily fetched by get_capabilities()
+        socket_options = _build_socket_options(tcp_nodelay, send_buffer_size, recv_buffer_size, keepalive_idle)
+        self._adapter = _PooledAdapter(socket_options, pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self._local = threading.local()
         # Example: Set default headers if needed
-        # self.session.headers.update({'Accept': 'application/json'})
+        # self.headers.update({'Accept': 'application/json'})
+
+    @property
+    def session(self) -> requests.Session:
+        """This thread's Session; all threads share one connection pool."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """
+        Reports connection reuse across all threads using this client.
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        Returns:
+            Dict with requests, connections_opened, connections_reused,
+            reuse_ratio, idle_connections and host_pools.
+        """
+        return self._adapter.stats()
+
+    def hedge_stats(self) -> Dict[str, Any]:
+        """Counts of hedgeable reads, hedges sent and hedges that beat the original."""
+        with self._hedge_lock:
+            stats = dict(self._hedge_counters)
+        stats["hedge_ratio"] = stats["hedged"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Closes all pooled connections. The client reconnects if used again."""
+        with self._hedge_lock:
+            pool, self._hedge_pool = self._hedge_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        self._adapter.close()
+
+    def __enter__(self) -> "PermastoreItClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _make_request(self, method: str, endpoint: str, idempotent: Optional[bool] = None,
+                      latency_key: Optional[str] = None, **kwargs) -> requests.Response:
         """
         Internal helper method for making API requests.
 
-        Handles URL construction, default timeout, and basic error checking,
-        raising custom SDK exceptions.
+        Handles URL construction, default timeout, retries (see RetryPolicy)
+        and basic error checking, raising custom SDK exceptions.
 
         Args:
             method: HTTP method (e.g., "GET", "POST").
             endpoint: API endpoint path (e.g., "/status", "/upload").
+            idempotent: Optional override of whether the request is safe to
+                        repeat. Defaults to the retry policy's method list.
+            latency_key: Optional name under which successful response times
+                         (to headers) are tracked for hedging.
             **kwargs: Additional arguments passed to requests.request
                       (e.g., params, data, json, files, stream, headers).
 
@@ -86,42 +1633,173 @@ class PermastoreItClient:
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         kwargs.setdefault('timeout', self.timeout) # Apply default timeout
-
-        try:
-            response = self.session.request(method, url, **kwargs)
+        if self.headers:
+            kwargs['headers'] = {**self.headers, **(kwargs.get('headers') or {})}
+        policy = self.retry_policy
+        retryable = policy.max_attempts > 1 and policy.is_idempotent(method, idempotent)
+        policy.budget.deposit()
+
+        for attempt in range(policy.max_attempts):
+            can_retry = retryable and attempt < policy.max_attempts - 1
+            slot = self.throttle.admit(endpoint) if self.throttle is not None else None
+            event = RequestEvent(method, _endpoint_label(endpoint), url, attempt) if self._hooks else None
+            try:
+                if event is None:
+                    response = self.session.request(method, url, **kwargs)
+                else:
+                    _timing_context.event = event
+                    response = self.session.request(method, url, **dict(kwargs, stream=True))
+                    event.headers_received(response)
+                    if not kwargs.get('stream'):
+                        response.content # Read the body here, as requests would have, to time the transfer
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if slot is not None:
+                    slot.release()
+                if event is not None:
+                    self._emit(event.finish(error=e))
+                if can_retry and policy.budget.try_withdraw():
+                    time.sleep(policy.backoff(attempt))
+                    continue
+                if isinstance(e, requests.exceptions.Timeout):
+                    raise NetworkError(f"Request timed out connecting to {url}: {e}") from e
+                raise NetworkError(f"Connection error connecting to {url}: {e}") from e
+            except requests.exceptions.RequestException as e: # Catch other request errors
+                if slot is not None:
+                    slot.release()
+                if event is not None:
+                    self._emit(event.finish(error=e))
+                raise NetworkError(f"Network request error for {url}: {e}") from e
+            finally:
+                if event is not None:
+                    _timing_context.event = None
+
+            if event is not None:
+                if kwargs.get('stream') and response.ok:
+                    # Transfer time and size are known once the caller closes the stream
+                    response.close = _close_then(response.close, lambda r=response, e=event: self._emit(e.finish(r)))
+                else:
+                    self._emit(event.finish(response))
+
+            if slot is not None:
+                slot.responded(response.status_code)
+                if kwargs.get('stream') and response.ok:
+                    # The connection stays busy until the caller closes the streamed body
+                    response.close = _close_then(response.close, slot.release)
+                else:
+                    slot.release()
 
             # Check for non-successful status codes (client/server errors)
             if not response.ok:
-                 detail = None
-                 raw_text = response.text # Store raw text for debugging
-                 try:
-                     data = response.json()
-                     detail = data.get("detail")
-                 except requests.exceptions.JSONDecodeError:
-                     detail = raw_text[:200] if raw_text else f"No detail provided (Status: {response.status_code})"
-
-                 # Raise specific errors based on status code and context
-                 if response.status_code == 404:
-                      path_parts = endpoint.lstrip('/').split('/')
-                      if len(path_parts) == 2 and path_parts[0] in ["download", "file-info", "zk-proof"]:
-                          resource_id = path_parts[1]
-                          raise FileNotFoundErrorOnServer(resource_id)
-                      else:
-                           raise APIError(response.status_code, detail or "Resource not found", raw_text)
-                 elif response.status_code == 501 and "zkp" in endpoint.lower():
-                      raise ZKPDisabledError()
-                 else:
-                      # General API error for other 4xx/5xx codes
-                     raise APIError(response.status_code, detail, raw_text)
-
+                if can_retry and response.status_code in policy.retry_statuses:
+                    delay = policy.backoff(attempt)
+                    retry_after = policy.retry_after(response)
+                    if retry_after is not None:
+                        delay = max(delay, retry_after)
+                    if delay <= policy.max_retry_after and policy.budget.try_withdraw():
+                        response.close() # Return the connection to the pool
+                        time.sleep(delay)
+                        continue
+                detail = None
+                raw_text = response.text # Store raw text for debugging
+                try:
+                    data = response.json()
+                    detail = data.get("detail")
+                except requests.exceptions.JSONDecodeError:
+                    detail = raw_text[:200] if raw_text else f"No detail provided (Status: {response.status_code})"
+                _raise_for_api_error(endpoint, response.status_code, detail, raw_text)
+
+            if latency_key is not None:
+                self._latency_for(latency_key).record(response.elapsed.total_seconds() * 1000)
             return response # Return successful response object
 
-        except requests.exceptions.Timeout as e:
-             raise NetworkError(f"Request timed out connecting to {url}: {e}") from e
-        except requests.exceptions.ConnectionError as e:
-            raise NetworkError(f"Connection error connecting to {url}: {e}") from e
-        except requests.exceptions.RequestException as e: # Catch other request errors
-            raise NetworkError(f"Network request error for {url}: {e}") from e
+    def add_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        """
+        Registers a callable that receives a RequestEvent after every HTTP attempt.
+
+        Hooks run on the requesting thread and should be quick; exceptions they
+        raise are reported on stderr and otherwise ignored. Timing is only
+        collected while at least one hook is registered.
+        """
+        self._hooks = self._hooks + (hook,)
+
+    def remove_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    def _emit(self, event: RequestEvent) -> None:
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                print(f"Warning: request hook {hook!r} failed: {e}", file=sys.stderr)
+
+    def _latency_for(self, key: str) -> _RollingLatency:
+        latency = self._latencies.get(key)
+        if latency is None:
+            window = self.hedge_policy.window if self.hedge_policy else 60.0
+            latency = self._latencies.setdefault(key, _RollingLatency(window))
+        return latency
+
+    def _get_hedge_pool(self) -> ThreadPoolExecutor:
+        with self._hedge_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=self._adapter._pool_maxsize,
+                                                      thread_name_prefix="permastoreit-hedge")
+            return self._hedge_pool
+
+    def _hedged_request(self, method: str, endpoint: str, latency_key: str, **kwargs) -> requests.Response:
+        """
+        _make_request for idempotent reads, hedged per hedge_policy.
+
+        The original and the hedge run on separate pooled connections and the
+        first successful response is returned. The loser is cancelled if it
+        hasn't started; otherwise its connection is closed as soon as it gets
+        headers, without reading the body. Falls through to a plain request
+        when no policy is set or too little latency history exists.
+        """
+        policy = self.hedge_policy
+        if policy is None:
+            return self._make_request(method, endpoint, latency_key=latency_key, **kwargs)
+        delay = policy.delay(self._latency_for(latency_key))
+        policy.budget.deposit()
+        with self._hedge_lock:
+            self._hedge_counters["requests"] += 1
+        if delay is None:
+            return self._make_request(method, endpoint, latency_key=latency_key, **kwargs)
+
+        kwargs["stream"] = True # Lets a losing response be dropped before its body is read
+        pool = self._get_hedge_pool()
+        original = pool.submit(self._make_request, method, endpoint, latency_key=latency_key, **kwargs)
+        pending = {original}
+        done, _ = wait(pending, timeout=delay)
+        if not done and policy.budget.try_withdraw():
+            pending.add(pool.submit(self._make_request, method, endpoint, latency_key=latency_key, **kwargs))
+            with self._hedge_lock:
+                self._hedge_counters["hedged"] += 1
+
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    for loser in pending:
+                        loser.cancel()
+                        loser.add_done_callback(_discard_response)
+                    if future is not original:
+                        with self._hedge_lock:
+                            self._hedge_counters["hedge_wins"] += 1
+                    response = future.result()
+                    try:
+                        response.content # Buffer the (small) body so close() returns the connection
+                    except requests.exceptions.RequestException as e:
+                        raise NetworkError(f"Response from {self.base_url}{endpoint} interrupted: {e}") from e
+                    finally:
+                        response.close()
+                    return response
+                if isinstance(error, APIError) and error.status_code < 500:
+                    raise error # Deterministic (e.g. 404); the other copy would say the same
+                first_error = first_error or error
+        raise first_error
 
     # --- Public SDK Methods ---
 
@@ -144,12 +1822,37 @@ class PermastoreItClient:
         # For simplicity now, assume 200 is healthy.
         return response.json()
 
-    def upload(self, file_path: str) -> Dict[str, Any]:
+    def get_metrics(self) -> NodeMetrics:
+        """
+        Fetches and parses the node's /metrics endpoint.
+
+        Prometheus text exposition and JSON are both accepted; the format is
+        picked from the response Content-Type (or the body, if that is vague).
+
+        Returns:
+            A NodeMetrics with typed families and samples.
+
+        Raises:
+            APIError: If the node has no /metrics endpoint (404) or fails.
+            NetworkError: If there's a connection issue.
+        """
+        response = self._make_request("GET", "/metrics", headers={
+            "Accept": "text/plain;version=0.0.4;q=1.0, application/json;q=0.9"})
+        return _parse_metrics_payload(response.text, response.headers.get("Content-Type", ""))
+
+    def upload(self, file_path: str, skip_existing: bool = False,
+               progress: Optional[Callable[[TransferProgress], None]] = None) -> Dict[str, Any]:
         """
         Uploads a file from the given local path to the node.
 
         Args:
             file_path: The local path to the file to upload.
+            skip_existing: Optional. If True, hash the file locally first and skip
+                           the transfer when the node already stores that content.
+                           The result then has the same shape as the server's
+                           "deduplicated" response.
+            progress: Optional. Called with a TransferProgress (bytes sent, rate,
+                      ETA) at most every 0.1s while the body is sent, and once at the end.
 
         Returns:
             A dictionary containing the upload result (status, hash, size, etc.).
@@ -174,23 +1877,213 @@ class PermastoreItClient:
               print(f"Warning: Could not guess MIME type for {file_name}. Sending as {content_type}", file=sys.stderr) # Use stderr for warnings
          # --- End Modification ---
 
+        tracker = _tracker(progress, os.path.getsize(file_path), file_name)
+        file_hash = None
+        if skip_existing:
+            try:
+                file_hash = compute_file_hash(file_path)
+            except IOError as e:
+                raise PermastoreItError(f"Failed to read local file {file_path}: {e}") from e
+            existing = self._find_existing(file_hash)
+            if existing is not None:
+                if tracker is not None:
+                    tracker.finish() # Nothing to send
+                return {
+                    "status": "deduplicated",
+                    "message": "Content already stored on node; upload skipped.",
+                    "hash": file_hash,
+                    "size": existing.get("size", os.path.getsize(file_path)),
+                    "filename": existing.get("filename", file_name),
+                    "zkp_available": existing.get("zkp_available", False),
+                }
+
         try:
             with open(file_path, 'rb') as f:
-                  # --- Modified files dictionary ---
-                  # Pass tuple: (filename, file_object, content_type)
-                files = {'file': (file_name, f, content_type)}
-                  # --- End Modification ---
-                # Consider a longer timeout for uploads
-                upload_timeout = max(self.timeout * 2, 120) # e.g., double default or 2 mins
-                response = self._make_request("POST", "/upload", files=files, timeout=upload_timeout)
-                # Note: Server returns 201 for new, 200 for dedupe. _make_request checks .ok (2xx)
-                return response.json()
+                # Storage is content-addressed, so a repeated POST of known content only dedupes
+                result = self._post_upload(_MultipartBody('file', file_name, content_type, f, progress=tracker),
+                                           idempotent=file_hash is not None)
         except IOError as e:
              raise PermastoreItError(f"Failed to read local file {file_path}: {e}") from e
+        if tracker is not None:
+            tracker.finish()
+        return result
         # APIError and NetworkError are handled by _make_request
 
+    def upload_data(self, data: Union[bytes, bytearray, memoryview, BinaryIO], filename: str,
+                    content_type: Optional[str] = None,
+                    progress: Optional[Callable[[TransferProgress], None]] = None) -> Dict[str, Any]:
+        """
+        Uploads an in-memory payload or an open binary file object.
+
+        Args:
+            data: bytes, bytearray, memoryview, or a seekable binary file-like
+                  object (uploaded from its current position to the end).
+            filename: The filename to record on the node.
+            content_type: Optional MIME type. Guessed from filename if omitted.
+            progress: Optional. Called with a TransferProgress (bytes sent, rate,
+                      ETA) at most every 0.1s while the body is sent, and once at the end.
+
+        Returns:
+            A dictionary containing the upload result (status, hash, size, etc.).
+
+        Raises:
+            PermastoreItError: If reading the file object fails.
+            APIError: If the server returns an error (e.g., invalid type, too large).
+            NetworkError: If there's a connection issue.
+        """
+        content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        # In-memory payloads are cheap to hash, which makes the POST safe to retry
+        idempotent = isinstance(data, (bytes, bytearray, memoryview))
+        tracker = _tracker(progress, None, filename)
+        try:
+            body = _MultipartBody('file', filename, content_type, data, progress=tracker)
+            if tracker is not None:
+                tracker.total = body.payload_size
+            result = self._post_upload(body, idempotent=idempotent)
+        except IOError as e:
+            raise PermastoreItError(f"Failed to read upload payload for {filename}: {e}") from e
+        if tracker is not None:
+            tracker.finish()
+        return result
+
+    def _post_upload(self, body: _MultipartBody, idempotent: bool = False) -> Dict[str, Any]:
+        """POSTs a prepared multipart body to /upload. Retried only if idempotent."""
+        # Consider a longer timeout for uploads
+        upload_timeout = max(self.timeout * 2, 120) # e.g., double default or 2 mins
+        response = self._make_request("POST", "/upload", idempotent=idempotent, data=body,
+                                      headers={"Content-Type": body.content_type}, timeout=upload_timeout)
+        # Note: Server returns 201 for new, 200 for dedupe. _make_request checks .ok (2xx)
+        return response.json()
+
+    def upload_resumable(self, file_path: str, chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+                         state_dir: Optional[str] = None,
+                         progress: Optional[Callable[[TransferProgress], None]] = None) -> Dict[str, Any]:
+        """
+        Uploads a large file with the chunked upload protocol, resuming if interrupted.
+
+        The protocol is: POST /uploads/init, PUT /uploads/{id}/chunks/{n} for each
+        chunk, then POST /uploads/{id}/commit. Progress is checkpointed to a small
+        JSON state file after every chunk; calling this again for the same
+        (unchanged) file asks the node which chunks it already holds and sends
+        only the missing ones.
+
+        Args:
+            file_path: The local path to the file to upload.
+            chunk_size: Chunk size in bytes for new uploads (default 8MB).
+                        A resumed upload keeps the chunk size it started with.
+            state_dir: Directory for checkpoint files (default ~/.permastoreit/uploads).
+                       Chunks are retried per the client's retry_policy; if one
+                       still fails, the checkpoint is kept for a later resume.
+            progress: Optional. Called with a TransferProgress as chunks are sent
+                      (throttled to every 0.1s). A resumed upload starts from the
+                      bytes the node already holds.
+
+        Returns:
+            A dictionary containing the upload result, same shape as upload().
+
+        Raises:
+            FileNotFoundError: If the local file_path does not exist.
+            PermastoreItError: If reading the file or writing the checkpoint fails.
+            APIError: If the server rejects a chunk or the commit.
+            NetworkError: If a chunk still fails after the policy's retries.
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"Local file not found or is not a regular file: {file_path}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        file_stat = os.stat(file_path)
+        abs_path = os.path.abspath(file_path)
+        state_dir = state_dir or DEFAULT_STATE_DIR
+        state_key = hashlib.sha256(f"{self.base_url}|{abs_path}".encode()).hexdigest()[:32]
+        state_path = os.path.join(state_dir, f"{state_key}.json")
+
+        try:
+            os.makedirs(state_dir, exist_ok=True)
+            state = _load_state(state_path)
+            # A checkpoint only applies if the file hasn't changed since it was written
+            if state and (state.get("size") != file_stat.st_size or state.get("mtime_ns") != file_stat.st_mtime_ns):
+                state = None
+
+            received = set()
+            if state:
+                try:
+                    session = self._make_request("GET", f"/uploads/{state['upload_id']}").json()
+                    received = set(session.get("received_chunks", []))
+                except APIError as e:
+                    if e.status_code != 404:
+                        raise
+                    state = None # Session expired on the node; start over
+
+            if not state:
+                content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+                init_request = {
+                    "filename": os.path.basename(file_path),
+                    "content_type": content_type,
+                    "size": file_stat.st_size,
+                    "chunk_size": chunk_size,
+                    "sha256": compute_file_hash(file_path),
+                }
+                session = self._make_request("POST", "/uploads/init", idempotent=True, json=init_request).json()
+                state = dict(init_request, upload_id=session["upload_id"],
+                             chunk_size=session.get("chunk_size", chunk_size),
+                             size=file_stat.st_size, mtime_ns=file_stat.st_mtime_ns)
+                received = set(session.get("received_chunks", []))
+                _save_state(state_path, state)
+
+            upload_id = state["upload_id"]
+            chunk_size = state["chunk_size"]
+            total_chunks = max(1, -(-state["size"] // chunk_size))
+            tracker = _tracker(progress, state["size"], os.path.basename(file_path))
+            if tracker is not None:
+                tracker.reset(sum(min(chunk_size, state["size"] - index * chunk_size)
+                                  for index in received if index < total_chunks))
+
+            with open(file_path, 'rb') as f:
+                for index in range(total_chunks):
+                    if index in received:
+                        continue
+                    f.seek(index * chunk_size)
+                    data = f.read(chunk_size)
+                    headers = {"Content-Type": "application/octet-stream",
+                               "X-Chunk-SHA256": hashlib.sha256(data).hexdigest()}
+                    self._make_request("PUT", f"/uploads/{upload_id}/chunks/{index}", data=data, headers=headers)
+                    received.add(index)
+                    state["completed_chunks"] = sorted(received)
+                    _save_state(state_path, state)
+                    if tracker is not None:
+                        tracker.update(len(data))
+
+            upload_timeout = max(self.timeout * 2, 120) # Node assembles and hashes on commit
+            try:
+                result = self._make_request("POST", f"/uploads/{upload_id}/commit", idempotent=True,
+                                            timeout=upload_timeout).json()
+            except APIError as e:
+                # A retried commit finds the session gone if the first attempt landed
+                existing = self._find_existing(state["sha256"]) if e.status_code == 404 else None
+                if existing is None:
+                    raise
+                result = dict(existing, status="deduplicated", hash=state["sha256"],
+                              message="Upload already committed on node.")
+        except (IOError, OSError) as e:
+            raise PermastoreItError(f"Resumable upload of {file_path} failed locally: {e}") from e
+
+        try: os.remove(state_path) # Upload is complete; the checkpoint is no longer needed
+        except OSError: pass
+        if tracker is not None:
+            tracker.finish()
+        return result
+
+    def _find_existing(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Returns the node's metadata for file_hash, or None if it isn't stored."""
+        try:
+            return self.get_file_info(file_hash)
+        except FileNotFoundErrorOnServer:
+            return None
 
-    def download(self, file_hash: str, save_dir: str, save_filename: Optional[str] = None) -> str:
+    def download(self, file_hash: str, save_dir: str, save_filename: Optional[str] = None,
+                 connections: int = 1, segment_size: int = DEFAULT_SEGMENT_SIZE, verify: bool = True,
+                 progress: Optional[Callable[[TransferProgress], None]] = None) -> str:
         """
         Downloads a file by its hash and saves it to a specified directory.
 
@@ -200,6 +2093,16 @@ class PermastoreItClient:
                       It will be created if it doesn't exist.
             save_filename: Optional. The name to save the file as.
                            If None, uses the file hash as the filename.
+            connections: Optional. If > 1, split the file into HTTP Range segments
+                         and fetch them over this many pooled connections at once.
+                         Falls back to a single stream if the node ignores Range.
+            segment_size: Segment size in bytes for parallel downloads (default 16MB).
+            verify: Optional. Check the content against file_hash while it streams in
+                    (default True). Data goes to a temp file that is only renamed into
+                    place once verified. Skipped if file_hash isn't a SHA-256 hex digest.
+            progress: Optional. Called with a TransferProgress (bytes received, rate,
+                      ETA) at most every 0.1s, and once when the file is in place.
+                      With connections > 1 it is called from the segment threads.
 
         Returns:
             The full path to the successfully downloaded file.
@@ -208,10 +2111,14 @@ class PermastoreItClient:
             FileNotFoundErrorOnServer: If the file hash is not found on the server (404).
             APIError: For other server errors during download request.
             NetworkError: If there's a connection issue.
+            IntegrityError: If verify is on and the content doesn't match file_hash.
+                            No file is left at the target path.
             PermastoreItError: If creating the directory or writing the file fails.
         """
         if not save_filename:
             save_filename = file_hash # Default to using hash
+        if connections < 1 or segment_size < 1:
+            raise ValueError("connections and segment_size must be positive integers.")
 
         # Ensure save directory exists
         try:
@@ -220,29 +2127,201 @@ class PermastoreItClient:
              raise PermastoreItError(f"Failed to create save directory '{save_dir}': {e}") from e
 
         full_save_path = os.path.join(save_dir, save_filename)
+        expected_hash = file_hash.lower() if verify and _is_sha256_hex(file_hash) else None
+        tracker = _tracker(progress, None, save_filename)
 
-        try:
+        if connections > 1:
+            path = self._download_ranged(file_hash, full_save_path, connections, segment_size, expected_hash, tracker)
+        else:
             # Use stream=True for potentially large files
             response = self._make_request("GET", f"/download/{file_hash}", stream=True)
+            path = self._save_stream(response, full_save_path, expected_hash, tracker)
+        if tracker is not None:
+            tracker.finish()
+        return path
+
+    def _save_stream(self, response: requests.Response, full_save_path: str,
+                     expected_hash: Optional[str] = None, tracker: Optional[TransferProgress] = None) -> str:
+        """
+        Writes a streamed download response to disk via a temp file.
 
+        If expected_hash is given, chunks are hashed as they arrive so the payload
+        is read only once; the temp file is renamed into place only if it matches.
+        """
+        tmp_path = f"{full_save_path}.part"
+        digest = hashlib.sha256() if expected_hash else None
+        if tracker is not None:
+            length = response.headers.get("Content-Length")
+            tracker.total = int(length) if length and length.isdigit() else None
+            tracker.reset()
+        try:
             # Write the content chunk by chunk
-            with open(full_save_path, 'wb') as f:
+            with open(tmp_path, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=1024 * 1024): # 1MB chunks
+                    if digest is not None:
+                        digest.update(chunk)
                     f.write(chunk)
+                    if tracker is not None:
+                        tracker.update(len(chunk))
 
+            if digest is not None and digest.hexdigest() != expected_hash:
+                raise IntegrityError(expected_hash, digest.hexdigest(), full_save_path)
+            os.replace(tmp_path, full_save_path)
             return full_save_path
-        # Let APIError (including FileNotFoundErrorOnServer), NetworkError propagate from _make_request
+        except IntegrityError:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            raise
         except IOError as e: # Catch errors writing the file
              # Clean up potentially partially written file
-             try: os.remove(full_save_path)
+             try: os.remove(tmp_path)
              except OSError: pass
              raise PermastoreItError(f"Failed to write downloaded file to '{full_save_path}': {e}") from e
         except Exception as e: # Catch other unexpected errors during download/save
              # Clean up potentially partially written file
-             try: os.remove(full_save_path)
+             try: os.remove(tmp_path)
              except OSError: pass
+             if isinstance(e, requests.exceptions.RequestException):
+                 raise NetworkError(f"Download stream interrupted: {e}") from e
              raise PermastoreItError(f"Unexpected error during download/save: {e}") from e
+        finally:
+            response.close()
+
+    def _download_ranged(self, file_hash: str, full_save_path: str, connections: int, segment_size: int,
+                         expected_hash: Optional[str] = None, tracker: Optional[TransferProgress] = None) -> str:
+        """
+        Downloads a file as parallel HTTP Range segments with positional writes.
+
+        Segments are written into a preallocated '<path>.part' file; completed
+        segments are checkpointed to '<path>.part.json' so an interrupted download
+        resumes from the segments already verified (by length) on disk. Since
+        segments land out of order, expected_hash is checked with one pass over
+        the assembled file before it is renamed into place.
+        """
+        endpoint = f"/download/{file_hash}"
+        try:
+            probe = self._make_request("GET", endpoint, headers={"Range": "bytes=0-0"}, stream=True)
+        except APIError as e:
+            if e.status_code != 416: # 416: empty file, nothing to split
+                raise
+            return self._save_stream(self._make_request("GET", endpoint, stream=True), full_save_path,
+                                     expected_hash, tracker)
+
+        content_range = probe.headers.get("Content-Range", "")
+        if probe.status_code != 206 or "/" not in content_range or content_range.endswith("/*"):
+            # Node ignored the Range header and is sending the whole body; just stream it
+            return self._save_stream(probe, full_save_path, expected_hash, tracker)
+        probe.close()
+        total_size = int(content_range.rsplit("/", 1)[1])
+
+        part_path = f"{full_save_path}.part"
+        state_path = f"{full_save_path}.part.json"
+        state = _load_state(state_path)
+        if not (state and state.get("file_hash") == file_hash and state.get("size") == total_size
+                and state.get("segment_size") == segment_size and os.path.exists(part_path)):
+            state = {"file_hash": file_hash, "size": total_size, "segment_size": segment_size, "completed_segments": []}
+
+        segments = [(index, start, min(start + segment_size, total_size) - 1)
+                    for index, start in enumerate(range(0, total_size, segment_size))]
+        completed = set(state["completed_segments"])
+        state_lock = threading.Lock()
+        if tracker is not None:
+            tracker.total = total_size
+            tracker.reset(sum(end - start + 1 for index, start, end in segments if index in completed))
+
+        try:
+            fd = os.open(part_path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0))
+        except OSError as e:
+            raise PermastoreItError(f"Failed to open '{part_path}' for writing: {e}") from e
+        try:
+            if not completed:
+                _preallocate(fd, total_size)
+            _save_state(state_path, state)
+
+            def fetch_segment(index: int, start: int, end: int):
+                response = self._make_request("GET", endpoint, headers={"Range": f"bytes={start}-{end}"}, stream=True)
+                try:
+                    if response.status_code != 206:
+                        raise PermastoreItError(f"Node returned status {response.status_code} for range {start}-{end}.")
+                    offset = start
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        _pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                        if tracker is not None:
+                            tracker.update(len(chunk))
+                except requests.exceptions.RequestException as e:
+                    raise NetworkError(f"Segment {index} download interrupted: {e}") from e
+                finally:
+                    response.close()
+                if offset != end + 1:
+                    raise NetworkError(f"Segment {index} ended early at byte {offset} (expected {end + 1}).")
+                with state_lock:
+                    completed.add(index)
+                    state["completed_segments"] = sorted(completed)
+                    _save_state(state_path, state)
+
+            pending = [seg for seg in segments if seg[0] not in completed]
+            with ThreadPoolExecutor(max_workers=min(connections, max(1, len(pending)))) as executor:
+                futures = [executor.submit(fetch_segment, *seg) for seg in pending]
+                try:
+                    for future in as_completed(futures):
+                        future.result() # Propagate the first failure; the checkpoint keeps finished segments
+                except BaseException:
+                    for future in futures:
+                        future.cancel() # Don't start segments we're about to abandon
+                    raise
+        except OSError as e:
+            raise PermastoreItError(f"Failed to write downloaded file to '{part_path}': {e}") from e
+        finally:
+            os.close(fd)
+
+        if expected_hash:
+            actual_hash = compute_file_hash(part_path)
+            if actual_hash != expected_hash:
+                for path in (part_path, state_path): # Corrupt: don't resume from it either
+                    try: os.remove(path)
+                    except OSError: pass
+                raise IntegrityError(expected_hash, actual_hash, full_save_path)
+        os.replace(part_path, full_save_path)
+        try: os.remove(state_path)
+        except OSError: pass
+        return full_save_path
+
+
+    def read_range(self, file_hash: str, offset: int, length: int) -> bytes:
+        """
+        Reads `length` bytes of a stored file starting at `offset`, with an HTTP Range request.
 
+        Returns fewer bytes if the file ends first. If the node ignores Range,
+        the full body is streamed and only the requested slice is kept.
+
+        Raises:
+            FileNotFoundErrorOnServer: If the file hash is not found on the server (404).
+            APIError: If the range starts past the end of the file (416) or for other errors.
+            NetworkError: If there's a connection issue.
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must be non-negative.")
+        if length == 0:
+            return b""
+        response = self._make_request("GET", f"/download/{file_hash}", stream=True,
+                                      headers={"Range": f"bytes={offset}-{offset + length - 1}"})
+        try:
+            if response.status_code == 206:
+                return response.content
+            # Full body: skip to the slice without holding more than one chunk
+            buffer, position = bytearray(), 0
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                if position + len(chunk) > offset:
+                    buffer += chunk[max(0, offset - position):offset + length - position]
+                position += len(chunk)
+                if len(buffer) >= length:
+                    break
+            return bytes(buffer)
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(f"Range read of {file_hash} interrupted: {e}") from e
+        finally:
+            response.close()
 
     def list_files(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
          """
@@ -267,6 +2346,75 @@ class PermastoreItClient:
          return response.json()
 
 
+    def iter_files(self, page_size: int = 500, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields stored file metadata page by page, without loading the full listing.
+
+        Each page is requested from /files with limit/offset and parsed
+        incrementally as it streams in. If the node answers with an envelope
+        object containing "files" and "next_cursor", the cursor is followed
+        instead of the offset.
+
+        Args:
+            page_size: Records requested per page (default 500).
+            limit: Optional maximum total number of records to yield.
+
+        Yields:
+            File metadata dictionaries, most recent first.
+
+        Raises:
+            APIError: For server errors during listing.
+            NetworkError: If there's a connection issue.
+        """
+        if not isinstance(page_size, int) or page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValueError("Limit must be a positive integer.")
+
+        yielded = 0
+        offset = 0
+        cursor = None
+        previous_first = None
+        while True:
+            request_size = page_size if limit is None else min(page_size, limit - yielded)
+            params = {'limit': request_size}
+            if cursor is not None:
+                params['cursor'] = cursor
+            else:
+                params['offset'] = offset
+            response = self._make_request("GET", "/files", params=params, stream=True)
+            page_count = 0
+            next_cursor = None
+            try:
+                for value in _iter_json_array(response):
+                    if isinstance(value, dict) and "files" in value: # Envelope page
+                        records = value.get("files") or []
+                        next_cursor = value.get("next_cursor")
+                    else:
+                        records = [value]
+                    for record in records:
+                        if page_count == 0:
+                            first_key = record.get("hash") if isinstance(record, dict) else record
+                            if first_key is not None and first_key == previous_first:
+                                return # Node ignored offset and repeated the first page
+                            previous_first = first_key
+                        page_count += 1
+                        yielded += 1
+                        yield record
+                        if limit is not None and yielded >= limit:
+                            return
+            except requests.exceptions.RequestException as e:
+                raise NetworkError(f"File listing stream interrupted: {e}") from e
+            finally:
+                response.close()
+
+            if next_cursor is not None:
+                cursor = next_cursor
+            elif page_count != request_size:
+                return # Short page: end of listing (or node ignored limit and sent it all)
+            else:
+                offset += page_count
+
     def get_file_info(self, file_hash: str) -> Dict[str, Any]:
         """
         Gets metadata for a specific file hash from the blockchain record.
@@ -282,9 +2430,95 @@ class PermastoreItClient:
             APIError: For other server errors.
             NetworkError: If there's a connection issue.
         """
+        if self.cache is not None:
+            cached = self.cache.get("file-info", file_hash)
+            if cached is not None:
+                return dict(cached)
+        return self._fetch_file_info(file_hash)
+
+    def _fetch_file_info(self, file_hash: str) -> Dict[str, Any]:
+        """Fetches file-info from the node (bypassing the cache lookup) and caches it."""
         # FileNotFoundErrorOnServer raised by _make_request if 404 occurs
-        response = self._make_request("GET", f"/file-info/{file_hash}")
-        return response.json()
+        response = self._hedged_request("GET", f"/file-info/{file_hash}", latency_key="file-info")
+        result = response.json()
+        if self.cache is not None:
+            self.cache.put("file-info", file_hash, result)
+        return result
+
+    def get_capabilities(self, refresh: bool = False) -> List[str]:
+        """
+        Returns the optional API features the node advertises in /status.
+
+        Nodes list them under "capabilities" (e.g. "file-info-batch"); older
+        nodes advertise nothing, which yields an empty list. Cached per client.
+
+        Args:
+            refresh: Re-query the node instead of using the cached value.
+        """
+        if refresh or self._capabilities is None:
+            status = self.get_status()
+            self._capabilities = list(status.get("capabilities") or [])
+        return self._capabilities
+
+    def get_file_info_many(self, hashes: List[str], max_workers: int = 8,
+                           batch_size: int = 500) -> List[Dict[str, Any]]:
+        """
+        Gets metadata for many file hashes at once.
+
+        Uses the node's POST /file-info/batch endpoint when it advertises the
+        "file-info-batch" capability; otherwise fans get_file_info() out over a
+        bounded thread pool. Duplicate hashes are only fetched once.
+
+        Args:
+            hashes: The SHA-256 hashes to look up.
+            max_workers: Maximum concurrent requests for the fallback fan-out.
+            batch_size: Maximum hashes per batch request.
+
+        Returns:
+            One dictionary per input hash, in input order: either
+            {"hash": h, "success": True, "result": <metadata>} or
+            {"hash": h, "success": False, "error": <PermastoreItError>}, where a
+            missing file is reported as FileNotFoundErrorOnServer.
+        """
+        if max_workers < 1 or batch_size < 1:
+            raise ValueError("max_workers and batch_size must be positive integers.")
+        unique_hashes = list(dict.fromkeys(hashes))
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        if self.cache is not None:
+            for h in unique_hashes:
+                cached = self.cache.get("file-info", h)
+                if cached is not None:
+                    outcomes[h] = {"hash": h, "success": True, "result": dict(cached)}
+            unique_hashes = [h for h in unique_hashes if h not in outcomes]
+
+        if unique_hashes and "file-info-batch" in self.get_capabilities():
+            for start in range(0, len(unique_hashes), batch_size):
+                batch = unique_hashes[start:start + batch_size]
+                try:
+                    found = self._make_request("POST", "/file-info/batch", idempotent=True,
+                                               json={"hashes": batch}).json().get("results", {})
+                except PermastoreItError as e: # Whole batch failed; report it against each hash
+                    outcomes.update({h: {"hash": h, "success": False, "error": e} for h in batch})
+                    continue
+                for h in batch:
+                    if found.get(h) is not None:
+                        outcomes[h] = {"hash": h, "success": True, "result": found[h]}
+                        if self.cache is not None:
+                            self.cache.put("file-info", h, found[h])
+                    else:
+                        outcomes[h] = {"hash": h, "success": False, "error": FileNotFoundErrorOnServer(h)}
+        else:
+            def fetch(file_hash: str) -> Dict[str, Any]:
+                try:
+                    return {"hash": file_hash, "success": True, "result": self._fetch_file_info(file_hash)}
+                except PermastoreItError as e:
+                    return {"hash": file_hash, "success": False, "error": e}
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for outcome in executor.map(fetch, unique_hashes):
+                    outcomes[outcome["hash"]] = outcome
+
+        return [dict(outcomes[h]) for h in hashes]
 
     def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -304,7 +2538,7 @@ class PermastoreItClient:
         if not isinstance(limit, int) or limit < 1:
             raise ValueError("Limit must be a positive integer.")
         params = {'query': query, 'limit': limit}
-        response = self._make_request("GET", "/search", params=params)
+        response = self._hedged_request("GET", "/search", latency_key="search", params=params)
         return response.json()
 
     def get_zk_proof(self, file_hash: str) -> Dict[str, Any]:
@@ -323,9 +2557,16 @@ class PermastoreItClient:
             APIError: For other server errors.
             NetworkError: If there's a connection issue.
         """
+        if self.cache is not None:
+            cached = self.cache.get("zk-proof", file_hash)
+            if cached is not None:
+                return dict(cached)
         # Specific errors (404, 501) handled by _make_request
         response = self._make_request("GET", f"/zk-proof/{file_hash}")
-        return response.json()
+        result = response.json()
+        if self.cache is not None:
+            self.cache.put("zk-proof", file_hash, result)
+        return result
 
 # --- Example Usage (if script is run directly) ---
 if __name__ == '__main__':
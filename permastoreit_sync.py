@@ -0,0 +1,387 @@
+# --- PermastoreIt Directory Sync ---
+#
+# Keeps a SQLite manifest of the files uploaded from a directory tree, keyed
+# by (path, size, mtime, inode), so a re-run only hashes and uploads files
+# that are new or changed.
+#
+#     with SyncManifest("photos/.permastoreit-sync.sqlite3") as manifest:
+#         report = DirectorySync(client, "photos", manifest).run()
+
+import fnmatch
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Any, Callable, Iterator, Iterable, Sequence, Set, Tuple
+
+from permastoreit_sdk import PermastoreItClient
+
+DEFAULT_MANIFEST_NAME = ".permastoreit-sync.sqlite3"
+
+# --- Tree Walking ---
+
+SYMLINK_POLICIES = ("skip", "files", "follow") # Ignore links / follow links to files / follow all links
+
+def scan_tree(root: str, workers: int = 8,
+              on_error: Optional[Callable[[str, OSError], None]] = None,
+              symlinks: str = "skip", prune: Optional[Callable[[str], bool]] = None
+              ) -> Iterator[Tuple[str, List[Tuple[str, os.stat_result]]]]:
+    """
+    Walks a directory tree with os.scandir, scanning directories in parallel.
+
+    Yields (directory, [(name, stat), ...]) for every directory as soon as it
+    has been listed, in no particular order. Only regular files are reported.
+    stat() calls release the GIL, so on network filesystems and cold caches
+    the workers overlap their I/O.
+
+    Args:
+        root: Directory to walk.
+        workers: Directories listed at once.
+        on_error: Called with (directory, error) for directories that can't be
+                  read; they are yielded with no files. By default they are
+                  skipped silently.
+        symlinks: "skip" ignores symlinks, "files" follows links to files but
+                  not to directories, "follow" follows both (each directory is
+                  visited once, so link cycles terminate).
+        prune: Called with each subdirectory path; returning True skips it.
+    """
+    if symlinks not in SYMLINK_POLICIES:
+        raise ValueError(f"symlinks must be one of {SYMLINK_POLICIES}, not {symlinks!r}.")
+    follow_dirs, follow_files = symlinks == "follow", symlinks != "skip"
+    seen_dirs: Set[Tuple[int, int]] = set()
+    seen_lock = threading.Lock()
+
+    def first_visit(path: str) -> bool:
+        st = os.stat(path)
+        with seen_lock:
+            if (st.st_dev, st.st_ino) in seen_dirs:
+                return False
+            seen_dirs.add((st.st_dev, st.st_ino))
+            return True
+
+    def scan(directory: str) -> Tuple[str, List[Tuple[str, os.stat_result]], List[str], Optional[OSError]]:
+        files, subdirs = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=follow_dirs):
+                            if prune is not None and prune(entry.path):
+                                continue
+                            if follow_dirs and not first_visit(entry.path):
+                                continue
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=follow_files):
+                            files.append((entry.name, entry.stat(follow_symlinks=follow_files)))
+                    except OSError: # Vanished, unreadable or dangling entry
+                        continue
+        except OSError as e:
+            return directory, [], [], e
+        return directory, files, subdirs, None
+
+    if follow_dirs:
+        first_visit(root)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="permastoreit-scan")
+    try:
+        pending = {pool.submit(scan, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                directory, files, subdirs, error = future.result()
+                if error is not None and on_error is not None:
+                    on_error(directory, error)
+                for subdir in subdirs:
+                    pending.add(pool.submit(scan, subdir))
+                yield directory, files
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _matches(rel_path: str, patterns: Sequence[str]) -> bool:
+    """fnmatch globs; patterns without '/' match the name, others the '/'-separated relative path."""
+    name = rel_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(rel_path if "/" in pattern else name, pattern) for pattern in patterns)
+
+def discover_files(root: str, include: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None,
+                   min_size: Optional[int] = None, max_size: Optional[int] = None, symlinks: str = "skip",
+                   recursive: bool = True, workers: int = 8,
+                   on_error: Optional[Callable[[str, OSError], None]] = None
+                   ) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Streams the files under root that pass the filters, as (path, stat) pairs.
+
+    Files are yielded while the walk is still running, so callers can start
+    working on the first ones immediately. A directory matching an exclude
+    pattern is not descended into.
+
+    Args:
+        root: Directory to search.
+        include: Globs a file must match (any of); None matches everything.
+                 Patterns without '/' match the file name (e.g. "*.jpg"),
+                 others the path relative to root (e.g. "raw/*.cr2").
+        exclude: Globs for files and directories to leave out.
+        min_size: Smallest file size in bytes to include.
+        max_size: Largest file size in bytes to include.
+        symlinks: Symlink policy, see scan_tree.
+        recursive: Descend into subdirectories.
+        workers: Directories listed at once.
+        on_error: See scan_tree.
+    """
+    root = os.path.abspath(root)
+    exclude = list(exclude or ())
+
+    def relative(path: str) -> str:
+        return os.path.relpath(path, root).replace(os.sep, "/")
+
+    def prune(directory: str) -> bool:
+        return not recursive or (bool(exclude) and _matches(relative(directory), exclude))
+
+    for directory, files in scan_tree(root, workers, on_error=on_error, symlinks=symlinks, prune=prune):
+        for name, st in files:
+            if min_size is not None and st.st_size < min_size:
+                continue
+            if max_size is not None and st.st_size > max_size:
+                continue
+            path = os.path.join(directory, name)
+            rel_path = relative(path)
+            if include and not _matches(rel_path, include):
+                continue
+            if exclude and _matches(rel_path, exclude):
+                continue
+            yield path, st
+
+# --- Manifest ---
+
+class SyncManifest:
+    """
+    SQLite record of synced files: (directory, name) -> size, mtime, inode, hash.
+
+    Directories are stored relative to the synced root, and rows are read one
+    directory at a time, so memory stays flat however large the tree is. Each
+    row also remembers the target it was uploaded to, so pointing the same
+    manifest at another node re-uploads everything.
+
+    Not thread-safe: use it from the thread running the sync.
+    """
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " dir TEXT NOT NULL, name TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+            " inode INTEGER NOT NULL, hash TEXT NOT NULL, target TEXT NOT NULL, synced_at REAL NOT NULL,"
+            " PRIMARY KEY (dir, name)) WITHOUT ROWID")
+        self._conn.commit()
+
+    def directory(self, directory: str) -> Dict[str, Tuple[int, int, int, str, str]]:
+        """Rows for one directory: name -> (size, mtime_ns, inode, hash, target)."""
+        rows = self._conn.execute("SELECT name, size, mtime_ns, inode, hash, target FROM files WHERE dir = ?",
+                                  (directory,))
+        return {row[0]: row[1:] for row in rows}
+
+    def directories(self) -> Set[str]:
+        return {row[0] for row in self._conn.execute("SELECT DISTINCT dir FROM files")}
+
+    def record(self, rows: Iterable[Tuple[str, str, int, int, int, str, str]]) -> None:
+        """Upserts (dir, name, size, mtime_ns, inode, hash, target) rows in one transaction."""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (dir, name, size, mtime_ns, inode, hash, target, synced_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [row + (now,) for row in rows])
+
+    def forget(self, directory: str, names: Optional[Iterable[str]] = None) -> None:
+        """Drops rows for the given names in a directory, or for the whole directory."""
+        with self._conn:
+            if names is None:
+                self._conn.execute("DELETE FROM files WHERE dir = ?", (directory,))
+            else:
+                self._conn.executemany("DELETE FROM files WHERE dir = ? AND name = ?",
+                                       [(directory, name) for name in names])
+
+    def stats(self) -> Dict[str, Any]:
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files").fetchone()
+        return {"path": self.path, "files": count, "bytes": total}
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SyncManifest":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+# --- Sync ---
+
+def _stat_key(st: os.stat_result) -> Tuple[int, int, int]:
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+class DirectorySync:
+    """
+    Uploads the new and changed files of a directory tree and records them in a SyncManifest.
+
+    A file is unchanged when its size, mtime and inode match the manifest row
+    and it was uploaded to the same target; unchanged files are not opened, so
+    a no-op sync costs one stat per file. Files that change while they are
+    being uploaded are not recorded and get picked up by the next run. Files
+    deleted locally are dropped from the manifest (content on the node is
+    permanent and is left alone).
+
+    Example Usage:
+        with SyncManifest(os.path.join(root, DEFAULT_MANIFEST_NAME)) as manifest:
+            report = DirectorySync(client, root, manifest, upload_workers=8).run()
+            print(report["uploaded"], "uploaded,", report["unchanged"], "unchanged")
+    """
+    FLUSH_EVERY = 500 # Manifest rows buffered between commits
+
+    def __init__(self, client: PermastoreItClient, root: str, manifest: SyncManifest,
+                 upload_workers: int = 4, scan_workers: int = 8, target: Optional[str] = None):
+        """
+        Args:
+            client: Client (or PermastoreItCluster) to upload with.
+            root: Directory to sync.
+            manifest: Manifest to read and update.
+            upload_workers: Files hashed and uploaded at once.
+            scan_workers: Directories listed at once.
+            target: Label for where files went, stored with each row.
+                    Defaults to the client's base URL.
+        """
+        if upload_workers < 1 or scan_workers < 1:
+            raise ValueError("upload_workers and scan_workers must be positive integers.")
+        self.client = client
+        self.root = os.path.abspath(root)
+        self.manifest = manifest
+        self.upload_workers = upload_workers
+        self.scan_workers = scan_workers
+        self.target = target or client.base_url
+        manifest_path = os.path.abspath(manifest.path)
+        self._skip = {manifest_path, manifest_path + "-wal", manifest_path + "-shm", manifest_path + "-journal"}
+
+    def _upload(self, path: str, key: Tuple[int, int, int]) -> Dict[str, Any]:
+        t_start = time.perf_counter()
+        result = self.client.upload(path, skip_existing=True) # Hashes locally; skips content the node has
+        result["upload_time_ms"] = (time.perf_counter() - t_start) * 1000
+        try:
+            result["unchanged_since_scan"] = _stat_key(os.stat(path)) == key
+        except OSError:
+            result["unchanged_since_scan"] = False
+        return result
+
+    def run(self, dry_run: bool = False,
+            on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Syncs the tree once.
+
+        Args:
+            dry_run: Only report what would be uploaded or forgotten.
+            on_progress: Called with the running report after every directory
+                         scanned and every upload finished.
+
+        Returns:
+            A report with counts (scanned, unchanged, new, changed, uploaded,
+            deduplicated, failed, removed), bytes_uploaded, elapsed_s and a
+            list of failures ({"path", "error"}).
+        """
+        report: Dict[str, Any] = {
+            "root": self.root, "target": self.target, "dry_run": dry_run,
+            "directories": 0, "scanned": 0, "unchanged": 0, "new": 0, "changed": 0,
+            "uploaded": 0, "deduplicated": 0, "failed": 0, "removed": 0, "bytes_uploaded": 0,
+            "scan_errors": 0, "elapsed_s": 0.0, "failures": [],
+        }
+        t_start = time.perf_counter()
+        visited: Set[str] = set()
+        unreadable: Set[str] = set()
+        pending_rows: List[Tuple[str, str, int, int, int, str, str]] = []
+        in_flight: Dict[Future, Tuple[str, str, Tuple[int, int, int]]] = {}
+        max_in_flight = self.upload_workers * 4 # Bounds memory while the scan runs ahead
+
+        def progress() -> None:
+            if on_progress is not None:
+                report["elapsed_s"] = time.perf_counter() - t_start
+                on_progress(report)
+
+        def flush() -> None:
+            if pending_rows:
+                self.manifest.record(pending_rows)
+                pending_rows.clear()
+
+        def collect(block: bool) -> None:
+            if not in_flight:
+                return
+            done, _ = wait(list(in_flight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                rel_dir, name, key = in_flight.pop(future)
+                path = os.path.join(self.root, rel_dir, name)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    report["failed"] += 1
+                    report["failures"].append({"path": path, "error": str(e)})
+                    continue
+                if result.get("status") == "deduplicated":
+                    report["deduplicated"] += 1
+                else:
+                    report["uploaded"] += 1
+                    report["bytes_uploaded"] += key[0]
+                if result.get("unchanged_since_scan") and result.get("hash"):
+                    pending_rows.append((rel_dir, name) + key + (result["hash"], self.target))
+                    if len(pending_rows) >= self.FLUSH_EVERY:
+                        flush()
+            progress()
+
+        def relative(directory: str) -> str:
+            rel_dir = os.path.relpath(directory, self.root)
+            return "" if rel_dir == "." else rel_dir
+
+        def scan_error(directory: str, error: OSError) -> None:
+            report["scan_errors"] += 1
+            unreadable.add(relative(directory))
+
+        with ThreadPoolExecutor(max_workers=self.upload_workers, thread_name_prefix="permastoreit-sync") as pool:
+            try:
+                for directory, files in scan_tree(self.root, self.scan_workers, on_error=scan_error):
+                    rel_dir = relative(directory)
+                    visited.add(rel_dir)
+                    report["directories"] += 1
+                    known = self.manifest.directory(rel_dir)
+                    for name, st in files:
+                        path = os.path.join(directory, name)
+                        if path in self._skip:
+                            continue
+                        report["scanned"] += 1
+                        key = _stat_key(st)
+                        row = known.pop(name, None)
+                        if row is not None and row[:3] == key and row[4] == self.target:
+                            report["unchanged"] += 1
+                            continue
+                        report["new" if row is None else "changed"] += 1
+                        if dry_run:
+                            continue
+                        while len(in_flight) >= max_in_flight:
+                            collect(block=True)
+                        in_flight[pool.submit(self._upload, path, key)] = (rel_dir, name, key)
+                    if known and rel_dir not in unreadable: # Rows left over were deleted locally
+                        report["removed"] += len(known)
+                        if not dry_run:
+                            self.manifest.forget(rel_dir, known)
+                    collect(block=False)
+                    progress()
+                while in_flight:
+                    collect(block=True)
+
+                # Whole directories that disappeared since the last sync
+                for rel_dir in self.manifest.directories() - visited:
+                    if any(bad == "" or rel_dir == bad or rel_dir.startswith(bad + os.sep) for bad in unreadable):
+                        continue
+                    gone = self.manifest.directory(rel_dir)
+                    report["removed"] += len(gone)
+                    if not dry_run:
+                        self.manifest.forget(rel_dir)
+            finally:
+                flush() # Keep what was uploaded even if the run is interrupted
+        report["elapsed_s"] = time.perf_counter() - t_start
+        return report
@@ -0,0 +1,304 @@
+# --- PermastoreIt SDK Telemetry ---
+#
+# Hooks for PermastoreItClient.add_hook() that turn per-request RequestEvents
+# into aggregated metrics (with a Prometheus text exporter) or trace spans.
+#
+#     metrics = MetricsAggregator()
+#     client.add_hook(metrics)
+#     ...
+#     print(metrics.to_prometheus())
+
+import json
+import os
+import threading
+import uuid
+from typing import Dict, List, Optional, Any, IO, Union
+
+import requests
+
+from permastoreit_sdk import LatencyHistogram, RequestEvent
+
+# --- Metrics Aggregation ---
+
+PHASES = ("dns", "connect", "tls", "send", "ttfb", "transfer", "total")
+
+class _EndpointMetrics:
+    """Counters and per-phase histograms for one (method, endpoint) pair."""
+
+    def __init__(self):
+        self.phases = {phase: LatencyHistogram() for phase in PHASES}
+        self.requests = 0
+        self.errors = 0 # Network errors and 5xx responses
+        self.retries = 0
+        self.new_connections = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.status_counts: Dict[str, int] = {}
+
+class MetricsAggregator:
+    """
+    A request hook that keeps per-endpoint latency histograms and counters.
+
+    Each phase of a RequestEvent gets its own histogram, so slow calls can be
+    attributed to the network (dns/connect/tls/send/transfer) or to the server
+    (ttfb, which is server time plus one round trip).
+    """
+    def __init__(self):
+        self._endpoints: Dict[tuple, _EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        key = (event.method, event.endpoint)
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = _EndpointMetrics()
+            metrics.requests += 1
+            if event.attempt:
+                metrics.retries += 1
+            if not event.reused:
+                metrics.new_connections += 1
+            if event.error or (event.status_code or 0) >= 500:
+                metrics.errors += 1
+            status = str(event.status_code) if event.status_code is not None else "error"
+            metrics.status_counts[status] = metrics.status_counts.get(status, 0) + 1
+            metrics.bytes_sent += event.bytes_sent or 0
+            metrics.bytes_received += event.bytes_received or 0
+        for phase in PHASES:
+            value = getattr(event, f"{phase}_ms")
+            if value is not None:
+                metrics.phases[phase].record(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-endpoint counters plus p50/p95/p99 for every phase, busiest endpoint first."""
+        with self._lock:
+            items = list(self._endpoints.items())
+        rows = []
+        for (method, endpoint), metrics in items:
+            row = {
+                "method": method,
+                "endpoint": endpoint,
+                "requests": metrics.requests,
+                "errors": metrics.errors,
+                "retries": metrics.retries,
+                "new_connections": metrics.new_connections,
+                "bytes_sent": metrics.bytes_sent,
+                "bytes_received": metrics.bytes_received,
+                "status_counts": dict(metrics.status_counts),
+            }
+            for phase, histogram in metrics.phases.items():
+                row[phase] = {"count": histogram.count, "mean_ms": histogram.mean,
+                              "p50_ms": histogram.percentile(50), "p95_ms": histogram.percentile(95),
+                              "p99_ms": histogram.percentile(99)}
+            rows.append(row)
+        rows.sort(key=lambda r: -r["requests"])
+        return rows
+
+    def to_prometheus(self, prefix: str = "permastoreit_client") -> str:
+        """Renders the metrics in the Prometheus text exposition format (durations in seconds)."""
+        lines = [
+            f"# HELP {prefix}_request_phase_seconds Client-observed request phase durations.",
+            f"# TYPE {prefix}_request_phase_seconds summary",
+        ]
+        with self._lock:
+            items = list(self._endpoints.items())
+        for (method, endpoint), metrics in items:
+            base = f'method="{method}",endpoint="{_escape(endpoint)}"'
+            for phase, histogram in metrics.phases.items():
+                if not histogram.count:
+                    continue
+                labels = f'{base},phase="{phase}"'
+                for quantile in (0.5, 0.95, 0.99):
+                    value = histogram.percentile(quantile * 100) / 1000.0
+                    lines.append(f'{prefix}_request_phase_seconds{{{labels},quantile="{quantile}"}} {value:.6f}')
+                lines.append(f"{prefix}_request_phase_seconds_sum{{{labels}}} {histogram.total / 1000.0:.6f}")
+                lines.append(f"{prefix}_request_phase_seconds_count{{{labels}}} {histogram.count}")
+        snapshot = self.snapshot()
+        for name, field, help_text in (
+                ("requests_total", "requests", "HTTP attempts, including retries."),
+                ("errors_total", "errors", "Attempts that failed with a network error or 5xx."),
+                ("retries_total", "retries", "Attempts that were retries."),
+                ("new_connections_total", "new_connections", "Attempts that opened a new connection."),
+                ("sent_bytes_total", "bytes_sent", "Request body bytes sent."),
+                ("received_bytes_total", "bytes_received", "Response body bytes received.")):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for row in snapshot:
+                lines.append(f'{prefix}_{name}{{method="{row["method"]}",endpoint="{_escape(row["endpoint"])}"}} {row[field]}')
+        lines.append(f"# HELP {prefix}_responses_total Responses by status code.")
+        lines.append(f"# TYPE {prefix}_responses_total counter")
+        for row in snapshot:
+            for status, count in sorted(row["status_counts"].items()):
+                lines.append(f'{prefix}_responses_total{{method="{row["method"]}",'
+                             f'endpoint="{_escape(row["endpoint"])}",status="{status}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# --- Spans ---
+
+def event_to_span(event: RequestEvent, trace_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Converts a RequestEvent to an OpenTelemetry-style client span (as a dict).
+
+    Phase durations become span events laid out back to back from the start,
+    so trace viewers show where the time went.
+    """
+    start_ns = int(event.start_time * 1e9)
+    end_ns = start_ns + int((event.total_ms or 0) * 1e6)
+    attributes = {
+        "http.request.method": event.method,
+        "url.full": event.url,
+        "url.template": event.endpoint,
+        "http.request.resend_count": event.attempt,
+        "network.connection.reused": event.reused,
+    }
+    if event.status_code is not None:
+        attributes["http.response.status_code"] = event.status_code
+    if event.bytes_sent is not None:
+        attributes["http.request.body.size"] = event.bytes_sent
+    if event.bytes_received is not None:
+        attributes["http.response.body.size"] = event.bytes_received
+    if event.error:
+        attributes["error.type"] = event.error.split(":", 1)[0]
+
+    events = []
+    offset_ns = start_ns
+    for phase in PHASES[:-1]:
+        value = getattr(event, f"{phase}_ms")
+        if value is None:
+            continue
+        events.append({"name": phase, "time_unix_nano": offset_ns, "attributes": {"duration_ms": round(value, 3)}})
+        offset_ns += int(value * 1e6)
+
+    return {
+        "trace_id": trace_id or uuid.uuid4().hex,
+        "span_id": uuid.uuid4().hex[:16],
+        "name": f"{event.method} {event.endpoint}",
+        "kind": "client",
+        "start_time_unix_nano": start_ns,
+        "end_time_unix_nano": end_ns,
+        "status": "error" if event.error or (event.status_code or 0) >= 500 else "ok",
+        "attributes": attributes,
+        "events": events,
+    }
+
+class JsonLinesSpanExporter:
+    """A request hook that appends one span per request, as a JSON line, to a file or stream."""
+
+    def __init__(self, target: Union[str, IO[str]]):
+        """
+        Args:
+            target: A file path (opened for append) or an open text stream.
+        """
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        self._file = open(target, "a", encoding="utf-8") if self._owns_file else target
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        line = json.dumps(event_to_span(event), separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.flush()
+            if self._owns_file:
+                self._file.close()
+
+class OTLPSpanExporter:
+    """
+    A request hook that batches spans and POSTs them to an OTLP/HTTP JSON collector.
+
+    Spans are sent from a background thread every `flush_interval` seconds or
+    once `batch_size` are queued; if the queue exceeds `max_queue` (collector
+    down or slow), the oldest spans are dropped rather than blocking requests.
+    """
+    def __init__(self, endpoint: str = "http://localhost:4318/v1/traces",
+                 service_name: str = "permastoreit-client", batch_size: int = 512,
+                 flush_interval: float = 5.0, max_queue: int = 8192, timeout: float = 10.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.dropped = 0
+        self._queue: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._session = requests.Session() # Separate from the instrumented client
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="permastoreit-otlp", daemon=True)
+        self._thread.start()
+
+    def __call__(self, event: RequestEvent) -> None:
+        span = event_to_span(event)
+        with self._cond:
+            self._queue.append(span)
+            if len(self._queue) > self.max_queue:
+                overflow = len(self._queue) - self.max_queue
+                del self._queue[:overflow]
+                self.dropped += overflow
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                batch, self._queue = self._queue, []
+                closed = self._closed
+            if batch:
+                self._send(batch)
+            if closed:
+                return
+
+    def _send(self, spans: List[Dict[str, Any]]) -> None:
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "permastoreit-sdk"}, "spans": [_to_otlp(span) for span in spans]}],
+        }]}
+        try:
+            self._session.post(self.endpoint, json=payload, timeout=self.timeout).raise_for_status()
+        except requests.exceptions.RequestException:
+            with self._cond:
+                self.dropped += len(spans) # Telemetry must never break the caller
+
+    def close(self) -> None:
+        """Flushes queued spans and stops the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(self.timeout + 1)
+        self._session.close()
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+def _to_otlp(span: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps an event_to_span() dict onto the OTLP JSON span encoding."""
+    return {
+        "traceId": span["trace_id"],
+        "spanId": span["span_id"],
+        "name": span["name"],
+        "kind": 3, # SPAN_KIND_CLIENT
+        "startTimeUnixNano": str(span["start_time_unix_nano"]),
+        "endTimeUnixNano": str(span["end_time_unix_nano"]),
+        "attributes": [_otlp_attribute(k, v) for k, v in span["attributes"].items()],
+        "events": [{"name": e["name"], "timeUnixNano": str(e["time_unix_nano"]),
+                    "attributes": [_otlp_attribute(k, v) for k, v in e["attributes"].items()]}
+                   for e in span["events"]],
+        "status": {"code": 2 if span["status"] == "error" else 1},
+    }